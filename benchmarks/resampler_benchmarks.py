@@ -0,0 +1,323 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2023 Pyresample developers
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License as published by the Free
+# Software Foundation, either version 3 of the License, or (at your option) any
+# later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public License for more
+# details.
+#
+# You should have received a copy of the GNU Lesser General Public License along
+# with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Benchmarks of the resamplers on reproducible synthetic swaths.
+
+Every resampler is benchmarked in two classes: one timing the precomputation
+of the resampling parameters (neighbour search, ll2cr, bucket indices...) and
+one timing the resampling of the data with already precomputed parameters.
+Each class has a ``time_`` and a ``peakmem_`` benchmark, so the time and the
+peak memory of both steps are recorded separately.
+
+Run with ``asv run`` from this directory, or ``asv dev`` for a quick check.
+"""
+
+import abc
+
+import dask
+import dask.array as da
+import numpy as np
+import xarray as xr
+
+from pyresample import CHUNK_SIZE, kd_tree
+from pyresample.bilinear import XArrayBilinearResampler
+from pyresample.bucket import BucketResampler
+from pyresample.ewa import DaskEWAResampler
+from pyresample.future.resamplers.nearest import KDTreeNearestXarrayResampler
+from pyresample.geometry import AreaDefinition, SwathDefinition
+from pyresample.gradient import ResampleBlocksGradientSearchResampler
+
+SOURCE_SIZES = (10 ** 5, 10 ** 6, 10 ** 7, 10 ** 8)
+ROWS_PER_SCAN = 16
+RADIUS_OF_INFLUENCE = 50000
+SEED = 42
+
+
+def _get_swath_shape(size):
+    """Get the shape of a swath of about ``size`` pixels, with whole scans."""
+    side = np.sqrt(size)
+    rows = max(ROWS_PER_SCAN, int(round(side / ROWS_PER_SCAN)) * ROWS_PER_SCAN)
+    return rows, int(size // rows)
+
+
+def get_synthetic_swath(size):
+    """Get a tilted, curved swath over central Europe with about ``size`` pixels.
+
+    The coordinates are a closed-form function of the pixel position and are
+    generated lazily, so the swath is identical between runs and machines.
+    """
+    rows, cols = _get_swath_shape(size)
+    chunks = (ROWS_PER_SCAN * max(1, CHUNK_SIZE // ROWS_PER_SCAN), CHUNK_SIZE)
+    row = da.linspace(0, 1, rows, chunks=chunks[0])[:, np.newaxis]
+    col = da.linspace(-1, 1, cols, chunks=chunks[1])[np.newaxis, :]
+    lons = 10 + 12 * col + 4 * row + 1.5 * col ** 2
+    lats = 42 + 16 * row - 2 * col - 0.5 * col ** 2
+    lons = xr.DataArray(lons, dims=('y', 'x'), attrs={'rows_per_scan': ROWS_PER_SCAN})
+    lats = xr.DataArray(lats, dims=('y', 'x'), attrs={'rows_per_scan': ROWS_PER_SCAN})
+    return SwathDefinition(lons, lats)
+
+
+def get_synthetic_area(size):
+    """Get a LAEA area covered by the synthetic swath, with about a fourth of ``size`` pixels."""
+    side = max(100, int(np.sqrt(size) / 2))
+    return AreaDefinition('synthetic', 'Synthetic target area', 'synthetic',
+                          {'proj': 'laea', 'lon_0': 10, 'lat_0': 50, 'ellps': 'WGS84'},
+                          side, side, (-500000, -500000, 500000, 500000))
+
+
+def get_synthetic_source_area(size):
+    """Get a geographic source area with about ``size`` pixels covering the target area."""
+    rows, cols = _get_swath_shape(size)
+    return AreaDefinition('synthetic_source', 'Synthetic source area', 'synthetic_source',
+                          {'proj': 'longlat', 'ellps': 'WGS84'},
+                          cols, rows, (0, 43, 20, 57))
+
+
+def get_synthetic_data(shape):
+    """Get reproducible random data as a chunked DataArray."""
+    data = da.random.RandomState(SEED).random(shape, chunks=CHUNK_SIZE)
+    return xr.DataArray(data, dims=('y', 'x'))
+
+
+def _persist_dask_attributes(obj):
+    """Persist all the dask arrays stored as attributes of ``obj``."""
+    names = [name for name, value in vars(obj).items() if isinstance(value, da.Array)]
+    persisted = dask.persist(*[getattr(obj, name) for name in names])
+    for name, value in zip(names, persisted):
+        setattr(obj, name, value)
+
+
+class _ResamplerBenchmark(abc.ABC):
+    """Base class for the benchmarks of one resampler.
+
+    The resampler mixins provide :meth:`precompute` and :meth:`compute`.
+    """
+
+    params = SOURCE_SIZES
+    param_names = ['source_size']
+    timeout = 3600
+
+    def setup_geometries(self, size):
+        """Create the source and target geometries and the data."""
+        self.source_geo_def = get_synthetic_swath(size)
+        self.target_geo_def = get_synthetic_area(size)
+        self.data = get_synthetic_data(self.source_geo_def.shape)
+
+    @abc.abstractmethod
+    def precompute(self):
+        """Get a resampler with its resampling parameters computed."""
+
+    @abc.abstractmethod
+    def compute(self, resampler):
+        """Resample the data to a numpy array with a precomputed resampler."""
+
+
+class _PrecomputeBenchmark(_ResamplerBenchmark):
+    """Benchmark the precomputation step of a resampler."""
+
+    def setup(self, size):
+        """Create the geometries."""
+        self.setup_geometries(size)
+
+    def time_precompute(self, size):
+        """Time the precomputation."""
+        self.precompute()
+
+    def peakmem_precompute(self, size):
+        """Measure the peak memory of the precomputation."""
+        self.precompute()
+
+
+class _ComputeBenchmark(_ResamplerBenchmark):
+    """Benchmark the resampling step of a resampler."""
+
+    def setup(self, size):
+        """Create the geometries and precompute the resampler."""
+        self.setup_geometries(size)
+        self.resampler = self.precompute()
+
+    def time_compute(self, size):
+        """Time the resampling."""
+        self.compute(self.resampler)
+
+    def peakmem_compute(self, size):
+        """Measure the peak memory of the resampling."""
+        self.compute(self.resampler)
+
+
+class _KDTreeNearest(object):
+    """Nearest neighbour resampling with the numpy interface of ``kd_tree``."""
+
+    def setup_geometries(self, size):
+        super().setup_geometries(size)
+        lons, lats = dask.compute(self.source_geo_def.lons.data, self.source_geo_def.lats.data)
+        self.source_geo_def = SwathDefinition(lons, lats)
+        self.data = self.data.values
+
+    def precompute(self):
+        return kd_tree.get_neighbour_info(self.source_geo_def, self.target_geo_def,
+                                          RADIUS_OF_INFLUENCE, neighbours=1)
+
+    def compute(self, resampler):
+        valid_input_index, valid_output_index, index_array, _ = resampler
+        return kd_tree.get_sample_from_neighbour_info('nn', self.target_geo_def.shape, self.data,
+                                                      valid_input_index, valid_output_index,
+                                                      index_array)
+
+
+class KDTreeNearestPrecompute(_KDTreeNearest, _PrecomputeBenchmark):
+    """Benchmark ``kd_tree.get_neighbour_info``."""
+
+
+class KDTreeNearestCompute(_KDTreeNearest, _ComputeBenchmark):
+    """Benchmark ``kd_tree.get_sample_from_neighbour_info``."""
+
+
+class _XArrayResamplerNN(object):
+    """Nearest neighbour resampling with ``kd_tree.XArrayResamplerNN``."""
+
+    def precompute(self):
+        resampler = kd_tree.XArrayResamplerNN(self.source_geo_def, self.target_geo_def,
+                                              RADIUS_OF_INFLUENCE)
+        resampler.get_neighbour_info()
+        _persist_dask_attributes(resampler)
+        return resampler
+
+    def compute(self, resampler):
+        return resampler.get_sample_from_neighbour_info(self.data).values
+
+
+class XArrayResamplerNNPrecompute(_XArrayResamplerNN, _PrecomputeBenchmark):
+    """Benchmark ``XArrayResamplerNN.get_neighbour_info``."""
+
+
+class XArrayResamplerNNCompute(_XArrayResamplerNN, _ComputeBenchmark):
+    """Benchmark ``XArrayResamplerNN.get_sample_from_neighbour_info``."""
+
+
+class _KDTreeNearestXarrayResampler(object):
+    """Nearest neighbour resampling with ``KDTreeNearestXarrayResampler``."""
+
+    def precompute(self):
+        resampler = KDTreeNearestXarrayResampler(self.source_geo_def, self.target_geo_def)
+        resampler.precompute(radius_of_influence=RADIUS_OF_INFLUENCE)
+        for item in resampler._internal_cache.values():
+            item.update(zip(item.keys(), dask.persist(*item.values())))
+        return resampler
+
+    def compute(self, resampler):
+        return resampler.resample(self.data, radius_of_influence=RADIUS_OF_INFLUENCE).values
+
+
+class KDTreeNearestXarrayResamplerPrecompute(_KDTreeNearestXarrayResampler, _PrecomputeBenchmark):
+    """Benchmark ``KDTreeNearestXarrayResampler.precompute``."""
+
+
+class KDTreeNearestXarrayResamplerCompute(_KDTreeNearestXarrayResampler, _ComputeBenchmark):
+    """Benchmark ``KDTreeNearestXarrayResampler.resample`` with precomputed neighbours."""
+
+
+class _XArrayBilinearResampler(object):
+    """Bilinear resampling with ``XArrayBilinearResampler``."""
+
+    def precompute(self):
+        resampler = XArrayBilinearResampler(self.source_geo_def, self.target_geo_def,
+                                            RADIUS_OF_INFLUENCE)
+        resampler.get_bil_info()
+        _persist_dask_attributes(resampler)
+        return resampler
+
+    def compute(self, resampler):
+        return resampler.get_sample_from_bil_info(self.data).values
+
+
+class XArrayBilinearResamplerPrecompute(_XArrayBilinearResampler, _PrecomputeBenchmark):
+    """Benchmark ``XArrayBilinearResampler.get_bil_info``."""
+
+
+class XArrayBilinearResamplerCompute(_XArrayBilinearResampler, _ComputeBenchmark):
+    """Benchmark ``XArrayBilinearResampler.get_sample_from_bil_info``."""
+
+
+class _DaskEWAResampler(object):
+    """Elliptical weighted averaging with ``DaskEWAResampler``."""
+
+    def precompute(self):
+        resampler = DaskEWAResampler(self.source_geo_def, self.target_geo_def)
+        resampler.precompute(rows_per_scan=ROWS_PER_SCAN, persist=True)
+        return resampler
+
+    def compute(self, resampler):
+        return resampler.compute(self.data, rows_per_scan=ROWS_PER_SCAN).values
+
+
+class DaskEWAResamplerPrecompute(_DaskEWAResampler, _PrecomputeBenchmark):
+    """Benchmark ``DaskEWAResampler.precompute``."""
+
+
+class DaskEWAResamplerCompute(_DaskEWAResampler, _ComputeBenchmark):
+    """Benchmark ``DaskEWAResampler.compute``."""
+
+
+class _BucketResampler(object):
+    """Bucket averaging with ``BucketResampler``."""
+
+    def precompute(self):
+        resampler = BucketResampler(self.target_geo_def,
+                                    self.source_geo_def.lons.data,
+                                    self.source_geo_def.lats.data)
+        _persist_dask_attributes(resampler)
+        return resampler
+
+    def compute(self, resampler):
+        return resampler.get_average(self.data.data).compute()
+
+
+class BucketResamplerPrecompute(_BucketResampler, _PrecomputeBenchmark):
+    """Benchmark the computation of the ``BucketResampler`` indices."""
+
+
+class BucketResamplerCompute(_BucketResampler, _ComputeBenchmark):
+    """Benchmark ``BucketResampler.get_average``."""
+
+
+class _ResampleBlocksGradientSearchResampler(object):
+    """Gradient search resampling with ``ResampleBlocksGradientSearchResampler``."""
+
+    def setup_geometries(self, size):
+        super().setup_geometries(size)
+        self.source_geo_def = get_synthetic_source_area(size)
+        self.data = get_synthetic_data(self.source_geo_def.shape)
+
+    def precompute(self):
+        resampler = ResampleBlocksGradientSearchResampler(self.source_geo_def, self.target_geo_def)
+        resampler.precompute()
+        _persist_dask_attributes(resampler)
+        return resampler
+
+    def compute(self, resampler):
+        return resampler.compute(self.data).values
+
+
+class ResampleBlocksGradientSearchResamplerPrecompute(_ResampleBlocksGradientSearchResampler,
+                                                      _PrecomputeBenchmark):
+    """Benchmark ``ResampleBlocksGradientSearchResampler.precompute``."""
+
+
+class ResampleBlocksGradientSearchResamplerCompute(_ResampleBlocksGradientSearchResampler,
+                                                   _ComputeBenchmark):
+    """Benchmark ``ResampleBlocksGradientSearchResampler.compute``."""
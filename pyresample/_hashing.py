@@ -0,0 +1,147 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2023 Pyresample developers
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License as published by the Free
+# Software Foundation, either version 3 of the License, or (at your option) any
+# later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public License for more
+# details.
+#
+# You should have received a copy of the GNU Lesser General Public License along
+# with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Digests of the coordinate arrays used to hash geometry definitions.
+
+The coordinates of a numpy-backed definition are reduced to a short digest
+before they are fed to the hash of the definition. The digest is computed
+with one of the following methods:
+
+``"sha1"``
+    The raw bytes of the array are fed to the hash, as done historically.
+``"fast"``
+    The array is split in chunks hashed in parallel threads with a fast
+    non-cryptographic hash when xxhash is installed. Otherwise sha256 is
+    used, which is hardware accelerated on most recent CPUs.
+``"fingerprint"``
+    Only a sample of strided rows is hashed together with the shape, dtype,
+    minimum and maximum of the array. This is meant for trusted pipelines
+    where coordinate arrays are not modified in place.
+
+A callable taking an array and returning bytes can also be used.
+
+Digests are memoized on the array object, so arrays should not be modified
+in place after a definition using them has been hashed.
+"""
+
+import hashlib
+import os
+import threading
+import warnings
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+HASH_CHUNK_SIZE = 16 * 1024 * 1024
+FINGERPRINT_ROWS = 64
+
+_DIGEST_CACHE = {}
+_DIGEST_CACHE_LOCK = threading.Lock()
+
+
+def _new_fast_hash():
+    if xxhash is not None:
+        return xxhash.xxh3_128()
+    return hashlib.sha256()
+
+
+def _digest_bytes(buffer):
+    the_hash = _new_fast_hash()
+    the_hash.update(buffer)
+    return the_hash.digest()
+
+
+def _get_array_header(arr):
+    return f"{arr.dtype.str}{arr.shape}".encode('utf-8')
+
+
+def _get_fast_digest(arr):
+    """Hash the array in chunks, in parallel threads when there are several chunks."""
+    flat = np.ascontiguousarray(arr).reshape(-1).view(np.uint8)
+    chunks = [flat[start:start + HASH_CHUNK_SIZE] for start in range(0, flat.size, HASH_CHUNK_SIZE)]
+    num_workers = min(len(chunks), os.cpu_count() or 1)
+    if num_workers < 2:
+        digests = [_digest_bytes(chunk) for chunk in chunks]
+    else:
+        with ThreadPoolExecutor(max_workers=num_workers) as executor:
+            digests = list(executor.map(_digest_bytes, chunks))
+    the_hash = _new_fast_hash()
+    the_hash.update(_get_array_header(arr))
+    for digest in digests:
+        the_hash.update(digest)
+    return the_hash.digest()
+
+
+def _get_fingerprint_digest(arr):
+    """Hash strided rows of the array together with its shape, dtype and range."""
+    the_hash = _new_fast_hash()
+    the_hash.update(_get_array_header(arr))
+    if arr.size == 0:
+        return the_hash.digest()
+    arr = np.atleast_1d(arr)
+    step = max(1, arr.shape[0] // FINGERPRINT_ROWS)
+    the_hash.update(np.ascontiguousarray(arr[::step]).view(np.uint8))
+    the_hash.update(np.ascontiguousarray(arr[-1:]).view(np.uint8))
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        the_hash.update(np.array([np.nanmin(arr), np.nanmax(arr)]).view(np.uint8))
+    return the_hash.digest()
+
+
+def _get_sha1_hashable(arr):
+    return np.ascontiguousarray(arr).view(np.uint8)
+
+
+_DIGEST_METHODS = {
+    'sha1': _get_sha1_hashable,
+    'fast': _get_fast_digest,
+    'fingerprint': _get_fingerprint_digest,
+}
+
+
+def _forget_digest(key):
+    with _DIGEST_CACHE_LOCK:
+        _DIGEST_CACHE.pop(key, None)
+
+
+def get_numpy_array_hashable(arr, method='fast'):
+    """Get a hashable form of the numpy array `arr` computed with `method`.
+
+    Except for the ``"sha1"`` method, which returns a view of the array data,
+    the result is memoized for as long as the array object is alive.
+    """
+    digest_func = method if callable(method) else _DIGEST_METHODS[method]
+    if method == 'sha1':
+        return digest_func(arr)
+    key = (id(arr), method)
+    with _DIGEST_CACHE_LOCK:
+        if key in _DIGEST_CACHE:
+            return _DIGEST_CACHE[key]
+    digest = digest_func(np.asarray(arr))
+    try:
+        weakref.finalize(arr, _forget_digest, key)
+    except TypeError:
+        return digest
+    with _DIGEST_CACHE_LOCK:
+        _DIGEST_CACHE[key] = digest
+    return digest
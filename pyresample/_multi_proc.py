@@ -19,10 +19,12 @@
 
 from __future__ import absolute_import
 
-import ctypes
-import multiprocessing as mp
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
-import numpy as np
+logger = logging.getLogger(__name__)
 
 
 class Scheduler(object):
@@ -31,9 +33,9 @@ class Scheduler(object):
     def __init__(self, ndata, nprocs, chunk=None, schedule='guided'):
         if schedule not in ['guided', 'dynamic', 'static']:
             raise ValueError('unknown scheduling strategy')
-        self._ndata = mp.RawValue(ctypes.c_int, ndata)
-        self._start = mp.RawValue(ctypes.c_int, 0)
-        self._lock = mp.Lock()
+        self._ndata = ndata
+        self._start = 0
+        self._lock = threading.Lock()
         self._schedule = schedule
         self._nprocs = nprocs
         if schedule == 'guided' or schedule == 'dynamic':
@@ -53,9 +55,9 @@ class Scheduler(object):
         """Iterate over individual chunks of data."""
         while True:
             self._lock.acquire()
-            ndata = self._ndata.value
+            ndata = self._ndata
             nprocs = self._nprocs
-            start = self._start.value
+            start = self._start
             if self._schedule == 'guided':
                 _chunk = ndata // nprocs
                 chunk = max(self._chunk, _chunk)
@@ -65,12 +67,12 @@ class Scheduler(object):
                 if chunk > ndata:
                     s0 = start
                     s1 = start + ndata
-                    self._ndata.value = 0
+                    self._ndata = 0
                 else:
                     s0 = start
                     s1 = start + chunk
-                    self._ndata.value = ndata - chunk
-                    self._start.value = start + chunk
+                    self._ndata = ndata - chunk
+                    self._start = start + chunk
                 self._lock.release()
                 yield slice(s0, s1)
             else:
@@ -78,27 +80,29 @@ class Scheduler(object):
                 return
 
 
-def shmem_as_ndarray(raw_array):
-    """Create numpy array from shared memory data."""
-    _ctypes_to_numpy = {
-        ctypes.c_char: np.int8,
-        ctypes.c_wchar: np.int16,
-        ctypes.c_byte: np.int8,
-        ctypes.c_ubyte: np.uint8,
-        ctypes.c_short: np.int16,
-        ctypes.c_ushort: np.uint16,
-        ctypes.c_int: np.int32,
-        ctypes.c_uint: np.int32,
-        ctypes.c_long: np.int32,
-        ctypes.c_ulong: np.int32,
-        ctypes.c_float: np.float32,
-        ctypes.c_double: np.float64
-    }
-    dtype = _ctypes_to_numpy[raw_array._type_]
+def run_chunked(func, ndata, nprocs, chunk=None, schedule='guided'):
+    """Call *func* on slices of the data with a pool of *nprocs* threads.
 
-    # The following works too, but occasionally raises
-    # RuntimeWarning: Item size computed from the PEP 3118 buffer format string does not match the actual item size.
-    # and appears to be slower.
-    # return np.ctypeslib.as_array(raw_array)
+    The data is split in slices according to the *chunk* and *schedule*
+    arguments of :class:`Scheduler`. All threads work on the same arrays,
+    so *func* is expected to release the GIL for most of its work and to
+    write its results in place.
 
-    return np.frombuffer(raw_array, dtype=dtype)
+    Returns:
+        List of ``(slice, seconds)`` tuples with the time spent on each chunk.
+
+    """
+    slices = list(Scheduler(ndata, nprocs, chunk=chunk, schedule=schedule))
+
+    def _timed_call(data_slice):
+        start_time = time.perf_counter()
+        func(data_slice)
+        return data_slice, time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=nprocs) as executor:
+        timings = list(executor.map(_timed_call, slices))
+    logger.debug("Processed %d elements in %d chunks with %d threads in %.3f s (slowest chunk %.3f s)",
+                 ndata, len(slices), nprocs, time.perf_counter() - start_time,
+                 max((seconds for _, seconds in timings), default=0.0))
+    return timings
@@ -37,6 +37,9 @@ from pykdtree.kdtree import KDTree
 from pyproj import Proj
 
 from pyresample import data_reduce, geometry
+from pyresample.bilinear._bilinear_fractions import (
+    get_fractional_distances as _get_fractional_distances_compiled,
+)
 
 from ..future.resamplers._transform_utils import lonlat2xyz
 
@@ -168,7 +171,7 @@ class BilinearBase(object):
             _get_four_closest_corners(*self._get_input_xy(),
                                       out_x, out_y,
                                       self._neighbours, self._index_array)
-        self.bilinear_t, self.bilinear_s = _get_fractional_distances(
+        self.bilinear_t, self.bilinear_s = _solve_fractional_distances(
             corner_points, out_x, out_y)
 
     def _get_output_xy(self):
@@ -358,6 +361,21 @@ def _get_fractional_distances(corner_points, out_x, out_y):
     return t__, s__
 
 
+def _solve_fractional_distances(corner_points, out_x, out_y):
+    """Calculate fractional distances t and s with the compiled solver when possible.
+
+    The compiled solver goes through the three cases of
+    :func:`_get_fractional_distances` pixel by pixel without creating
+    temporary arrays.  Other array types than NumPy arrays are handled by
+    :func:`_get_fractional_distances`.
+
+    """
+    arrays = tuple(corner_points) + (out_x, out_y)
+    if not all(isinstance(arr, np.ndarray) for arr in arrays):
+        return _get_fractional_distances(corner_points, out_x, out_y)
+    return _get_fractional_distances_compiled(*corner_points, out_x, out_y)
+
+
 def _invalid_s_and_t_to_nan(t__, s__):
     return _np_where_for_multiple_arrays(
         (find_indices_outside_min_and_max(t__, 0, 1) |
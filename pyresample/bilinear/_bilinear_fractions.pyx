@@ -0,0 +1,170 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2017-2020 Pyresample developers.
+#
+# This file is part of Pyresample
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Compiled solver for the bilinear fractional distances.
+
+The three cases (irregular quadrilateral, parallel uprights and
+parallellogram) are evaluated for each output pixel in turn, falling back
+to the next case only when the previous one gives no valid solution.  The
+arithmetic follows the NumPy implementation in :mod:`pyresample.bilinear._base`.
+"""
+
+import numpy as np
+
+cimport numpy as np
+
+DTYPE = np.double
+ctypedef np.double_t DTYPE_t
+cimport cython
+from libc.math cimport NAN, isnan, sqrt
+
+
+cdef inline bint outside(double val) nogil:
+    return val < 0. or val > 1.
+
+
+cdef inline bint invalid(double val) nogil:
+    return isnan(val) or outside(val)
+
+
+@cython.cdivision(True)
+cdef inline double solve_quadratic(double p1x, double p1y, double p2x, double p2y,
+                                   double p3x, double p3y, double p4x, double p4y,
+                                   double out_x, double out_y) nogil:
+    """Solve the quadratic equation for the corners and return the root from [0, 1]."""
+    cdef double x_21 = p2x - p1x
+    cdef double x_31 = p3x - p1x
+    cdef double x_42 = p4x - p2x
+    cdef double y_21 = p2y - p1y
+    cdef double y_31 = p3y - p1y
+    cdef double y_42 = p4y - p2y
+    cdef double a, b, c, discriminant, res
+
+    a = x_31 * y_42 - y_31 * x_42
+    b = (out_y * (x_42 - x_31) - out_x * (y_42 - y_31) +
+         x_31 * p2y - y_31 * p2x +
+         y_42 * p1x - x_42 * p1y)
+    c = out_y * x_21 - out_x * y_21 + p1x * p2y - p2x * p1y
+
+    discriminant = b * b - 4 * a * c
+    res = (-b + sqrt(discriminant)) / (2 * a)
+    if invalid(res):
+        res = (-b - sqrt(discriminant)) / (2 * a)
+    if invalid(res):
+        # Linear case
+        res = -c / b
+    if outside(res):
+        res = NAN
+    return res
+
+
+@cython.cdivision(True)
+cdef inline double solve_another(double f, double y_1, double y_2, double y_3, double y_4,
+                                 double out_y) nogil:
+    """Solve the other fractional distance from *f*."""
+    cdef double y_21 = y_2 - y_1
+    cdef double y_43 = y_4 - y_3
+    cdef double res = ((out_y - y_1 - y_21 * f) /
+                       (y_3 + y_43 * f - y_1 - y_21 * f))
+    if outside(res):
+        res = NAN
+    return res
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+cdef void fractional_distances(const DTYPE_t[:, :] pt_1, const DTYPE_t[:, :] pt_2,
+                               const DTYPE_t[:, :] pt_3, const DTYPE_t[:, :] pt_4,
+                               const DTYPE_t[:] out_x, const DTYPE_t[:] out_y,
+                               DTYPE_t[:] t_res, DTYPE_t[:] s_res) nogil:
+    cdef size_t i
+    cdef size_t size = out_x.shape[0]
+    cdef double p1x, p1y, p2x, p2y, p3x, p3y, p4x, p4y, ox, oy
+    cdef double t, s
+    for i in range(size):
+        p1x = pt_1[i, 0]
+        p1y = pt_1[i, 1]
+        p2x = pt_2[i, 0]
+        p2y = pt_2[i, 1]
+        p3x = pt_3[i, 0]
+        p3y = pt_3[i, 1]
+        p4x = pt_4[i, 0]
+        p4y = pt_4[i, 1]
+        ox = out_x[i]
+        oy = out_y[i]
+
+        # General case, ie. where the the corners form an irregular rectangle
+        t = solve_quadratic(p1x, p1y, p2x, p2y, p3x, p3y, p4x, p4y, ox, oy)
+        s = solve_another(t, p1y, p3y, p2y, p4y, oy)
+        if outside(t) or outside(s):
+            t = NAN
+            s = NAN
+
+        # Verticals are parallel
+        if isnan(t) or isnan(s):
+            s = solve_quadratic(p1x, p1y, p3x, p3y, p2x, p2y, p4x, p4y, ox, oy)
+            t = solve_another(s, p1y, p2y, p3y, p4y, oy)
+            if outside(t) or outside(s):
+                t = NAN
+                s = NAN
+
+        # Both verticals and horizontals are parallel
+        if isnan(t) or isnan(s):
+            t = ((p2x - p1x) * (oy - p1y) - (p2y - p1y) * (ox - p1x)) / \
+                ((p2x - p1x) * (p3y - p1y) - (p2y - p1y) * (p3x - p1x))
+            if outside(t):
+                t = NAN
+            s = (ox - p1x + (p3x - p1x) * t) / (p2x - p1x)
+            if outside(s):
+                s = NAN
+            if outside(t) or outside(s):
+                t = NAN
+                s = NAN
+
+        t_res[i] = t
+        s_res[i] = s
+
+
+def get_fractional_distances(pt_1, pt_2, pt_3, pt_4, out_x, out_y):
+    """Calculate vertical and horizontal fractional distances t and s.
+
+    :param pt_1, pt_2, pt_3, pt_4: (N, 2) arrays of the corner x/y coordinates
+    :param out_x: (N,) array of the output x coordinates
+    :param out_y: (N,) array of the output y coordinates
+    :return: tuple of (N,) arrays of the fractional distances t and s
+    """
+    cdef const DTYPE_t[:, :] pt_1_view = np.asarray(pt_1, dtype=DTYPE)
+    cdef const DTYPE_t[:, :] pt_2_view = np.asarray(pt_2, dtype=DTYPE)
+    cdef const DTYPE_t[:, :] pt_3_view = np.asarray(pt_3, dtype=DTYPE)
+    cdef const DTYPE_t[:, :] pt_4_view = np.asarray(pt_4, dtype=DTYPE)
+    cdef const DTYPE_t[:] out_x_view = np.ravel(np.asarray(out_x, dtype=DTYPE))
+    cdef const DTYPE_t[:] out_y_view = np.ravel(np.asarray(out_y, dtype=DTYPE))
+    cdef size_t size = out_x_view.shape[0]
+    for view in (pt_1_view, pt_2_view, pt_3_view, pt_4_view, out_y_view):
+        if view.shape[0] != size:
+            raise ValueError("Corner points and output coordinates must have the same length")
+    t__ = np.empty(size, dtype=DTYPE)
+    s__ = np.empty(size, dtype=DTYPE)
+    cdef DTYPE_t[:] t_view = t__
+    cdef DTYPE_t[:] s_view = s__
+    with nogil:
+        fractional_distances(pt_1_view, pt_2_view, pt_3_view, pt_4_view,
+                             out_x_view, out_y_view, t_view, s_view)
+    return t__, s__
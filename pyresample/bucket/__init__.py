@@ -17,8 +17,10 @@
 
 """Code for resampling using bucket resampling."""
 
+import hashlib
 import logging
-import math
+from collections import OrderedDict
+from functools import partial
 
 import dask
 import dask.array as da
@@ -26,68 +28,203 @@ import numpy as np
 import xarray as xr
 from pyproj import Proj
 
+from pyresample import CHUNK_SIZE
+from pyresample.geometry import get_array_hashable
+
 LOG = logging.getLogger(__name__)
 
+# In-memory cache of computed bucket indices, keyed by source coordinates and target area
+_INDICES_CACHE = OrderedDict()
+_INDICES_CACHE_SIZE = 10
+
 
-def _sort_weights(statistic_method, weights):
-    """Sort idxs and weights based on weights.
+def _get_chunk_bin_statistic(data, idxs, statistic_method, out_size):
+    """Reduce a chunk of data to the min/max of each bin by scattering it into a buffer.
 
-    By default the method for sorting is `'min'`.
+    Empty bins and bins with only NaN values are set to NaN.
     """
-    order = np.argsort(weights)
-    if statistic_method == 'max':
-        return order[::-1]
-    return order
+    reduce_func = np.fmin if statistic_method == 'min' else np.fmax
+    valid = (idxs >= 0) & (idxs < out_size)
+    statistic = np.full(out_size, np.nan)
+    reduce_func.at(statistic, idxs[valid], data[valid])
+    return statistic[np.newaxis, :]
+
+
+def _nan_ignoring_reduction(reduce_func):
+    """Create a chunk/combine/aggregate function for :func:`dask.array.reduction`."""
+    def _reduce(x, axis=None, keepdims=False):
+        return reduce_func.reduce(x, axis=axis, keepdims=keepdims)
+    return _reduce
+
+
+def _get_proj_coordinates(lons, lats, prj):
+    """Calculate projection coordinates of *lons* and *lats* with *prj*."""
+    proj_x, proj_y = prj(lons, lats)
+    return np.stack((proj_x, proj_y))
+
+
+def _get_bucket_indices(target_area, prj, source_lons, source_lats):
+    """Calculate the y and x indices of the target grid where the source points fall.
+
+    Points outside the target area get an index of -1.
+    """
+    # Transform source lons/lats to target projection coordinates x/y
+    lons = source_lons.ravel()
+    lats = source_lats.ravel()
+    result = da.map_blocks(_get_proj_coordinates, lons, lats, prj=prj,
+                           new_axis=0, chunks=(2,) + lons.chunks)
+    proj_x = result[0, :]
+    proj_y = result[1, :]
+
+    # Calculate array indices. Orient so that 0-meridian is pointing down.
+    x_res, y_res = target_area.resolution
+    x_idxs = da.floor((proj_x - target_area.area_extent[0]) / x_res).astype(np.int64)
+    y_idxs = da.floor((target_area.area_extent[3] - proj_y) / y_res).astype(np.int64)
 
+    # Get valid index locations
+    mask = (x_idxs >= 0) & (x_idxs < target_area.width) & (y_idxs >= 0) & (y_idxs < target_area.height)
+    return da.where(mask, y_idxs, -1), da.where(mask, x_idxs, -1)
 
-def _get_bin_statistic(bins, idxs_sorted, weights_sorted):
-    """Get the statistic of each bin."""
-    (unique_bin, unique_idx) = _find_unique_bins_and_indices(bins, idxs_sorted)
 
-    return _expand_bin_statistics(bins, unique_bin, unique_idx, weights_sorted)
+def _get_category_bins(data, idxs, categories, out_size):
+    """Get combined bin indices ``category_index * out_size + idxs`` of categorical data.
 
+    Values not matching any of the categories and values outside the target
+    area get an index of -1.
+    """
+    order = np.argsort(categories, kind='stable')
+    sorted_categories = categories[order]
+    position = np.clip(np.searchsorted(sorted_categories, data), 0, len(categories) - 1)
+    matches = (sorted_categories[position] == data) & (idxs >= 0)
+    return np.where(matches, order[position] * out_size + idxs, -1)
 
-def _find_unique_bins_and_indices(bins, idxs_sorted):
-    """Get unique bins and corresponding indices."""
-    # get where the `idxs_sorted` located in `bins`
-    binned_values = np.digitize(idxs_sorted, bins, right=True)
 
-    # mask value outside of bin
-    binned_values_masked = np.ma.masked_array(binned_values,
-                                              (idxs_sorted < bins.min()) | (idxs_sorted > bins.max()))
+STATISTICS = ('sum', 'count', 'min', 'max', 'mean', 'std')
 
-    # get the first index and value in each bin
-    return np.unique(binned_values_masked, return_index=True)
 
+def _get_moment_components(stats, skipna):
+    """Get the per-bin components needed to derive *stats*."""
+    components = ['count', 'sum']
+    if not skipna:
+        components.append('nan_count')
+    components.extend(stat for stat in ('min', 'max') if stat in stats)
+    if 'std' in stats:
+        components.append('m2')
+    return tuple(components)
 
-def _expand_bin_statistics(bins, unique_bin, unique_idx, weights_sorted):
-    """Expand bin statistics to cover all bins."""
-    # create the full index array
-    weight_idx = np.full(len(bins), -1, dtype=np.int32)
 
-    # assign the valid index to array
-    weight_idx[unique_bin[~unique_bin.mask].data] = unique_idx[~unique_bin.mask]
+def _get_chunk_bin_moments(data, idxs, components, out_size):
+    """Get the per-bin components of a chunk of data, without sorting it.
 
-    return weights_sorted[weight_idx]  # last value of weigths_sorted always nan
+    'm2' is the sum of the squared deviations from the mean of the bin.
+    """
+    data = np.asarray(data, dtype=np.float64)
+    valid = (idxs >= 0) & (idxs < out_size)
+    nans = np.isnan(data) & valid
+    valid &= np.logical_not(nans)
+    data = data[valid]
+    bins = idxs[valid]
+    counts = np.bincount(bins, minlength=out_size).astype(np.float64)
+    sums = np.bincount(bins, weights=data, minlength=out_size)
+    moments = np.empty((1, len(components), out_size))
+    for i, component in enumerate(components):
+        if component == 'count':
+            moments[0, i] = counts
+        elif component == 'sum':
+            moments[0, i] = sums
+        elif component == 'nan_count':
+            moments[0, i] = np.bincount(idxs[nans], minlength=out_size)
+        elif component in ('min', 'max'):
+            moments[0, i] = np.nan
+            reduce_func = np.fmin if component == 'min' else np.fmax
+            reduce_func.at(moments[0, i], bins, data)
+        elif component == 'm2':
+            with np.errstate(invalid='ignore', divide='ignore'):
+                means = sums / counts
+            moments[0, i] = np.bincount(bins, weights=(data - means[bins]) ** 2, minlength=out_size)
+    return moments
+
+
+def _merge_bin_moments(moments, axis=None, keepdims=False, components=None):
+    """Merge the per-bin components of several chunks along the first axis.
+
+    The squared deviations are merged with the pairwise update of Chan et al.
+    """
+    index = {component: i for i, component in enumerate(components)}
+    merged = moments[0].copy()
+    for other in moments[1:]:
+        count_a = merged[index['count']]
+        count_b = other[index['count']]
+        count = count_a + count_b
+        if 'm2' in index:
+            with np.errstate(invalid='ignore', divide='ignore'):
+                delta = other[index['sum']] / count_b - merged[index['sum']] / count_a
+                correction = np.where((count_a > 0) & (count_b > 0), delta ** 2 * count_a * count_b / count, 0)
+            merged[index['m2']] += other[index['m2']] + correction
+        for component in ('sum', 'nan_count'):
+            if component in index:
+                merged[index[component]] += other[index[component]]
+        if 'min' in index:
+            np.fmin(merged[index['min']], other[index['min']], out=merged[index['min']])
+        if 'max' in index:
+            np.fmax(merged[index['max']], other[index['max']], out=merged[index['max']])
+        merged[index['count']] = count
+    return merged[np.newaxis] if keepdims else merged
+
+
+def _split_chunk_by_band(data, idxs, band_edges):
+    """Sort the values of a data chunk by bin and value and split them into bands of bins.
+
+    Band ``i`` holds the bins ``band_edges[i]`` to ``band_edges[i + 1] - 1``.
+    Values outside of all the bands are dropped.
+    """
+    data = np.asarray(data, dtype=np.float64)
+    idxs = np.asarray(idxs)
+    order = np.lexsort((data, idxs))
+    data = data[order]
+    idxs = idxs[order]
+    splits = np.searchsorted(idxs, band_edges)
+    return tuple((data[first:last], idxs[first:last]) for first, last in zip(splits[:-1], splits[1:]))
 
 
-@dask.delayed(pure=True)
-def _get_statistics(statistic_method, data, idxs, out_shape):
-    """Help method to get bin max/min in a dask delayed manner."""
-    (idxs_sorted, data_sorted) = _get_sorted_indices_and_data(statistic_method, data, idxs)
-    out_size = math.prod(out_shape)
+def _get_band_quantiles(chunk_bands, quantiles, start, stop, skipna):
+    """Get the quantiles of the bins ``start`` to ``stop - 1`` from the parts of the band found in every chunk."""
+    data, idxs = zip(*chunk_bands)
+    return _get_bin_quantiles(np.concatenate(data), np.concatenate(idxs), quantiles, start, stop, skipna)
 
-    bins = np.linspace(0, out_size - 1, out_size, dtype=np.int64)
 
-    return _get_bin_statistic(bins, idxs_sorted, data_sorted).reshape(out_shape)
+def _get_bin_quantiles(data, idxs, quantiles, start, stop, skipna):
+    """Get the quantiles of the values falling in the bins ``start`` to ``stop - 1``.
 
+    The quantiles are linearly interpolated like the default method of
+    :func:`numpy.quantile`.
+    """
+    results = np.full((len(quantiles), stop - start), np.nan)
+    data = np.asarray(data, dtype=np.float64)
+    bins = np.asarray(idxs) - start
+    if skipna:
+        not_nan = np.logical_not(np.isnan(data))
+        data = data[not_nan]
+        bins = bins[not_nan]
+    if data.size == 0:
+        return results
 
-def _get_sorted_indices_and_data(statistic_method, data, idxs):
-    # sort idxs and data
-    order = _sort_weights(statistic_method, data)
-    idxs_sorted = idxs[order]
-    data_sorted = np.append(data[order], np.nan)
-    return (idxs_sorted, data_sorted)
+    # Sort by bin and by value within each bin, NaN values come last
+    order = np.lexsort((data, bins))
+    bins = bins[order]
+    data = data[order]
+    starts = np.flatnonzero(np.concatenate(([True], bins[1:] != bins[:-1])))
+    sizes = np.diff(np.append(starts, bins.size))
+    for i, quantile in enumerate(quantiles):
+        position = quantile * (sizes - 1)
+        lower = np.floor(position).astype(np.int64)
+        upper = np.minimum(lower + 1, sizes - 1)
+        lower_values = data[starts + lower]
+        results[i, bins[starts]] = lower_values + (position - lower) * (data[starts + upper] - lower_values)
+    if not skipna:
+        results[:, bins[starts]] = np.where(np.logical_or.reduceat(np.isnan(data), starts),
+                                            np.nan, results[:, bins[starts]])
+    return results
 
 
 class BucketResampler(object):
@@ -116,6 +253,19 @@ class BucketResampler(object):
 
     >>> resampler = BucketResampler(target_area, lons, lats)
 
+    When the same geometries are resampled several times, the target grid
+    indices of the source coordinates can be computed once and kept in an
+    in-memory cache, so that other resamplers created for the same
+    geometries reuse them:
+
+    >>> resampler = BucketResampler(target_area, lons, lats, cache_indices=True)
+
+    To reuse them across processes or runs, save them to disk and create
+    the resampler from the file:
+
+    >>> resampler.save_indices('indices.npy')
+    >>> resampler = BucketResampler.from_indices(target_area, 'indices.npy')
+
     Calculate the sum of all the data in each grid location:
 
     >>> sums = resampler.get_sum(data)
@@ -129,6 +279,18 @@ class BucketResampler(object):
 
     >>> average = resampler.get_average(data)
 
+    When several statistics are needed, they can be calculated in a single
+    pass over the data:
+
+    >>> stats = resampler.get_statistics(data, stats=('mean', 'min', 'max', 'count'))
+    >>> average = stats['mean']
+
+    Weighted averages, medians and other quantiles are also available:
+
+    >>> weighted_average = resampler.get_weighted_average(data, weights)
+    >>> median = resampler.get_median(data)
+    >>> percentiles = resampler.get_quantile(data, [0.1, 0.9])
+
     Calculate fractions of occurrences of different values in each grid
     location.  The data needs to be categorical (in integers), so
     we'll create some categorical data from the brightness temperature
@@ -141,7 +303,7 @@ class BucketResampler(object):
     >>> plt.imshow(fractions[0]); plt.show()
     """
 
-    def __init__(self, target_area, source_lons, source_lats):
+    def __init__(self, target_area, source_lons, source_lats, cache_indices=False):
         self.target_area = target_area
         self.source_lons = source_lons
         self.source_lats = source_lats
@@ -149,9 +311,49 @@ class BucketResampler(object):
         self.x_idxs = None
         self.y_idxs = None
         self.idxs = None
-        self._get_indices()
+        self._get_indices(cache_indices)
         self.counts = None
 
+    @classmethod
+    def from_indices(cls, target_area, filename, chunks=CHUNK_SIZE, mmap_mode='r'):
+        """Create a resampler from indices saved with :meth:`save_indices`.
+
+        The source coordinates are not needed, so the projection of the
+        source coordinates is skipped completely.
+
+        Parameters
+        ----------
+        target_area : AreaDefinition
+            Target area the indices were calculated for
+        filename : str
+            Path of the ``.npy`` file holding the indices
+        chunks : int or tuple
+            Chunk size of the index dask arrays
+        mmap_mode : {None, 'r', 'r+', 'c'}
+            Memory-map mode passed to :func:`numpy.load`. Default: 'r'
+        """
+        y_x_idxs = np.load(filename, mmap_mode=mmap_mode)
+        if y_x_idxs.ndim != 2 or y_x_idxs.shape[0] != 2:
+            raise ValueError("File does not contain bucket resampling indices: {}".format(filename))
+        resampler = cls.__new__(cls)
+        resampler.target_area = target_area
+        resampler.source_lons = None
+        resampler.source_lats = None
+        resampler.prj = Proj(target_area.proj_dict)
+        resampler.counts = None
+        resampler._set_indices(da.from_array(y_x_idxs[0], chunks=chunks),
+                               da.from_array(y_x_idxs[1], chunks=chunks))
+        return resampler
+
+    def save_indices(self, filename):
+        """Save the computed indices to a ``.npy`` file.
+
+        The indices can be reused for the same source coordinates and
+        target area with :meth:`from_indices`, also from other processes.
+        """
+        y_idxs, x_idxs = da.compute(self.y_idxs, self.x_idxs)
+        np.save(filename, np.stack((y_idxs, x_idxs)))
+
     def _get_proj_coordinates(self, lons, lats):
         """Calculate projection coordinates.
 
@@ -162,12 +364,14 @@ class BucketResampler(object):
         lats : Numpy or Dask array
             Latitude coordinates
         """
-        proj_x, proj_y = self.prj(lons, lats)
-        return np.stack((proj_x, proj_y))
+        return _get_proj_coordinates(lons, lats, self.prj)
 
-    def _get_indices(self):
+    def _get_indices(self, cache_indices=False):
         """Calculate projection indices.
 
+        With *cache_indices*, the indices are computed right away and kept in
+        memory for the resamplers created later for the same geometries.
+
         Returns
         -------
         x_idxs : Dask array
@@ -175,31 +379,41 @@ class BucketResampler(object):
         y_idxs : Dask array
             Y indices of the target grid where the data are put
         """
-        LOG.info("Determine bucket resampling indices")
+        cache_key = self._get_indices_cache_key() if cache_indices else None
+        if cache_key is not None and cache_key in _INDICES_CACHE:
+            LOG.info("Use cached bucket resampling indices")
+            _INDICES_CACHE.move_to_end(cache_key)
+            self._set_indices(*_INDICES_CACHE[cache_key])
+            return
 
-        # Transform source lons/lats to target projection coordinates x/y
-        lons = self.source_lons.ravel()
-        lats = self.source_lats.ravel()
-        result = da.map_blocks(self._get_proj_coordinates, lons, lats,
-                               new_axis=0, chunks=(2,) + lons.chunks)
-        proj_x = result[0, :]
-        proj_y = result[1, :]
-
-        # Calculate array indices. Orient so that 0-meridian is pointing down.
-        adef = self.target_area
-        x_res, y_res = adef.resolution
-        x_idxs = da.floor((proj_x - adef.area_extent[0]) / x_res).astype(np.int64)
-        y_idxs = da.floor((adef.area_extent[3] - proj_y) / y_res).astype(np.int64)
-
-        # Get valid index locations
-        mask = (x_idxs >= 0) & (x_idxs < adef.width) & (y_idxs >= 0) & (y_idxs < adef.height)
-        self.y_idxs = da.where(mask, y_idxs, -1)
-        self.x_idxs = da.where(mask, x_idxs, -1)
-
-        # Convert X- and Y-indices to raveled indexing
+        LOG.info("Determine bucket resampling indices")
+        y_idxs, x_idxs = _get_bucket_indices(self.target_area, self.prj,
+                                             self.source_lons, self.source_lats)
+        if cache_key is not None:
+            y_idxs, x_idxs = dask.persist(y_idxs, x_idxs)
+            _INDICES_CACHE[cache_key] = (y_idxs, x_idxs)
+            if len(_INDICES_CACHE) > _INDICES_CACHE_SIZE:
+                _INDICES_CACHE.popitem(last=False)
+        self._set_indices(y_idxs, x_idxs)
+
+    def _set_indices(self, y_idxs, x_idxs):
+        """Set the target grid indices and convert them to raveled indexing."""
+        self.y_idxs = y_idxs
+        self.x_idxs = x_idxs
         target_shape = self.target_area.shape
         self.idxs = self.y_idxs * target_shape[1] + self.x_idxs
 
+    def _get_indices_cache_key(self):
+        """Get the key of the indices in the in-memory cache, None if not hashable."""
+        try:
+            the_hash = hashlib.sha1()
+            the_hash.update(get_array_hashable(self.source_lons))
+            the_hash.update(get_array_hashable(self.source_lats))
+            self.target_area.update_hash(the_hash)
+        except (AttributeError, TypeError, ValueError):
+            return None
+        return the_hash.hexdigest()
+
     def get_sum(self, data, skipna=True):
         """Calculate sums for each bin with drop-in-a-bucket resampling.
 
@@ -251,24 +465,37 @@ class BucketResampler(object):
             statistic = da.where(nan_bins > 0, np.nan, statistic)
         return statistic
 
-    def _call_bin_statistic(self, statistic_method, data, fill_value=None, skipna=None):
-        """Calculate statistics (min/max) for each bin with drop-in-a-bucket resampling."""
+    def _call_bin_statistic(self, statistic_method, data, fill_value=None, skipna=True):
+        """Calculate statistics (min/max) for each bin with drop-in-a-bucket resampling.
+
+        Each chunk is scattered straight into a target-sized buffer and the
+        buffers of the chunks are combined with a tree reduction, so the data
+        never needs to be sorted.
+        """
         if isinstance(data, xr.DataArray):
             data = data.data
-        data = data.ravel()
+        data = da.asarray(data).ravel().astype(np.float64)
 
         # Rechunk indices to match the data chunking
         if data.chunks != self.idxs.chunks:
             self.idxs = da.rechunk(self.idxs, data.chunks)
 
-        out_shape = self.target_area.shape
-
-        statistics = da.from_delayed(
-            _get_statistics(statistic_method, data, self.idxs, out_shape),
-            shape=out_shape,
-            dtype=np.float64)
-
-        return statistics
+        out_size = self.target_area.size
+        chunk_statistics = da.blockwise(_get_chunk_bin_statistic, 'ij',
+                                        data, 'i', self.idxs, 'i',
+                                        statistic_method=statistic_method,
+                                        out_size=out_size,
+                                        new_axes={'j': out_size},
+                                        adjust_chunks={'i': 1},
+                                        dtype=np.float64,
+                                        meta=np.array((), dtype=np.float64))
+        reduce_func = _nan_ignoring_reduction(np.fmin if statistic_method == 'min' else np.fmax)
+        statistics = da.reduction(chunk_statistics, reduce_func, reduce_func,
+                                  combine=reduce_func, axis=0, dtype=np.float64,
+                                  concatenate=True)
+        statistics = self._mask_bins_with_nan_if_not_skipna(skipna, data, out_size, statistics)
+
+        return statistics.reshape(self.target_area.shape)
 
     def get_min(self, data, fill_value=np.nan, skipna=True):
         """Calculate minimums for each bin with drop-in-a-bucket resampling.
@@ -413,6 +640,217 @@ class BucketResampler(object):
 
         return average
 
+    def get_weighted_average(self, data, weights, fill_value=np.nan, skipna=True):
+        """Calculate weighted bin-averages using bucket resampling.
+
+        Parameters
+        ----------
+        data : Numpy or Dask array
+            Data to be binned and averaged.
+        weights : Numpy or Dask array
+            Weight of each data value, for example the pixel footprint or a
+            quality measure. Same shape as `data`.
+        fill_value : float
+            Fill value to mark missing/invalid values in the input data,
+            as well as in the binned and averaged output data.
+            Default: np.nan
+        skipna : bool
+            If True, skips missing values (as marked by NaN or `fill_value`,
+            or a NaN weight) for the average calculation. If False, sets the
+            bucket to fill_value if one or more missing values are present in
+            the bucket. Buckets without any weight are set to fill_value.
+            Default: True
+
+        Returns
+        -------
+        average : Dask array
+            Binned and weighted averaged data.
+        """
+        LOG.info("Get weighted average value for each location")
+
+        if isinstance(data, xr.DataArray):
+            data = data.data
+        if isinstance(weights, xr.DataArray):
+            weights = weights.data
+        data = da.asarray(data)
+        weights = da.asarray(weights)
+        if not np.isnan(fill_value):
+            data = da.where(data == fill_value, np.nan, data)
+
+        missing = np.isnan(data) | np.isnan(weights)
+        sums = self.get_sum(da.where(missing, np.nan, data * weights), skipna=skipna)
+        weight_sums = self.get_sum(da.where(missing, 0, weights))
+
+        average = sums / da.where(weight_sums == 0, np.nan, weight_sums)
+        average = da.where(np.isnan(average), fill_value, average)
+
+        return average
+
+    def get_quantile(self, data, q, fill_value=np.nan, skipna=True):
+        """Calculate quantiles of the values in each bin.
+
+        The values of every data chunk are sorted by bin and split into
+        bands of target rows, and the quantiles of each band are computed
+        from its parts in all the chunks. The number of bands grows with the
+        number of source values, so that the values of a band are about the
+        size of a dask chunk (``array.chunk-size``) if they are spread evenly
+        over the target rows.
+
+        Parameters
+        ----------
+        data : Numpy or Dask array
+            Data to be binned.
+        q : float or sequence of floats
+            Quantile(s) to compute, between 0 and 1 inclusive.
+        fill_value : float
+            Fill value to mark missing/invalid values in the input data,
+            as well as empty buckets in the output data.
+            Default: np.nan
+        skipna : bool
+            If True, skips missing values (as marked by NaN or `fill_value`).
+            If False, sets the bucket to fill_value if one or more missing
+            values are present in the bucket.
+            Default: True
+
+        Returns
+        -------
+        quantiles : Dask array
+            Bin-wise quantiles in the target grid. If `q` is a sequence, the
+            quantiles are stacked along a new first dimension.
+        """
+        LOG.info("Get quantiles of values in each location")
+        quantiles = np.atleast_1d(np.asarray(q, dtype=np.float64))
+        if quantiles.ndim != 1 or np.any((quantiles < 0) | (quantiles > 1)):
+            raise ValueError("Quantiles must be between 0 and 1")
+
+        if isinstance(data, xr.DataArray):
+            data = data.data
+        data = da.asarray(data).ravel()
+        if not np.isnan(fill_value):
+            data = da.where(data == fill_value, np.nan, data)
+
+        # Rechunk indices to match the data chunking
+        if data.chunks != self.idxs.chunks:
+            self.idxs = da.rechunk(self.idxs, data.chunks)
+
+        height, width = self.target_area.shape
+        value_bytes = data.size * (np.dtype(np.float64).itemsize + self.idxs.dtype.itemsize)
+        num_bands = np.ceil(value_bytes / dask.utils.parse_bytes(dask.config.get('array.chunk-size')))
+        num_bands = int(np.clip(num_bands, 1, height))
+        band_edges = np.linspace(0, height, num_bands + 1).round().astype(np.int64) * width
+
+        split_chunk = dask.delayed(_split_chunk_by_band, pure=True, nout=num_bands)
+        chunk_bands = [split_chunk(data_chunk, idxs_chunk, band_edges)
+                       for data_chunk, idxs_chunk in zip(data.to_delayed(), self.idxs.to_delayed())]
+        get_band_quantiles = dask.delayed(_get_band_quantiles, pure=True)
+        bands = []
+        for band_idx, (start, stop) in enumerate(zip(band_edges[:-1], band_edges[1:])):
+            band = get_band_quantiles([bands_of_chunk[band_idx] for bands_of_chunk in chunk_bands],
+                                      quantiles, start, stop, skipna)
+            bands.append(da.from_delayed(band, shape=(quantiles.size, stop - start), dtype=np.float64))
+        result = da.concatenate(bands, axis=1).reshape((quantiles.size,) + self.target_area.shape)
+
+        if not np.isnan(fill_value):
+            result = da.where(np.isnan(result), fill_value, result)
+        if np.ndim(q) == 0:
+            result = result[0]
+        return result
+
+    def get_median(self, data, fill_value=np.nan, skipna=True):
+        """Calculate the median of the values in each bin.
+
+        See :meth:`get_quantile` for the description of the parameters.
+        """
+        return self.get_quantile(data, 0.5, fill_value=fill_value, skipna=skipna)
+
+    def get_statistics(self, data, stats=STATISTICS, fill_value=np.nan, skipna=True):
+        """Calculate several statistics for each bin in a single pass.
+
+        The counts, sums, extrema and squared deviations needed for all the
+        requested statistics are collected from each chunk in one go, and
+        the chunks are merged with a tree reduction. This is much cheaper
+        than calling the individual methods for each statistic.
+
+        Parameters
+        ----------
+        data : Numpy or Dask array
+            Data to be binned.
+        stats : iterable of str
+            Statistics to calculate, any of 'sum', 'count', 'min', 'max',
+            'mean' and 'std' (population standard deviation).
+            Default: all of them
+        fill_value : float
+            Fill value to mark missing/invalid values in the input data, as
+            well as in the output data of 'min', 'max', 'mean' and 'std'.
+            Default: np.nan
+        skipna : bool
+            If True, skips missing values (as marked by NaN or `fill_value`)
+            for the calculations. If False, sets the statistics of buckets
+            containing one or more missing values to missing, apart from
+            'count' which is always the number of valid values.
+            In both cases, empty buckets have a sum and count of zero.
+            Default: True
+
+        Returns
+        -------
+        statistics : dict of Dask arrays
+            Bin-wise statistics in the target grid, keyed by statistic name
+        """
+        stats = tuple(stats)
+        unknown = set(stats) - set(STATISTICS)
+        if unknown:
+            raise ValueError("Unknown statistics: {}".format(sorted(unknown)))
+        LOG.info("Get %s of values in each location", ", ".join(stats))
+
+        if isinstance(data, xr.DataArray):
+            data = data.data
+        data = da.asarray(data).ravel()
+        if not np.isnan(fill_value):
+            data = da.where(data == fill_value, np.nan, data)
+
+        # Rechunk indices to match the data chunking
+        if data.chunks != self.idxs.chunks:
+            self.idxs = da.rechunk(self.idxs, data.chunks)
+
+        out_size = self.target_area.size
+        components = _get_moment_components(stats, skipna)
+        chunk_moments = da.blockwise(_get_chunk_bin_moments, 'ijk',
+                                     data, 'i', self.idxs, 'i',
+                                     components=components,
+                                     out_size=out_size,
+                                     new_axes={'j': len(components), 'k': out_size},
+                                     adjust_chunks={'i': 1},
+                                     dtype=np.float64,
+                                     meta=np.array((), dtype=np.float64))
+        merge_func = partial(_merge_bin_moments, components=components)
+        moments = da.reduction(chunk_moments, merge_func, merge_func,
+                               combine=merge_func, axis=0, dtype=np.float64,
+                               concatenate=True)
+        moments = dict(zip(components, moments.reshape((len(components),) + self.target_area.shape)))
+
+        counts = moments['count']
+        missing = counts == 0
+        if not skipna:
+            missing |= moments['nan_count'] > 0
+        results = {}
+        for stat in stats:
+            if stat == 'count':
+                result = counts.astype(np.int64)
+            elif stat == 'sum':
+                result = moments['sum']
+                if not skipna:
+                    result = da.where(moments['nan_count'] > 0, np.nan, result)
+            else:
+                if stat == 'mean':
+                    result = moments['sum'] / da.where(missing, 1, counts)
+                elif stat == 'std':
+                    result = da.sqrt(moments['m2'] / da.where(missing, 1, counts))
+                else:
+                    result = moments[stat]
+                result = da.where(missing, fill_value, result)
+            results[stat] = result
+        return results
+
     def get_fractions(self, data, categories=None, fill_value=np.nan):
         """Get fraction of occurrences for each given categorical value.
 
@@ -436,24 +874,161 @@ class BucketResampler(object):
         except AttributeError:
             num = len(categories)
         LOG.info("Get fractions for %d categories", num)
+
+        if isinstance(data, xr.DataArray):
+            data = data.data
+        data = da.asarray(data).ravel()
+        # Rechunk indices to match the data chunking
+        if data.chunks != self.idxs.chunks:
+            self.idxs = da.rechunk(self.idxs, data.chunks)
+
+        # Histogram all categories at once using a combined bin index
+        out_size = self.target_area.size
+        category_bins = da.map_blocks(_get_category_bins, data, self.idxs,
+                                      categories=np.asarray(categories), out_size=out_size,
+                                      dtype=np.int64)
+        histogram, _ = da.histogram(category_bins, bins=num * out_size,
+                                    range=(0, num * out_size))
+        histogram = histogram.reshape((num,) + self.target_area.shape)
+
         results = {}
         counts = self.get_count()
         counts = counts.astype(float)
-        # Disable logging for calls to get_sum()
-        LOG.disabled = True
-        for cat in categories:
-            cat_data = da.where(data == cat, 1.0, 0.0)
-
-            sums = self.get_sum(cat_data)
-            result = sums.astype(float) / counts
+        for i, cat in enumerate(categories):
+            result = histogram[i].astype(float) / counts
             result = da.where(counts == 0.0, fill_value, result)
             results[cat] = result
-        # Re-enable logging
-        LOG.disabled = False
 
         return results
 
 
+class BucketAccumulator(object):
+    """Accumulate bucket statistics over successive swath granules.
+
+    The statistics are kept in fixed-size buffers covering the target grid,
+    so any number of granules can be added in constant memory. Each granule
+    is computed when it is added, while the statistics can be retrieved at
+    any time. NaN values in the data are skipped.
+
+    Below is an example of building a daily composite from several orbits:
+
+    >>> from pyresample.bucket import BucketAccumulator
+    >>> accumulator = BucketAccumulator(target_area)
+    >>> for lons, lats, data in granules:
+    ...     accumulator.add(lons, lats, data)
+    >>> average = accumulator.get_average()
+    >>> std = accumulator.get_std()
+
+    Parameters
+    ----------
+    target_area : AreaDefinition
+        Target grid of the accumulated statistics
+    dtype : numpy dtype
+        Floating point type of the accumulation buffers. Default: float64
+    """
+
+    def __init__(self, target_area, dtype=np.float64):
+        self.target_area = target_area
+        self.dtype = np.dtype(dtype)
+        self._prj = Proj(target_area.proj_dict)
+        size = target_area.size
+        self.count = np.zeros(size, dtype=np.int64)
+        self.sum = np.zeros(size, dtype=self.dtype)
+        # Sum of squared deviations from the mean of each bin
+        self.sum_sq_dev = np.zeros(size, dtype=self.dtype)
+        self.min = np.full(size, np.inf, dtype=self.dtype)
+        self.max = np.full(size, -np.inf, dtype=self.dtype)
+        self.num_granules = 0
+
+    def add(self, source_lons, source_lats, data):
+        """Add a granule to the accumulated statistics.
+
+        Parameters
+        ----------
+        source_lons : Numpy or Dask array
+            Longitudes of the granule
+        source_lats : Numpy or Dask array
+            Latitudes of the granule
+        data : Numpy, Dask or xarray array
+            Data of the granule, same shape as the coordinates
+        """
+        LOG.info("Add granule %d to the bucket statistics", self.num_granules + 1)
+        source_lons = da.asarray(source_lons)
+        source_lats = da.asarray(source_lats).rechunk(source_lons.chunks)
+        y_idxs, x_idxs = _get_bucket_indices(self.target_area, self._prj, source_lons, source_lats)
+        if isinstance(data, xr.DataArray):
+            data = data.data
+        idxs, data = da.compute(y_idxs * self.target_area.width + x_idxs, da.asarray(data).ravel())
+        data = data.astype(self.dtype, copy=False)
+        valid = (idxs >= 0) & np.logical_not(np.isnan(data))
+        idxs = idxs[valid]
+        data = data[valid]
+        self._update(idxs, data)
+        self.num_granules += 1
+
+    def _update(self, idxs, data):
+        """Merge the statistics of the binned *data* into the buffers."""
+        size = self.target_area.size
+        count = np.bincount(idxs, minlength=size)
+        sums = np.bincount(idxs, weights=data, minlength=size)
+        hit = count > 0
+        mean = np.zeros(size, dtype=self.dtype)
+        mean[hit] = sums[hit] / count[hit]
+        sum_sq_dev = np.bincount(idxs, weights=(data - mean[idxs]) ** 2, minlength=size)
+
+        # Combine the variances with the parallel algorithm of Chan et al.
+        both = hit & (self.count > 0)
+        total = self.count[both] + count[both]
+        delta = mean[both] - self.sum[both] / self.count[both]
+        sum_sq_dev[both] += delta ** 2 * self.count[both] * count[both] / total
+
+        self.count += count
+        self.sum += sums
+        self.sum_sq_dev += sum_sq_dev
+        np.minimum.at(self.min, idxs, data)
+        np.maximum.at(self.max, idxs, data)
+
+    def _finalize(self, statistic, fill_value):
+        statistic = np.where(self.count > 0, statistic, fill_value)
+        return statistic.reshape(self.target_area.shape)
+
+    def get_count(self):
+        """Get the number of valid values in each bin."""
+        return self.count.reshape(self.target_area.shape).copy()
+
+    def get_sum(self):
+        """Get the sum of the values in each bin. Empty bins are set to zero."""
+        return self.sum.reshape(self.target_area.shape).copy()
+
+    def get_average(self, fill_value=np.nan):
+        """Get the average of the values in each bin."""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return self._finalize(self.sum / self.count, fill_value)
+
+    def get_min(self, fill_value=np.nan):
+        """Get the minimum of the values in each bin."""
+        return self._finalize(self.min, fill_value)
+
+    def get_max(self, fill_value=np.nan):
+        """Get the maximum of the values in each bin."""
+        return self._finalize(self.max, fill_value)
+
+    def get_std(self, fill_value=np.nan, ddof=0):
+        """Get the standard deviation of the values in each bin.
+
+        Parameters
+        ----------
+        fill_value : float
+            Value for empty bins and bins with no more than *ddof* values.
+        ddof : int
+            Delta degrees of freedom, see :func:`numpy.std`.
+        """
+        with np.errstate(invalid='ignore', divide='ignore'):
+            std = np.sqrt(self.sum_sq_dev / (self.count - ddof))
+        std = np.where(self.count > ddof, std, fill_value)
+        return std.reshape(self.target_area.shape)
+
+
 def round_to_resolution(arr, resolution):
     """Round the values in *arr* to closest resolution element.
 
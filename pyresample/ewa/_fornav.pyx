@@ -81,7 +81,7 @@ cdef extern from "_fornav_templates.h":
         size_t swath_cols, size_t swath_rows, size_t grid_cols, size_t grid_rows,
         CR_TYPE * uimg, CR_TYPE * vimg,
         IMAGE_TYPE * image, IMAGE_TYPE img_fill, accum_type * grid_accum, weight_type * grid_weight,
-        ewa_weight * ewaw, ewa_parameters * ewap) nogil
+        ewa_weight * ewaw, ewa_parameters * ewap, int grid_col_offset, int grid_row_offset) nogil
 
     # For some reason cython can't deduce the type when using the template
     # cdef int write_grid_image[GRID_TYPE](GRID_TYPE *output_image, GRID_TYPE fill, size_t grid_cols, size_t grid_rows,
@@ -363,7 +363,8 @@ cdef int fornav_weights_and_sums(
         image_dtype * input_array, weight_type * grid_weights, accum_type * grid_accums,
         image_dtype input_fill, grid_dtype output_fill, size_t rows_per_scan,
         unsigned int weight_count, weight_type weight_min, weight_type weight_distance_max, weight_type weight_delta_max,
-        weight_type weight_sum_min, bint maximum_weight_mode) nogil except -1:
+        weight_type weight_sum_min, bint maximum_weight_mode,
+        int grid_col_offset, int grid_row_offset) nogil except -1:
     """Get the weights and sums arrays from the fornav algorithm.
 
     Typically fornav performs the entire operation of computing the weights
@@ -418,7 +419,8 @@ cdef int fornav_weights_and_sums(
             maximum_weight_mode,
             swath_cols, rows_per_scan, grid_cols, grid_rows,
             tmp_cols_pointer, tmp_rows_pointer,
-            tmp_img_pointer, input_fill, grid_accums, grid_weights, & ewaw, ewap)
+            tmp_img_pointer, input_fill, grid_accums, grid_weights, & ewaw, ewap,
+            grid_col_offset, grid_row_offset)
 
         got_point = got_point or tmp_got_point
 
@@ -440,7 +442,8 @@ def fornav_weights_and_sums_wrapper(numpy.ndarray[cr_dtype, ndim=2, mode='c'] co
                                     image_dtype input_fill, grid_dtype output_fill,
                                     size_t rows_per_scan,
                                     unsigned int weight_count=10000, weight_type weight_min=0.01, weight_type weight_distance_max=1.0, weight_type weight_delta_max=10.0, weight_type weight_sum_min=-1.0,
-                                    cpython.bool maximum_weight_mode=False):
+                                    cpython.bool maximum_weight_mode=False,
+                                    int grid_col_offset=0, int grid_row_offset=0):
     """Python wrapper around the C interface to fornav weights and sums steps.
 
     The main difficulty is that the C code can operate on multiple input
@@ -482,6 +485,12 @@ def fornav_weights_and_sums_wrapper(numpy.ndarray[cr_dtype, ndim=2, mode='c'] co
              If -m is present, the swath cell having the maximum weight of all
              swath cells that map to a particular grid cell is used. The -m
              option should be used for coded data, i.e. snow cover.
+    :param grid_col_offset: column of the full grid, that `cols_array` refers
+             to, where the `grid_weights` and `grid_accums` arrays start.
+             Default is 0.
+    :param grid_row_offset: row of the full grid, that `rows_array` refers
+             to, where the `grid_weights` and `grid_accums` arrays start.
+             Default is 0.
     :return: boolean if any input data was used on a any output grid cell
     """
     cdef size_t swath_cols = cols_array.shape[1]
@@ -505,7 +514,7 @@ def fornav_weights_and_sums_wrapper(numpy.ndarray[cr_dtype, ndim=2, mode='c'] co
                                           input_pointer, weights_pointer, accums_pointer,
                                           input_fill, output_fill, rows_per_scan,
                                           weight_count, weight_min, weight_distance_max, weight_delta_max, weight_sum_min,
-                                          mwm)
+                                          mwm, grid_col_offset, grid_row_offset)
 
     succeeded = ret_val == 0
     return succeeded
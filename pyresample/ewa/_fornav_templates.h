@@ -59,7 +59,7 @@ extern int compute_ewa_single(int maximum_weight_mode,
         size_t swath_cols, size_t swath_rows, size_t grid_cols, size_t grid_rows,
         CR_TYPE *uimg, CR_TYPE *vimg,
         IMAGE_TYPE *image, IMAGE_TYPE img_fill, accum_type *grid_accum, weight_type *grid_weight,
-        ewa_weight *ewaw, ewa_parameters *ewap);
+        ewa_weight *ewaw, ewa_parameters *ewap, int grid_col_offset, int grid_row_offset);
 
 template<typename GRID_TYPE> unsigned int write_grid_image(GRID_TYPE *output_image, GRID_TYPE fill,
         size_t grid_cols, size_t grid_rows,
@@ -28,8 +28,12 @@ them, this implementation should avoid unnecessary array creation and memory
 usage until necessary.
 
 """
+import json
 import logging
 import math
+import os
+import shutil
+import tempfile
 from functools import partial
 
 import dask
@@ -38,6 +42,7 @@ import numpy as np
 from dask.array.core import normalize_chunks
 from dask.highlevelgraph import HighLevelGraph
 
+from pyresample._multi_proc import run_chunked
 from pyresample.ewa import ll2cr
 from pyresample.ewa._fornav import (
     fornav_weights_and_sums_wrapper,
@@ -74,13 +79,122 @@ def _call_mapped_ll2cr(lons, lats, target_geo_def):
     return res
 
 
+def _is_empty_ll2cr_block(ll2cr_block):
+    """Tell if an ll2cr block has no pixel in the target area."""
+    return isinstance(ll2cr_block[0], tuple)
+
+
+def _get_ll2cr_footprint(ll2cr_block):
+    """Get the ``(row_min, row_max, col_min, col_max)`` extent of an ll2cr block in the target grid.
+
+    Returns ``None`` if the block has no valid pixel in the target area.
+    """
+    if _is_empty_ll2cr_block(ll2cr_block):
+        return None
+    # fmin/fmax ignore NaNs without warnings
+    col_min, row_min = np.fmin.reduce(ll2cr_block, axis=(1, 2))
+    col_max, row_max = np.fmax.reduce(ll2cr_block, axis=(1, 2))
+    if np.isnan(col_min) or np.isnan(row_min):
+        return None
+    return float(row_min), float(row_max), float(col_min), float(col_max)
+
+
+def _save_ll2cr_block(ll2cr_block, filename):
+    """Save a non-empty ll2cr block to *filename* and return its footprint."""
+    footprint = _get_ll2cr_footprint(ll2cr_block)
+    if footprint is not None:
+        np.save(filename, ll2cr_block)
+    return footprint
+
+
+def _load_ll2cr_block(filename):
+    return np.load(filename)
+
+
+def _empty_ll2cr_block(shape, dtype):
+    return (shape, np.nan, dtype), (shape, np.nan, dtype)
+
+
+def _ll2cr_block_filename(cache_filename, in_row_idx, in_col_idx):
+    return os.path.join(cache_filename, f"block_{in_row_idx}_{in_col_idx}.npy")
+
+
+def _save_ll2cr_cache(ll2cr_result, cache_filename):
+    """Compute the ll2cr blocks and save them in the *cache_filename* directory.
+
+    Only blocks overlapping the target area are saved, their footprints and
+    the indices of the other blocks are listed in ``ll2cr_blocks.json`` with
+    the chunks and dtype of the result.
+    """
+    cache_dir = os.path.dirname(cache_filename) or '.'
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(dir=cache_dir, prefix='.tmp_')
+    try:
+        ll2cr_delayeds = ll2cr_result.to_delayed()
+        block_indices = list(np.ndindex(ll2cr_delayeds.shape))
+        saved = [dask.delayed(_save_ll2cr_block)(ll2cr_delayeds[idx],
+                                                 _ll2cr_block_filename(tmp_dir, *idx))
+                 for idx in block_indices]
+        footprints = dask.compute(*saved)
+        metadata = {
+            'chunks': ll2cr_result.chunks,
+            'dtype': ll2cr_result.dtype.str,
+            'empty_blocks': [idx for idx, footprint in zip(block_indices, footprints) if footprint is None],
+            'footprints': [[idx, footprint] for idx, footprint in zip(block_indices, footprints)
+                           if footprint is not None],
+        }
+        with open(os.path.join(tmp_dir, 'll2cr_blocks.json'), 'w') as fd:
+            json.dump(metadata, fd)
+        os.rename(tmp_dir, cache_filename)
+    except OSError:
+        # another process may have stored the same results in the meantime
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        if not os.path.isdir(cache_filename):
+            raise
+    logger.debug("Stored ll2cr results in cache: %s", cache_filename)
+
+
+def _load_ll2cr_cache(cache_filename):
+    """Load the ll2cr results saved in *cache_filename* lazily.
+
+    Returns the ll2cr dask array, the block cache pointing to the blocks
+    overlapping the target area and the footprints of these blocks.
+    """
+    with open(os.path.join(cache_filename, 'll2cr_blocks.json')) as fd:
+        metadata = json.load(fd)
+    chunks = tuple(tuple(dim_chunks) for dim_chunks in metadata['chunks'])
+    dtype = np.dtype(metadata['dtype'])
+    empty_blocks = set(tuple(idx) for idx in metadata['empty_blocks'])
+    name = 'll2cr-' + os.path.basename(os.path.normpath(cache_filename))
+    footprints = {(name, *idx): tuple(footprint) for idx, footprint in metadata.get('footprints', [])}
+    dsk = {}
+    block_cache = {}
+    for in_row_idx, num_rows in enumerate(chunks[0]):
+        for in_col_idx, num_cols in enumerate(chunks[1]):
+            key = (name, in_row_idx, in_col_idx)
+            if (in_row_idx, in_col_idx) in empty_blocks:
+                dsk[key] = (_empty_ll2cr_block, (num_rows, num_cols), dtype)
+            else:
+                block_filename = _ll2cr_block_filename(cache_filename, in_row_idx, in_col_idx)
+                dsk[key] = (_load_ll2cr_block, block_filename)
+                block_cache[key] = key
+    ll2cr_result = da.Array(dsk, name, chunks, dtype,
+                            meta=np.array((), dtype=dtype))
+    return ll2cr_result, block_cache, footprints or None
+
+
 def _delayed_fornav(ll2cr_result, target_geo_def, y_slice, x_slice, data, fill_value, kwargs):
-    # Adjust cols and rows for this sub-area
-    subdef = target_geo_def[y_slice, x_slice]
+    """Get the fornav weights and sums of one input block in one output chunk.
+
+    Only the window of the output chunk that the input block can reach is
+    allocated and returned as ``(weights, accums, ((row_start, col_start),
+    chunk_shape))``.
+    """
+    chunk_shape = (y_slice.stop - y_slice.start, x_slice.stop - x_slice.start)
     weights_dtype = np.float32
     accums_dtype = np.float32
-    empty_weights = (subdef.shape, 0, weights_dtype)
-    empty_accums = (subdef.shape, 0, accums_dtype)
+    empty_weights = (chunk_shape, 0, weights_dtype)
+    empty_accums = (chunk_shape, 0, accums_dtype)
 
     # Empty ll2cr results: ((shape, fill, dtype), (shape, fill, dtype))
     if isinstance(ll2cr_result[0], tuple):
@@ -88,26 +202,72 @@ def _delayed_fornav(ll2cr_result, target_geo_def, y_slice, x_slice, data, fill_v
         return empty_weights, empty_accums
     cols = ll2cr_result[0]
     rows = ll2cr_result[1]
-    if x_slice.start != 0:
-        cols = cols - x_slice.start
-    if y_slice.start != 0:
-        rows = rows - y_slice.start
-    weights = np.zeros(subdef.shape, dtype=weights_dtype)
-    accums = np.zeros(subdef.shape, dtype=accums_dtype)
-    try:
-        got_points = fornav_weights_and_sums_wrapper(
-            cols, rows, data, weights, accums, fill_value, fill_value,
-            **kwargs)
-    except RuntimeError:
+    window = _get_fornav_window(_get_ll2cr_footprint(ll2cr_result), y_slice, x_slice,
+                                _get_fornav_margin(kwargs))
+    if window is None:
         return empty_weights, empty_accums
+    row_slice, col_slice = window
+    window_shape = (row_slice.stop - row_slice.start, col_slice.stop - col_slice.start)
+    weights = np.zeros(window_shape, dtype=weights_dtype)
+    accums = np.zeros(window_shape, dtype=accums_dtype)
+    got_points = _fornav_weights_and_sums(cols, rows, data, weights, accums, fill_value,
+                                          grid_col_offset=x_slice.start + col_slice.start,
+                                          grid_row_offset=y_slice.start + row_slice.start,
+                                          **kwargs)
     if not got_points:
         return empty_weights, empty_accums
-    return weights, accums
+    return weights, accums, ((row_slice.start, col_slice.start), chunk_shape)
+
+
+def _get_fornav_margin(fornav_kwargs):
+    """Get the maximum number of grid cells a swath pixel is spread over in each direction."""
+    return max(fornav_kwargs.get('weight_delta_max', 10.0),
+               fornav_kwargs.get('weight_distance_max', 1.0))
+
+
+def _get_fornav_window(footprint, y_slice, x_slice, margin):
+    """Get the part of an output chunk that swath pixels with the given *footprint* can contribute to.
 
+    Returns ``None`` if the chunk can't be reached.
+    """
+    if footprint is None:
+        return None
+    window = []
+    for coord_min, coord_max, chunk_slice in ((footprint[0], footprint[1], y_slice),
+                                              (footprint[2], footprint[3], x_slice)):
+        start = max(math.floor(coord_min - chunk_slice.start - margin), 0)
+        stop = min(math.ceil(coord_max - chunk_slice.start + margin) + 1,
+                   chunk_slice.stop - chunk_slice.start)
+        if start >= stop:
+            return None
+        window.append(slice(start, stop))
+    return tuple(window)
+
+
+def _fornav_weights_and_sums(cols, rows, data, weights, accums, fill_value, num_threads=1,
+                             grid_col_offset=0, grid_row_offset=0, **kwargs):
+    """Accumulate the weights and sums of fornav in row bands of the grid, one band per thread.
+
+    Every band is written by a single thread, so the threads share the
+    ``weights`` and ``accums`` arrays instead of each needing their own.
+    """
+    got_points = []
+
+    def _fornav_band(band):
+        try:
+            got_band_points = fornav_weights_and_sums_wrapper(
+                cols, rows, data, weights[band], accums[band], fill_value, fill_value,
+                grid_col_offset=grid_col_offset, grid_row_offset=grid_row_offset + band.start,
+                **kwargs)
+        except RuntimeError:
+            got_band_points = False
+        got_points.append(got_band_points)
 
-def _chunk_callable(x_chunk, axis, keepdims, **kwargs):
-    """No-op for reduction call."""
-    return x_chunk
+    if num_threads > 1:
+        run_chunked(_fornav_band, weights.shape[0], num_threads, schedule='static')
+    else:
+        _fornav_band(slice(0, weights.shape[0]))
+    return any(got_points)
 
 
 def _combine_fornav(x_chunk, axis, keepdims, computing_meta=False,
@@ -125,22 +285,36 @@ def _combine_fornav(x_chunk, axis, keepdims, computing_meta=False,
     #   2. ('missing_chunk', i, j, k)
     valid_chunks = [x for x in x_chunk if not isinstance(x[0], (str, tuple))]
     if not len(valid_chunks):
-        if keepdims:
-            # split step - return "empty" chunk placeholder
-            return x_chunk[0]
-        return np.full(*x_chunk[0][0]), np.full(*x_chunk[0][1])
-    weights = [x[0] for x in valid_chunks]
-    accums = [x[1] for x in valid_chunks]
-    if maximum_weight_mode:
-        weights = np.array(weights)
-        accums = np.array(accums)
-        max_indexes = np.expand_dims(np.argmax(weights, axis=0), axis=0)
-        weights = np.take_along_axis(weights, max_indexes, axis=0).squeeze(axis=0)
-        accums = np.take_along_axis(accums, max_indexes, axis=0).squeeze(axis=0)
-        return weights, accums
-    # NOTE: We use the builtin "sum" function below because it does not copy
-    #       the numpy arrays. Using numpy.sum would do that.
-    return sum(weights), sum(accums)
+        # return "empty" chunk placeholder
+        return x_chunk[0]
+    if len(valid_chunks) == 1:
+        return valid_chunks[0]
+    return _accumulate_fornav_windows(valid_chunks, maximum_weight_mode)
+
+
+def _accumulate_fornav_windows(chunks, maximum_weight_mode):
+    """Accumulate windows of fornav weights and sums in a window covering all of them.
+
+    The windows are added one at a time into a single pair of float32 arrays.
+    """
+    chunk_shape = chunks[0][2][1]
+    starts = np.array([chunk[2][0] for chunk in chunks])
+    stops = starts + np.array([chunk[0].shape for chunk in chunks])
+    start = starts.min(axis=0)
+    stop = stops.max(axis=0)
+    weights = np.zeros(stop - start, dtype=chunks[0][0].dtype)
+    accums = np.zeros(stop - start, dtype=chunks[0][1].dtype)
+    for (chunk_weights, chunk_accums, _), chunk_start, chunk_stop in zip(chunks, starts, stops):
+        window = (slice(chunk_start[0] - start[0], chunk_stop[0] - start[0]),
+                  slice(chunk_start[1] - start[1], chunk_stop[1] - start[1]))
+        if maximum_weight_mode:
+            larger = chunk_weights > weights[window]
+            weights[window][larger] = chunk_weights[larger]
+            accums[window][larger] = chunk_accums[larger]
+        else:
+            weights[window] += chunk_weights
+            accums[window] += chunk_accums
+    return weights, accums, (tuple(start), chunk_shape)
 
 
 def _is_empty_chunk(x_chunk):
@@ -162,19 +336,27 @@ def _average_fornav(x_chunk, axis, keepdims, computing_meta=False, dtype=None,
         # res is (weights_info, accums_info)
         # weights_info is (shape, fill, dtype)
         return np.full(res[0][0], fill_value, dtype)
-    weights, accums = res
-    out = np.full(weights.shape, fill_value, dtype=dtype)
-    write_grid_image_single(out, weights, accums, fill_value,
+    weights, accums, ((row_start, col_start), chunk_shape) = res
+    window_out = np.full(weights.shape, fill_value, dtype=dtype)
+    write_grid_image_single(window_out, weights, accums, fill_value,
                             weight_sum_min=weight_sum_min,
                             maximum_weight_mode=maximum_weight_mode)
+    if window_out.shape == chunk_shape:
+        return window_out
+    out = np.full(chunk_shape, fill_value, dtype=dtype)
+    out[row_start:row_start + weights.shape[0], col_start:col_start + weights.shape[1]] = window_out
     return out
 
 
 class DaskEWAResampler(BaseResampler):
     """Resample using an elliptical weighted averaging algorithm.
 
-    This algorithm does **not** use caching or any externally provided data
-    mask (unlike the 'nearest' resampler).
+    This algorithm does **not** use any externally provided data mask (unlike
+    the 'nearest' resampler). When a ``cache_dir`` is passed to
+    :meth:`precompute` the ll2cr results (the column and row of every swath
+    pixel in the target area) are saved in that directory, keyed by the
+    source and target geometries, and loaded lazily by later resamplers
+    using the same geolocation instead of being computed again.
 
     This algorithm works under the assumption that the data is observed
     one scan line at a time. However, good results can still be achieved
@@ -234,21 +416,24 @@ class DaskEWAResampler(BaseResampler):
         if persist:
             ll2cr_delayeds = ll2cr_result.to_delayed()
             ll2cr_delayeds = dask.persist(*ll2cr_delayeds.tolist())
+            # get the footprints of all the blocks at once, only they are sent back
+            block_footprints = dask.compute(*[[dask.delayed(_get_ll2cr_footprint)(this_delayed)
+                                               for this_delayed in delayed_row]
+                                              for delayed_row in ll2cr_delayeds])
 
         block_cache = {}
+        footprints = {}
         for in_row_idx in range(num_row_blocks):
             for in_col_idx in range(num_col_blocks):
                 key = (ll2cr_result.name, in_row_idx, in_col_idx)
                 if persist:
-                    this_delayed = ll2cr_delayeds[in_row_idx][in_col_idx]
-                    result = dask.compute(this_delayed)[0]
-                    # XXX: Is this optimization lost because the persisted keys
-                    #  in `ll2cr_delayeds` are used in future computations?
-                    if not isinstance(result[0], tuple):
-                        block_cache[key] = this_delayed.key
+                    footprint = block_footprints[in_row_idx][in_col_idx]
+                    if footprint is not None:
+                        block_cache[key] = ll2cr_delayeds[in_row_idx][in_col_idx].key
+                        footprints[key] = footprint
                 else:
                     block_cache[key] = key
-        return block_cache
+        return block_cache, footprints or None
 
     def precompute(self, cache_dir=None, rows_per_scan=None, persist=False,
                    **kwargs):
@@ -264,8 +449,6 @@ class DaskEWAResampler(BaseResampler):
 
         source_geo_def = self.source_geo_def
         target_geo_def = self.target_geo_def
-        if cache_dir:
-            logger.warning("'cache_dir' is not used by EWA resampling")
 
         rows_per_scan = self._get_rows_per_scan(rows_per_scan)
         new_chunks = self._new_chunks(source_geo_def.lons, rows_per_scan)
@@ -274,13 +457,24 @@ class DaskEWAResampler(BaseResampler):
         # if chunk does not overlap target area then None is returned
         # otherwise a 3D array (2, y, x) of cols, rows are returned
         ll2cr_result = _call_mapped_ll2cr(lons, lats, target_geo_def)
-        block_cache = self._fill_block_cache_with_ll2cr_results(
-            ll2cr_result, lons.numblocks[0], lons.numblocks[1], persist)
+        if cache_dir:
+            cache_filename = self._create_cache_filename(
+                cache_dir, prefix='ll2cr_', fmt='', chunks=lons.chunks)
+            if not os.path.isdir(cache_filename):
+                _save_ll2cr_cache(ll2cr_result, cache_filename)
+            ll2cr_result, block_cache, footprints = _load_ll2cr_cache(cache_filename)
+            if persist:
+                ll2cr_result = ll2cr_result.persist()
+        else:
+            block_cache, footprints = self._fill_block_cache_with_ll2cr_results(
+                ll2cr_result, lons.numblocks[0], lons.numblocks[1], persist)
 
         # save the dask arrays in the class instance cache
+        # footprints are only known if ll2cr was computed (persisted or cached)
         self.cache = {
             'll2cr_result': ll2cr_result,
             'll2cr_blocks': block_cache,
+            'll2cr_footprints': footprints,
         }
         return None
 
@@ -323,7 +517,14 @@ class DaskEWAResampler(BaseResampler):
 
     @staticmethod
     def _generate_fornav_dask_tasks(out_chunks, ll2cr_blocks, task_name,
-                                    input_name, target_geo_def, fill_value, kwargs):
+                                    input_name, target_geo_def, fill_value, kwargs,
+                                    footprints=None):
+        """Generate the fornav tasks of every pair of input block and output chunk.
+
+        If the *footprints* of the ll2cr blocks are known, pairs where the
+        input block can't reach the output chunk are skipped.
+        """
+        margin = _get_fornav_margin(kwargs)
         y_start = 0
         output_stack = {}
         for out_row_idx in range(len(out_chunks[0])):
@@ -333,7 +534,11 @@ class DaskEWAResampler(BaseResampler):
                 x_end = x_start + out_chunks[1][out_col_idx]
                 y_slice = slice(y_start, y_end)
                 x_slice = slice(x_start, x_end)
-                for z_idx, ((_, in_row_idx, in_col_idx), ll2cr_block) in enumerate(ll2cr_blocks):
+                for z_idx, (ll2cr_key, ll2cr_block) in enumerate(ll2cr_blocks):
+                    if footprints is not None and \
+                            _get_fornav_window(footprints[ll2cr_key], y_slice, x_slice, margin) is None:
+                        continue
+                    _, in_row_idx, in_col_idx = ll2cr_key
                     key = (task_name, z_idx, out_row_idx, out_col_idx)
                     output_stack[key] = (_delayed_fornav,
                                          ll2cr_block,
@@ -343,10 +548,39 @@ class DaskEWAResampler(BaseResampler):
             y_start = y_end
         return output_stack
 
+    @staticmethod
+    def _generate_average_dask_tasks(out_chunks, fornav_tasks, task_name, combine_func, average_func,
+                                     fill_value, dtype, split_every=4):
+        """Generate the tree reduction tasks combining the fornav tasks of each output chunk.
+
+        Output chunks without any fornav task are filled with *fill_value*.
+        """
+        fornav_keys = {}
+        for key in fornav_tasks:
+            fornav_keys.setdefault(key[2:], []).append(key)
+        output_stack = {}
+        for out_row_idx, num_rows in enumerate(out_chunks[0]):
+            for out_col_idx, num_cols in enumerate(out_chunks[1]):
+                keys = fornav_keys.get((out_row_idx, out_col_idx))
+                out_key = (task_name, out_row_idx, out_col_idx)
+                if not keys:
+                    output_stack[out_key] = (partial(np.full, (num_rows, num_cols), fill_value, dtype=dtype),)
+                    continue
+                depth = 0
+                while len(keys) > split_every:
+                    groups = [keys[idx:idx + split_every] for idx in range(0, len(keys), split_every)]
+                    keys = []
+                    for group_idx, group in enumerate(groups):
+                        key = ('combine-' + task_name, depth, group_idx, out_row_idx, out_col_idx)
+                        output_stack[key] = (combine_func, group)
+                        keys.append(key)
+                    depth += 1
+                output_stack[out_key] = (average_func, keys)
+        return output_stack
+
     def _run_fornav_single(self, data, out_chunks, target_geo_def, fill_value, **kwargs):
         ll2cr_result = self.cache['ll2cr_result']
         ll2cr_blocks = self.cache['ll2cr_blocks'].items()
-        ll2cr_numblocks = ll2cr_result.shape if isinstance(ll2cr_result, np.ndarray) else ll2cr_result.numblocks
         fornav_task_name = f"fornav-{data.name}-{ll2cr_result.name}"
         maximum_weight_mode = kwargs.setdefault('maximum_weight_mode', False)
         weight_sum_min = kwargs.setdefault('weight_sum_min', -1.0)
@@ -356,29 +590,31 @@ class DaskEWAResampler(BaseResampler):
                                                         data.name,
                                                         target_geo_def,
                                                         fill_value,
-                                                        kwargs)
-
-        dsk_graph = HighLevelGraph.from_collections(fornav_task_name,
-                                                    output_stack,
-                                                    dependencies=[data, ll2cr_result])
-        stack_chunks = ((1,) * (ll2cr_numblocks[0] * ll2cr_numblocks[1]),) + out_chunks
-        out_stack = da.Array(dsk_graph, fornav_task_name, stack_chunks, data.dtype)
+                                                        kwargs,
+                                                        self.cache.get('ll2cr_footprints'))
         combine_fornav_with_kwargs = partial(
-            _combine_fornav, maximum_weight_mode=maximum_weight_mode)
+            _combine_fornav, axis=(0,), keepdims=True,
+            maximum_weight_mode=maximum_weight_mode)
         average_fornav_with_kwargs = partial(
-            _average_fornav, maximum_weight_mode=maximum_weight_mode,
+            _average_fornav, axis=(0,), keepdims=False,
+            maximum_weight_mode=maximum_weight_mode,
             weight_sum_min=weight_sum_min, dtype=data.dtype,
             fill_value=fill_value)
-        out = da.reduction(out_stack, _chunk_callable,
-                           average_fornav_with_kwargs,
-                           combine=combine_fornav_with_kwargs, axis=(0,),
-                           dtype=data.dtype, concatenate=False)
-        return out
+        average_task_name = 'average-' + fornav_task_name
+        output_stack.update(self._generate_average_dask_tasks(out_chunks, output_stack, average_task_name,
+                                                              combine_fornav_with_kwargs,
+                                                              average_fornav_with_kwargs,
+                                                              fill_value, data.dtype))
+        dsk_graph = HighLevelGraph.from_collections(average_task_name,
+                                                    output_stack,
+                                                    dependencies=[data, ll2cr_result])
+        return da.Array(dsk_graph, average_task_name, out_chunks, data.dtype,
+                        meta=np.array((), dtype=data.dtype))
 
     def compute(self, data, cache_id=None, rows_per_scan=None, chunks=None, fill_value=None,
                 weight_count=10000, weight_min=0.01, weight_distance_max=1.0,
                 weight_delta_max=10.0, weight_sum_min=-1.0,
-                maximum_weight_mode=None, **kwargs):
+                maximum_weight_mode=None, num_threads=1, **kwargs):
         """Resample the data according to the precomputed X/Y coordinates."""
         # not used in this step
         kwargs.pop("persist", None)
@@ -398,6 +634,7 @@ class DaskEWAResampler(BaseResampler):
             weight_sum_min=weight_sum_min,
             maximum_weight_mode=maximum_weight_mode,
             rows_per_scan=rows_per_scan,
+            num_threads=num_threads,
         ))
 
         # determine a fill value if they didn't tell us what they have as a
@@ -452,11 +689,11 @@ class DaskEWAResampler(BaseResampler):
                  rows_per_scan=None, persist=False, chunks=None, fill_value=None,
                  weight_count=10000, weight_min=0.01, weight_distance_max=1.0,
                  weight_delta_max=10.0, weight_sum_min=-1.0,
-                 maximum_weight_mode=None):
+                 maximum_weight_mode=None, num_threads=1):
         """Resample using an elliptical weighted averaging algorithm.
 
-        This algorithm does **not** use caching or any externally provided data
-        mask (unlike the 'nearest' resampler).
+        This algorithm does **not** use any externally provided data mask
+        (unlike the 'nearest' resampler).
         See the :class:`~satpy.ewa.dask_ewa.DaskEWAResampler` class docstring
         for more information on how the algorithm works.
 
@@ -475,7 +712,10 @@ class DaskEWAResampler(BaseResampler):
                 type, data is converted to a dask array for internal
                 processing and converted back to the original data type on
                 return.
-            cache_dir (str, None): Not used by this resampler.
+            cache_dir (str, None): Directory where the ll2cr results are
+                cached on disk. If the results for the same source and
+                target geometries are already in the directory they are
+                loaded lazily instead of being computed again.
             mask_area (bool, None): Not used by this resampler.
             rows_per_scan (int, None): Number of array rows that represent a
                 single scan of the instrument. If ``None`` (default), then
@@ -524,6 +764,12 @@ class DaskEWAResampler(BaseResampler):
                 If True, the swath cell having the maximum weight of all
                 swath cells that map to a particular grid cell is used. This
                 option should be used for coded/category data, i.e. snow cover.
+            num_threads (int):
+                Number of threads used to resample each pair of input and
+                output chunks. The output chunk is split in row bands
+                computed in parallel and sharing the same weights and sums
+                arrays, so larger input chunks can be used without holding
+                more accumulation arrays in memory. Default is 1.
 
         """
         mask_area = False if mask_area is None else mask_area
@@ -538,5 +784,6 @@ class DaskEWAResampler(BaseResampler):
                                 weight_distance_max=weight_distance_max,
                                 weight_delta_max=weight_delta_max,
                                 weight_sum_min=weight_sum_min,
-                                maximum_weight_mode=maximum_weight_mode
+                                maximum_weight_mode=maximum_weight_mode,
+                                num_threads=num_threads,
                                 )
@@ -21,6 +21,7 @@ from __future__ import annotations
 
 import warnings
 from copy import deepcopy
+from functools import partial
 from logging import getLogger
 
 import numpy as np
@@ -38,6 +39,8 @@ logger = getLogger(__name__)
 try:
     import dask
     import dask.array as da
+    from dask.base import tokenize
+    from dask.highlevelgraph import HighLevelGraph
     from xarray import DataArray
 except ImportError:
     DataArray = None
@@ -102,6 +105,123 @@ def _my_index(index_arr, vii, data_arr, vii_slices=None, ia_slices=None,
     return res
 
 
+class _KDTreePartition(object):
+    """KD tree over a subset of the valid source coordinates.
+
+    pykdtree trees can not be pickled, so a partition is pickled as its
+    coordinates and the tree is rebuilt on unpickling. This lets
+    dask.distributed move partitions between workers.
+    """
+
+    def __init__(self, coords, offset):
+        self.coords = coords
+        # index of the first coordinate among all valid source coordinates
+        # when the partitions hold consecutive parts of them
+        self.offset = offset
+        self.n = len(coords)
+        self.center, self.radius = _get_bounding_sphere(coords)
+        self.kdtree = KDTree(coords) if self.n else None
+
+    def __reduce__(self):
+        return self.__class__, (self.coords, self.offset)
+
+
+def _get_bounding_sphere(coords):
+    """Get the center and radius of a sphere enclosing *coords*."""
+    if not len(coords):
+        return None, 0.
+    center = coords.mean(axis=0)
+    radius = np.sqrt(((coords - center) ** 2).sum(axis=1).max())
+    return center, radius
+
+
+def _create_window_kdtree(source_lons, source_lats, input_ranks):
+    """Build a kd tree over the valid pixels of a window of the source geometry.
+
+    Returns the tree, the valid pixels of the window and, for every valid
+    pixel of the window, its index among all valid source pixels.
+    """
+    valid_input_index = ((source_lons >= -180) & (source_lons <= 180) & (source_lats <= 90) & (source_lats >= -90))
+    coords = lonlat2xyz(source_lons, source_lats)[valid_input_index.ravel()]
+    return _KDTreePartition(coords.astype(np.float64), 0), valid_input_index, input_ranks[valid_input_index]
+
+
+def _get_valid_input_ranks(valid_input_index):
+    """Get the index of every valid source pixel among all valid source pixels, in C order."""
+    row_counts = valid_input_index.sum(axis=1)
+    row_starts = da.cumsum(row_counts) - row_counts
+    return row_starts[:, None] + da.cumsum(valid_input_index, axis=1) - 1
+
+
+def _area_wraps_around(area):
+    """Check if *area* contains a pole or crosses the antimeridian.
+
+    The source slice of such an area can miss some of the source pixels it
+    covers. Areas with edges off the Earth are considered wrapping too, as
+    their extent in longitude can not be checked.
+    """
+    cols, rows = area.get_array_indices_from_lonlat([0, 0], [90, -90])
+    if not (np.ma.getmaskarray(cols) | np.ma.getmaskarray(rows)).all():
+        return True
+    lons, lats = area.get_edge_lonlats()
+    lons = np.ma.filled(lons, np.nan)
+    if not (np.isfinite(lons).all() and np.isfinite(np.ma.filled(lats, np.nan)).all()):
+        return True
+    return bool(np.any(np.abs(np.diff(np.append(lons, lons[0]))) > 180))
+
+
+def _x_is_longitude(area):
+    """Check if the projection x coordinates of the lon/lat *area* are its longitudes."""
+    x_coords = area.get_proj_vectors()[0]
+    lons = area.get_lonlats(data_slice=(0, slice(None)))[0]
+    return np.allclose(x_coords, lons)
+
+
+def _get_source_slices(source_geo_def, chunk_area):
+    """Get the slices of *source_geo_def* covering *chunk_area*.
+
+    Raises InvalidArea when the outline of *chunk_area* in the coordinates
+    of a source swath isn't a valid polygon.
+    """
+    from pyresample.geometry import InvalidArea
+    from pyresample.slicer import SwathSlicer, create_slicer
+
+    slicer = create_slicer(source_geo_def, chunk_area)
+    poly = slicer.get_polygon_to_contain()
+    if isinstance(slicer, SwathSlicer) and not poly.is_valid:
+        raise InvalidArea("Target chunk outline is not a valid polygon.")
+    return slicer.get_slices_from_polygon(poly)
+
+
+def _query_window_kdtree(target_lons, target_lats, valid_output_index,
+                         window_kdtree, mask=None, neighbours=None,
+                         epsilon=None, radius=None):
+    """Query the kd tree of a source window for a target chunk.
+
+    The returned indexes refer to the flattened source geometry.
+    """
+    partition, valid_input_index, flat_indices = window_kdtree
+    if not partition.n:
+        return np.full(valid_output_index.shape + (neighbours,), -1, dtype=int)
+    res_ia = query_no_distance(target_lons, target_lats, valid_output_index,
+                               mask=mask, valid_input_index=valid_input_index,
+                               neighbours=neighbours, epsilon=epsilon,
+                               radius=radius, kdtree=partition.kdtree)
+    good_pixels = res_ia >= 0
+    res_ia[good_pixels] = flat_indices[res_ia[good_pixels]]
+    return res_ia
+
+
+def _pad_area(area, margin):
+    """Get *area* with *margin* pixels added on every side."""
+    xmin, ymin, xmax, ymax = area.area_extent
+    x_pad = margin * area.pixel_size_x
+    y_pad = margin * area.pixel_size_y
+    return area.copy(width=area.width + 2 * margin,
+                     height=area.height + 2 * margin,
+                     area_extent=(xmin - x_pad, ymin - y_pad, xmax + x_pad, ymax + y_pad))
+
+
 # TODO: Add decorator for geom<->geom support
 # TODO: Add decorator for object type support
 # Must be decorators so that we can both add class attributes with this information
@@ -209,18 +329,24 @@ class KDTreeNearestXarrayResampler(Resampler):
             warnings.warn('Searching for %s neighbors in %s data points' %
                           (neighbors, self.source_geo_def.size), stacklevel=3)
 
-        # Create kd-tree
         chunks = mask.chunks if mask is not None else CHUNK_SIZE
-        valid_input_idx, resample_kdtree = self._create_resample_kdtree(chunks=chunks)
-
         # TODO: Add 'chunks' keyword argument to this method and use it
         target_lons, target_lats = self.target_geo_def.get_lonlats(chunks=CHUNK_SIZE)
         valid_output_idx = ((target_lons >= -180) & (target_lons <= 180) & (target_lats <= 90) & (target_lats >= -90))
-
         if mask is not None:
             assert (mask.shape == self.source_geo_def.shape), \
                 "'mask' must be the same shape as the source geo definition"
             mask = mask.data
+
+        margin = self._get_target_chunk_margin(radius_of_influence)
+        if margin is not None:
+            source_lons, source_lats = self.source_geo_def.get_lonlats(chunks=chunks)
+            windows = self._get_source_windows(target_lons.chunks, margin, source_lons, source_lats)
+            return self._get_sliced_neighbor_info(mask, windows, source_lons, source_lats, target_lons, target_lats,
+                                                  valid_output_idx, neighbors, radius_of_influence, epsilon)
+
+        # Create kd-tree
+        valid_input_idx, resample_kdtree = self._create_resample_kdtree(chunks=chunks)
         index_arr = self._query_resample_kdtree(
             resample_kdtree, target_lons, target_lats, valid_input_idx,
             valid_output_idx, mask,
@@ -228,6 +354,114 @@ class KDTreeNearestXarrayResampler(Resampler):
 
         return valid_input_idx, index_arr
 
+    def _get_target_chunk_margin(self, radius_of_influence):
+        """Get the number of target pixels reaching *radius_of_influence* around a target chunk.
+
+        Returns None when the source geometry can't be sliced per target chunk.
+        Only target areas are sliced per chunk, from swaths, projected areas and
+        lon/lat areas whose x coordinates are the longitudes.
+        """
+        if not isinstance(self.target_geo_def, geometry.AreaDefinition):
+            return None
+        if isinstance(self.source_geo_def, geometry.AreaDefinition):
+            if self.source_geo_def.crs.is_geographic and not _x_is_longitude(self.source_geo_def):
+                return None
+        elif not isinstance(self.source_geo_def, geometry.SwathDefinition) or self.source_geo_def.ndim != 2:
+            return None
+        try:
+            dst_res = self.target_geo_def.geocentric_resolution()
+        except RuntimeError:
+            return None
+        if not np.isfinite(dst_res) or dst_res <= 0:
+            return None
+        return int(np.ceil(radius_of_influence / dst_res)) + 1
+
+    def _get_source_windows(self, target_chunks, margin, source_lons, source_lats):
+        """Get the source window each target chunk, padded by *margin* pixels, can reach.
+
+        Windows are (row start, row stop, column start, column stop) tuples,
+        or None for target chunks not overlapping the source. A padded target
+        chunk containing a pole or crossing the antimeridian gets the whole
+        source as window, as a sliced window can't be trusted to hold all the
+        source pixels it reaches.
+        """
+        from pyresample.geometry import IncompatibleAreas, InvalidArea
+        from pyresample.slicer import _enumerate_chunk_slices
+
+        source_geo_def = self.source_geo_def
+        if isinstance(source_geo_def, geometry.SwathDefinition):
+            source_geo_def = geometry.SwathDefinition(DataArray(source_lons, dims=('y', 'x')),
+                                                      DataArray(source_lats, dims=('y', 'x')))
+        source_height, source_width = source_geo_def.shape
+        full_window = (0, source_height, 0, source_width)
+        windows = {}
+        for position, (row_slice, col_slice) in _enumerate_chunk_slices(target_chunks):
+            chunk_area = _pad_area(self.target_geo_def[row_slice, col_slice], margin)
+            if _area_wraps_around(chunk_area):
+                windows[position] = full_window
+                continue
+            try:
+                x_slice, y_slice = _get_source_slices(source_geo_def, chunk_area)
+            except IncompatibleAreas:
+                windows[position] = None
+                continue
+            except InvalidArea:
+                windows[position] = full_window
+                continue
+            windows[position] = (y_slice.start, min(y_slice.stop, source_height),
+                                 x_slice.start, min(x_slice.stop, source_width))
+        return windows
+
+    def _get_sliced_neighbor_info(self, mask, windows, source_lons, source_lats, target_lons, target_lats,
+                                  valid_output_idx, neighbors, radius_of_influence, epsilon):
+        """Query every target chunk against a kd tree of the source pixels it can reach.
+
+        Target chunks sharing a source window share its kd tree, and target
+        chunks not overlapping the source are filled without looking at the
+        source. The valid input index and the indexes of the neighbours are
+        the same as with a single kd tree over the whole source.
+        """
+        valid_input_idx = ((source_lons >= -180) & (source_lons <= 180) & (source_lats <= 90) & (source_lats >= -90))
+        input_ranks = _get_valid_input_ranks(valid_input_idx)
+
+        token = tokenize(source_lons, source_lats, target_lons, target_lats, mask,
+                         neighbors, radius_of_influence, epsilon, windows)
+        name = 'query-sliced-kdtree-' + token
+        kdtree_name = 'sliced-kdtree-' + token
+        query_window = partial(_query_window_kdtree, neighbours=neighbors,
+                               epsilon=epsilon, radius=radius_of_influence)
+        dsk = {}
+        dependencies = [target_lons, target_lats, valid_output_idx]
+        window_mask_keys = {}
+        for position, window in windows.items():
+            chunk_key = (name,) + position + (0,)
+            if window is None:
+                chunk_shape = (target_lons.chunks[0][position[0]], target_lons.chunks[1][position[1]], neighbors)
+                dsk[chunk_key] = (np.full, chunk_shape, -1)
+                continue
+            if window not in window_mask_keys:
+                window_slices = (slice(*window[:2]), slice(*window[2:]))
+                window_lons = source_lons[window_slices].rechunk(-1)
+                window_lats = source_lats[window_slices].rechunk(-1)
+                window_ranks = input_ranks[window_slices].rechunk(-1)
+                dsk[(kdtree_name,) + window] = (_create_window_kdtree,
+                                                (window_lons.name, 0, 0), (window_lats.name, 0, 0),
+                                                (window_ranks.name, 0, 0))
+                dependencies.extend([window_lons, window_lats, window_ranks])
+                window_mask_keys[window] = None
+                if mask is not None:
+                    window_mask = mask[window_slices].rechunk(-1)
+                    window_mask_keys[window] = (window_mask.name, 0, 0)
+                    dependencies.append(window_mask)
+            dsk[chunk_key] = (query_window,
+                              (target_lons.name,) + position, (target_lats.name,) + position,
+                              (valid_output_idx.name,) + position,
+                              (kdtree_name,) + window, window_mask_keys[window])
+        graph = HighLevelGraph.from_collections(name, dsk, dependencies=dependencies)
+        # res.shape = rows, cols, neighbors
+        index_arr = da.Array(graph, name, chunks=valid_output_idx.chunks + ((neighbors,),), dtype=int)
+        return valid_input_idx, index_arr
+
     def get_sample_from_neighbor_info(
             self,
             data,
@@ -33,6 +33,7 @@ from pyproj import Geod, Proj, transform
 from pyproj.aoi import AreaOfUse
 
 from pyresample import CHUNK_SIZE
+from pyresample._hashing import get_numpy_array_hashable
 from pyresample._spatial_mp import Cartesian, Cartesian_MP, Proj_MP
 from pyresample.area_config import create_area_def
 from pyresample.boundary import AreaDefBoundary, Boundary, SimpleBoundary
@@ -81,8 +82,17 @@ class BaseDefinition:
         arrays are expected to be between -180 and 180 degrees, latitude -90
         to 90 degrees. Use :func:`~pyresample.utils.check_and_wrap` to preprocess
         your arrays.
+
+    The ``hash_method`` attribute sets how numpy-backed coordinates are
+    hashed: ``"sha1"`` (default), ``"fast"``, ``"fingerprint"`` or a
+    callable returning bytes. See :mod:`pyresample._hashing` for details.
+    It can be changed on the class or on an instance before it is hashed.
+    The ``"fast"`` and ``"fingerprint"`` digests are memoized on the arrays,
+    so they are only suited to coordinates that are not modified in place.
     """
 
+    hash_method = 'sha1'
+
     def __init__(self, lons=None, lats=None, nprocs=1):
         """Initialize BaseDefinition."""
         if type(lons) != type(lats):
@@ -120,11 +130,11 @@ class BaseDefinition:
         """Update the hash."""
         if existing_hash is None:
             existing_hash = hashlib.sha1()
-        existing_hash.update(get_array_hashable(self.lons))
-        existing_hash.update(get_array_hashable(self.lats))
+        existing_hash.update(get_array_hashable(self.lons, self.hash_method))
+        existing_hash.update(get_array_hashable(self.lats, self.hash_method))
         try:
             if self.lons.mask is not False:
-                existing_hash.update(get_array_hashable(self.lons.mask))
+                existing_hash.update(get_array_hashable(self.lons.mask, self.hash_method))
         except AttributeError:
             pass
         return existing_hash
@@ -733,19 +743,22 @@ class GridDefinition(CoordinateDefinition):
             raise ValueError('2 dimensional lon lat grid expected')
 
 
-def get_array_hashable(arr):
+def get_array_hashable(arr, method='sha1'):
     """Compute a hashable form of the array `arr`.
 
     Works with numpy arrays, dask.array.Array, and xarray.DataArray.
+    Numpy arrays are reduced with `method`, see :mod:`pyresample._hashing`.
     """
     # look for precomputed value
     if isinstance(arr, DataArray) and np.ndarray is not DataArray:
-        return arr.attrs.get('hash', get_array_hashable(arr.data))
+        if 'hash' in arr.attrs:
+            return arr.attrs['hash']
+        return get_array_hashable(arr.data, method)
     else:
         try:
             return arr.name.encode('utf-8')  # dask array
         except AttributeError:
-            return np.ascontiguousarray(arr).view(np.uint8)  # np array
+            return get_numpy_array_hashable(arr, method)  # np array
 
 
 class SwathDefinition(CoordinateDefinition):
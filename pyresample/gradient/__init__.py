@@ -25,7 +25,9 @@
 from __future__ import annotations
 
 import logging
+import threading
 import warnings
+from collections import OrderedDict
 from functools import wraps
 
 import dask
@@ -33,6 +35,7 @@ import dask.array as da
 import numpy as np
 import pyproj
 import xarray as xr
+from shapely import STRtree
 from shapely.geometry import Polygon
 
 from pyresample import CHUNK_SIZE
@@ -42,6 +45,7 @@ from pyresample.geometry import (
     get_geostationary_bounding_box_in_lonlats,
 )
 from pyresample.gradient._gradient_search import (
+    fill_value_fits,
     one_step_gradient_indices,
     one_step_gradient_search,
 )
@@ -162,52 +166,39 @@ class StackingGradientSearchResampler(BaseResampler):
 
     def get_chunk_mappings(self):
         """Map source and target chunks together if they overlap."""
-        src_y_chunks, src_x_chunks = self.src_x.chunks
-        dst_y_chunks, dst_x_chunks = self.dst_x.chunks
-
-        coverage_status = []
-        src_slices, dst_slices = [], []
-        dst_mosaic_locations = []
-
-        src_x_start = 0
-        for src_x_step in src_x_chunks:
-            src_x_end = src_x_start + src_x_step
-            src_y_start = 0
-            for src_y_step in src_y_chunks:
-                src_y_end = src_y_start + src_y_step
-                # Get source chunk polygon
-                src_poly = self._get_src_poly(src_y_start, src_y_end,
-                                              src_x_start, src_x_end)
-
-                dst_x_start = 0
-                for x_step_number, dst_x_step in enumerate(dst_x_chunks):
-                    dst_x_end = dst_x_start + dst_x_step
-                    dst_y_start = 0
-                    for y_step_number, dst_y_step in enumerate(dst_y_chunks):
-                        dst_y_end = dst_y_start + dst_y_step
-                        # Get destination chunk polygon
-                        dst_poly = self._get_dst_poly((x_step_number, y_step_number),
-                                                      dst_x_start, dst_x_end,
-                                                      dst_y_start, dst_y_end)
-
-                        covers = check_overlap(src_poly, dst_poly)
-
-                        coverage_status.append(covers)
-                        src_slices.append((src_y_start, src_y_end,
-                                           src_x_start, src_x_end))
-                        dst_slices.append((dst_y_start, dst_y_end,
-                                           dst_x_start, dst_x_end))
-                        dst_mosaic_locations.append((x_step_number, y_step_number))
-
-                        dst_y_start = dst_y_end
-                    dst_x_start = dst_x_end
-                src_y_start = src_y_end
-            src_x_start = src_x_end
-
-        self.src_slices = src_slices
-        self.dst_slices = dst_slices
-        self.dst_mosaic_locations = dst_mosaic_locations
-        self.coverage_status = coverage_status
+        src_chunks = self.src_x.chunks
+        dst_chunks = self.dst_x.chunks
+        key = (hash(self.source_geo_def), hash(self.target_geo_def), src_chunks, dst_chunks)
+        try:
+            mappings = _chunk_mappings_cache[key]
+        except KeyError:
+            mappings = self._compute_chunk_mappings(src_chunks, dst_chunks)
+            with _chunk_mappings_lock:
+                _chunk_mappings_cache[key] = mappings
+                while len(_chunk_mappings_cache) > _CHUNK_MAPPINGS_CACHE_SIZE:
+                    _chunk_mappings_cache.popitem(last=False)
+
+        coverage_status, src_slices, dst_slices, dst_mosaic_locations = mappings
+        self.src_slices = list(src_slices)
+        self.dst_slices = list(dst_slices)
+        self.dst_mosaic_locations = list(dst_mosaic_locations)
+        self.coverage_status = list(coverage_status)
+
+    def _compute_chunk_mappings(self, src_chunks, dst_chunks):
+        """Compute the overlap of all the source and target chunk pairs in bulk."""
+        src_bounds = _get_chunk_bounds(*src_chunks)
+        dst_bounds = _get_chunk_bounds(*dst_chunks)
+        src_polys = [self._get_src_poly(*bounds) for bounds, _ in src_bounds]
+        dst_polys = [self._get_dst_poly(location, bounds[2], bounds[3], bounds[0], bounds[1])
+                     for bounds, location in dst_bounds]
+        overlaps = get_overlap_matrix(src_polys, dst_polys)
+
+        num_src, num_dst = overlaps.shape
+        coverage_status = overlaps.ravel().tolist()
+        src_slices = [bounds for bounds, _ in src_bounds for _ in range(num_dst)]
+        dst_slices = [bounds for _ in range(num_src) for bounds, _ in dst_bounds]
+        dst_mosaic_locations = [location for _ in range(num_src) for _, location in dst_bounds]
+        return coverage_status, src_slices, dst_slices, dst_mosaic_locations
 
     def _filter_data(self, data, is_src=True, add_dim=False):
         """Filter unused chunks from the given array."""
@@ -235,21 +226,30 @@ class StackingGradientSearchResampler(BaseResampler):
 
         return data_out
 
-    def _get_gradients(self):
-        """Get gradients in X and Y directions."""
-        self.src_gradient_xl, self.src_gradient_xp = np.gradient(
-            self.src_x, axis=[0, 1])
-        self.src_gradient_yl, self.src_gradient_yp = np.gradient(
-            self.src_y, axis=[0, 1])
+    def _filter_gradients(self):
+        """Get the gradients of the source chunks overlapping the target.
+
+        The gradients are computed lazily for each overlapping source chunk
+        from its coordinates with a one-pixel halo, so the gradients of the
+        full source area are never created.
+        """
+        gradients = {}
+        filtered = []
+        for covers, src_slice in zip(self.coverage_status, self.src_slices):
+            if not covers:
+                filtered.append((None, None, None, None))
+                continue
+            if src_slice not in gradients:
+                gradients[src_slice] = _get_chunk_gradients(self.src_x, self.src_y, *src_slice)
+            filtered.append(gradients[src_slice])
+        return [list(grads) for grads in zip(*filtered)]
 
     def _filter_src_dst(self):
         """Filter source and target chunks."""
+        (self.src_gradient_xl, self.src_gradient_xp,
+         self.src_gradient_yl, self.src_gradient_yp) = self._filter_gradients()
         self.src_x = self._filter_data(self.src_x)
         self.src_y = self._filter_data(self.src_y)
-        self.src_gradient_yl = self._filter_data(self.src_gradient_yl)
-        self.src_gradient_yp = self._filter_data(self.src_gradient_yp)
-        self.src_gradient_xl = self._filter_data(self.src_gradient_xl)
-        self.src_gradient_xp = self._filter_data(self.src_gradient_xp)
         self.dst_x = self._filter_data(self.dst_x, is_src=False)
         self.dst_y = self._filter_data(self.dst_y, is_src=False)
         self._src_dst_filtered = True
@@ -265,8 +265,6 @@ class StackingGradientSearchResampler(BaseResampler):
 
         self._get_projection_coordinates(datachunks)
 
-        if self.src_gradient_xl is None:
-            self._get_gradients()
         if self.coverage_status is None:
             self.get_chunk_mappings()
         if not self._src_dst_filtered:
@@ -297,6 +295,48 @@ class StackingGradientSearchResampler(BaseResampler):
         return res
 
 
+_CHUNK_MAPPINGS_CACHE_SIZE = 128
+_chunk_mappings_cache = OrderedDict()
+_chunk_mappings_lock = threading.Lock()
+
+
+def _get_chunk_bounds(y_chunks, x_chunks):
+    """Get the (y_start, y_end, x_start, x_end) bounds and (x, y) location of the chunks.
+
+    The chunks are ordered with the x location in the outer loop.
+    """
+    y_bounds = np.cumsum((0,) + tuple(y_chunks))
+    x_bounds = np.cumsum((0,) + tuple(x_chunks))
+    return [((int(y_bounds[y_idx]), int(y_bounds[y_idx + 1]),
+              int(x_bounds[x_idx]), int(x_bounds[x_idx + 1])),
+             (x_idx, y_idx))
+            for x_idx in range(len(x_chunks))
+            for y_idx in range(len(y_chunks))]
+
+
+def get_overlap_matrix(src_polys, dst_polys):
+    """Check which source and target polygons overlap.
+
+    The polygons follow the conventions of :func:`check_overlap`: `False`
+    overlaps everything and `None` overlaps nothing. The intersections of
+    the actual polygons are computed in bulk with an STRtree.
+
+    Returns a boolean array of shape (len(src_polys), len(dst_polys)).
+    """
+    overlaps = np.zeros((len(src_polys), len(dst_polys)), dtype=bool)
+    src_valid = np.array([poly is not None and poly is not False for poly in src_polys], dtype=bool)
+    dst_valid = np.array([poly is not None and poly is not False for poly in dst_polys], dtype=bool)
+    if src_valid.any() and dst_valid.any():
+        src_idx = np.flatnonzero(src_valid)
+        dst_idx = np.flatnonzero(dst_valid)
+        tree = STRtree([dst_polys[idx] for idx in dst_idx])
+        src_hits, dst_hits = tree.query([src_polys[idx] for idx in src_idx], predicate='intersects')
+        overlaps[src_idx[src_hits], dst_idx[dst_hits]] = True
+    overlaps[[poly is False for poly in src_polys], :] = True
+    overlaps[:, [poly is False for poly in dst_polys]] = True
+    return overlaps
+
+
 def check_overlap(src_poly, dst_poly):
     """Check if the two polygons overlap."""
     if dst_poly is False or src_poly is False:
@@ -313,7 +353,7 @@ def _gradient_resample_data(src_data, src_x, src_y,
                             src_gradient_xl, src_gradient_xp,
                             src_gradient_yl, src_gradient_yp,
                             dst_x, dst_y,
-                            method='bilinear'):
+                            method='bilinear', num_threads=1, fill_value=None):
     """Resample using gradient search."""
     _check_input_coordinates(dst_x, dst_y,
                              src_gradient_xl, src_gradient_xp,
@@ -326,7 +366,8 @@ def _gradient_resample_data(src_data, src_x, src_y,
                                      src_gradient_xl, src_gradient_xp,
                                      src_gradient_yl, src_gradient_yp,
                                      dst_x, dst_y,
-                                     method=method)
+                                     method=method, num_threads=num_threads,
+                                     fill_value=fill_value)
 
     return image
 
@@ -334,7 +375,7 @@ def _gradient_resample_data(src_data, src_x, src_y,
 def _gradient_resample_indices(src_x, src_y,
                                src_gradient_xl, src_gradient_xp,
                                src_gradient_yl, src_gradient_yp,
-                               dst_x, dst_y):
+                               dst_x, dst_y, num_threads=1):
     """Return indices computed using gradient search."""
     _check_input_coordinates(dst_x, dst_y,
                              src_gradient_xl, src_gradient_xp,
@@ -344,7 +385,7 @@ def _gradient_resample_indices(src_x, src_y,
     indices_xy = one_step_gradient_indices(src_x, src_y,
                                            src_gradient_xl, src_gradient_xp,
                                            src_gradient_yl, src_gradient_yp,
-                                           dst_x, dst_y)
+                                           dst_x, dst_y, num_threads=num_threads)
     return indices_xy
 
 
@@ -408,6 +449,7 @@ def parallel_gradient_search(data, src_x, src_y, dst_x, dst_y,
     num_bands = np.max(bands)
     if np.any(bands != num_bands):
         raise ValueError("All source data chunks have to have the same number of bands")
+    dtype = _get_stacking_dtype([arr.dtype for arr in data if arr is not None])
     chunks = {}
     is_pad = False
     # Collect co-located target chunks
@@ -415,18 +457,18 @@ def parallel_gradient_search(data, src_x, src_y, dst_x, dst_y,
         if arr is None:
             is_pad = True
             res = da.full((num_bands, dst_slices[i][1] - dst_slices[i][0],
-                           dst_slices[i][3] - dst_slices[i][2]), np.nan)
+                           dst_slices[i][3] - dst_slices[i][2]), np.nan).astype(dtype)
         else:
             is_pad = False
             res = dask.delayed(_gradient_resample_data)(
-                arr.astype(np.float64),
+                arr.astype(dtype),
                 src_x[i], src_y[i],
                 src_gradient_xl[i], src_gradient_xp[i],
                 src_gradient_yl[i], src_gradient_yp[i],
                 dst_x[i], dst_y[i],
                 method=method)
             res = da.from_delayed(res, (num_bands, ) + dst_x[i].shape,
-                                  dtype=np.float64)
+                                  dtype=dtype)
         if dst_mosaic_locations[i] in chunks:
             if not is_pad:
                 chunks[dst_mosaic_locations[i]].append(res)
@@ -436,6 +478,45 @@ def parallel_gradient_search(data, src_x, src_y, dst_x, dst_y,
     return _concatenate_chunks(chunks)
 
 
+def _get_stacking_dtype(dtypes):
+    """Get the type to resample the chunks in when stacking them.
+
+    The chunks are mosaicked using NaN as fill value, so only float32 data
+    keeps its type, everything else is resampled as float64.
+    """
+    if dtypes and all(dtype == np.float32 for dtype in dtypes):
+        return np.float32
+    return np.float64
+
+
+def _get_chunk_gradients(src_x, src_y, y_start, y_end, x_start, x_end):
+    """Get lazy gradients of the source coordinates for one chunk.
+
+    The coordinates are sliced with a one-pixel halo, clipped to the array
+    borders, so the result equals the chunk of the full array gradients.
+
+    Returns the gradients of x and y along lines and pixels as
+    (x_l, x_p, y_l, y_p).
+    """
+    halo_y_start, halo_y_end = max(y_start - 1, 0), min(y_end + 1, src_x.shape[0])
+    halo_x_start, halo_x_end = max(x_start - 1, 0), min(x_end + 1, src_x.shape[1])
+    crop = (slice(y_start - halo_y_start, y_end - halo_y_start),
+            slice(x_start - halo_x_start, x_end - halo_x_start))
+    gradients = dask.delayed(_get_block_gradients, nout=4)(
+        src_x[halo_y_start:halo_y_end, halo_x_start:halo_x_end],
+        src_y[halo_y_start:halo_y_end, halo_x_start:halo_x_end],
+        crop)
+    shape = (y_end - y_start, x_end - x_start)
+    return tuple(da.from_delayed(gradient, shape, dtype=src_x.dtype) for gradient in gradients)
+
+
+def _get_block_gradients(src_x, src_y, crop):
+    """Get the gradients of the coordinates in a block and crop the halo away."""
+    x_l, x_p = np.gradient(src_x, axis=[0, 1])
+    y_l, y_p = np.gradient(src_y, axis=[0, 1])
+    return x_l[crop], x_p[crop], y_l[crop], y_p[crop]
+
+
 def _concatenate_chunks(chunks):
     """Concatenate chunks to full output array."""
     # Form the full array
@@ -499,12 +580,18 @@ class ResampleBlocksGradientSearchResampler(BaseResampler):
         logger.debug("/!\\ Instantiating an experimental GradientSearch resampler /!\\")
         self.indices_xy = None
 
-    def precompute(self, **kwargs):
-        """Precompute resampling parameters."""
+    def precompute(self, num_threads=1, **kwargs):
+        """Precompute resampling parameters.
+
+        With *num_threads* larger than 1, the gradient search of each target
+        chunk is split over its rows and run in that many threads. This helps
+        when there are fewer chunks than cores.
+        """
         if self.indices_xy is None:
             self.indices_xy = resample_blocks(gradient_resampler_indices_block,
                                               self.source_geo_def, [], self.target_geo_def,
-                                              chunk_size=(2, CHUNK_SIZE, CHUNK_SIZE), dtype=float)
+                                              chunk_size=(2, CHUNK_SIZE, CHUNK_SIZE), dtype=float,
+                                              num_threads=num_threads)
 
     @ensure_data_array
     def compute(self, data, method="bilinear", cache_id=None, **kwargs):
@@ -550,8 +637,16 @@ def ensure_3d_data(func):
 
 
 @ensure_3d_data
-def gradient_resampler(data, source_area, target_area, method='bilinear'):
-    """Do the gradient search resampling."""
+def gradient_resampler(data, source_area, target_area, method='bilinear', num_threads=1, fill_value=None):
+    """Do the gradient search resampling.
+
+    Float32, float64, uint8 and uint16 data are resampled in their own type,
+    other types as float64. Target pixels without data get *fill_value*,
+    which defaults to NaN for floats and 0 for integers.
+
+    With *num_threads* larger than 1, the search is split over the target
+    rows and run in that many threads.
+    """
     dst_coords, src_gradients, src_coords = _get_coordinates_in_same_projection(source_area, target_area)
     dst_x, dst_y = dst_coords
     src_gradient_xl, src_gradient_xp, src_gradient_yl, src_gradient_yp = src_gradients
@@ -561,7 +656,8 @@ def gradient_resampler(data, source_area, target_area, method='bilinear'):
                                    src_gradient_xl, src_gradient_xp,
                                    src_gradient_yl, src_gradient_yp,
                                    dst_x, dst_y,
-                                   method=method)
+                                   method=method, num_threads=num_threads,
+                                   fill_value=fill_value)
 
 
 def gradient_resampler_indices_block(block_info=None, **kwargs):
@@ -581,7 +677,8 @@ def gradient_resampler_indices(source_area, target_area, block_info=None, **kwar
     indices_xy = _gradient_resample_indices(src_x, src_y,
                                             src_gradient_xl, src_gradient_xp,
                                             src_gradient_yl, src_gradient_yp,
-                                            dst_x, dst_y)
+                                            dst_x, dst_y,
+                                            num_threads=kwargs.get('num_threads', 1))
 
     if block_info:
         y_slice, x_slice = block_info[0]["array-location"][-2:]
@@ -608,11 +705,21 @@ def _get_coordinates_in_same_projection(source_area, target_area):
 
 
 def block_bilinear_interpolator(data, indices_xy, fill_value=np.nan, block_info=None, **kwargs):
-    """Bilinear interpolation implementation for resample_blocks."""
+    """Bilinear interpolation implementation for resample_blocks.
+
+    Float32, uint8 and uint16 data are interpolated with float32 weights.
+    Integer data is rounded back to its own type when *fill_value* can be
+    stored in it. A *fill_value* of None means NaN for float data and 0 for
+    integer data.
+    """
+    fill_value = _get_block_fill_value(fill_value, data.dtype)
     mask, x_indices, y_indices = _get_mask_and_adjusted_indices(indices_xy, block_info)
 
     weight_l, l_start = np.modf(y_indices.clip(0, data.shape[-2] - 1))
     weight_p, p_start = np.modf(x_indices.clip(0, data.shape[-1] - 1))
+    if data.dtype in (np.float32, np.uint8, np.uint16):
+        weight_l = weight_l.astype(np.float32)
+        weight_p = weight_p.astype(np.float32)
 
     l_start = l_start.astype(int)
     p_start = p_start.astype(int)
@@ -624,11 +731,14 @@ def block_bilinear_interpolator(data, indices_xy, fill_value=np.nan, block_info=
            weight_l * (1 - weight_p) * data[..., l_end, p_start] +
            weight_l * weight_p * data[..., l_end, p_end])
     res = np.where(mask, fill_value, res)
+    if np.issubdtype(data.dtype, np.integer) and fill_value_fits(fill_value, data.dtype):
+        res = np.rint(res).astype(data.dtype)
     return res
 
 
 def block_nn_interpolator(data, indices_xy, fill_value=np.nan, block_info=None, **kwargs):
     """Nearest neighbour 'interpolator' for resample_blocks."""
+    fill_value = _get_block_fill_value(fill_value, data.dtype)
     mask, x_indices, y_indices = _get_mask_and_adjusted_indices(indices_xy, block_info)
 
     x_indices = np.clip(np.rint(x_indices), 0, data.shape[-1] - 1).astype(int)
@@ -638,6 +748,13 @@ def block_nn_interpolator(data, indices_xy, fill_value=np.nan, block_info=None,
     return np.where(mask, fill_value, res)
 
 
+def _get_block_fill_value(fill_value, dtype):
+    """Get the fill value to use for *dtype* data, replacing None with NaN or 0 for integers."""
+    if fill_value is None:
+        return 0 if np.issubdtype(dtype, np.integer) else np.nan
+    return fill_value
+
+
 def _get_mask_and_adjusted_indices(indices_xy, block_info):
     """Get a mask for valid data and adjusted x and y indices."""
     x_indices, y_indices = indices_xy
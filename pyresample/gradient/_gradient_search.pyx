@@ -27,13 +27,44 @@ cimport numpy as np
 
 DTYPE = np.double
 ctypedef np.double_t DTYPE_t
+SUPPORTED_DTYPES = (np.float32, np.float64, np.uint8, np.uint16)
 cimport cython
+from cython.parallel cimport prange
 from libc.math cimport fabs, isinf
 
 
+def fill_value_fits(fill_value, dtype):
+    """Check if *fill_value* can be stored unchanged in an array of *dtype*.
+
+    Always true for float types. For integer types, the fill value must be
+    a finite integer within the range of the type.
+    """
+    if not np.issubdtype(dtype, np.integer):
+        return True
+    try:
+        fill_value = float(fill_value)
+    except (TypeError, ValueError):
+        return False
+    info = np.iinfo(dtype)
+    return bool(np.isfinite(fill_value) and fill_value == np.floor(fill_value) and
+                info.min <= fill_value <= info.max)
+
+
+ctypedef fused data_type:
+    np.float32_t
+    DTYPE_t
+    np.uint8_t
+    np.uint16_t
+
+cdef enum:
+    BILINEAR = 0
+    NEAREST = 1
+    INDICES = 2
+
+
 @cython.boundscheck(False)
 @cython.wraparound(False)
-cdef inline void nn(const DTYPE_t[:, :, :] data, int l0, int p0, double dl, double dp, int lmax, int pmax, DTYPE_t[:] res) nogil:
+cdef inline void nn(const data_type[:, :, :] data, int l0, int p0, double dl, double dp, int lmax, int pmax, data_type[:] res) nogil:
     cdef int nnl, nnp
     cdef size_t z_size = res.shape[0]
     cdef size_t i
@@ -53,9 +84,9 @@ cdef inline void nn(const DTYPE_t[:, :, :] data, int l0, int p0, double dl, doub
 
 @cython.boundscheck(False)
 @cython.wraparound(False)
-cdef inline void bil(const DTYPE_t[:, :, :] data, int l0, int p0, double dl, double dp, int lmax, int pmax, DTYPE_t[:] res) nogil:
+cdef inline void bil(const data_type[:, :, :] data, int l0, int p0, double dl, double dp, int lmax, int pmax, data_type[:] res) nogil:
     cdef int l_a, l_b, p_a, p_b
-    cdef double w_l, w_p
+    cdef double w_l, w_p, value
     cdef size_t z_size = res.shape[0]
     cdef size_t i
     if dl < 0:
@@ -75,67 +106,128 @@ cdef inline void bil(const DTYPE_t[:, :, :] data, int l0, int p0, double dl, dou
         p_b = min(p0 + 1, pmax)
         w_p = dp
     for i in range(z_size):
-        res[i] = ((1 - w_l) * (1 - w_p) * data[i, l_a, p_a] +
-                  (1 - w_l) * w_p * data[i, l_a, p_b] +
-                  w_l * (1 - w_p) * data[i, l_b, p_a] +
-                  w_l * w_p * data[i, l_b, p_b])
+        value = ((1 - w_l) * (1 - w_p) * data[i, l_a, p_a] +
+                 (1 - w_l) * w_p * data[i, l_a, p_b] +
+                 w_l * (1 - w_p) * data[i, l_b, p_a] +
+                 w_l * w_p * data[i, l_b, p_b])
+        if data_type is np.float32_t or data_type is DTYPE_t:
+            res[i] = <data_type>value
+        else:
+            # round to the nearest count, the value is never negative
+            res[i] = <data_type>(value + 0.5)
 
 
 @cython.boundscheck(False)
 @cython.wraparound(False)
-cdef inline void indices_xy(const DTYPE_t[:, :, :] data, int l0, int p0, double dl, double dp, int lmax, int pmax, DTYPE_t[:] res) nogil:
-    cdef int nnl, nnp
-    cdef size_t z_size = res.shape[0]
-    cdef size_t i
-    res[1] = dl + l0
-    res[0] = dp + p0
+cdef inline void indices_xy(int l0, int p0, double dl, double dp, data_type[:] res) nogil:
+    res[1] = <data_type>(dl + l0)
+    res[0] = <data_type>(dp + p0)
 
-ctypedef void (*FN)(const DTYPE_t[:, :, :] data, int l0, int p0, double dl, double dp, int lmax, int pmax, DTYPE_t[:] res) nogil
 
-@cython.boundscheck(False)
-@cython.wraparound(False)
-cpdef one_step_gradient_search(const DTYPE_t [:, :, :] data,
-                               DTYPE_t [:, :] src_x,
-                               DTYPE_t [:, :] src_y,
-                               DTYPE_t [:, :] xl,
-                               DTYPE_t [:, :] xp,
-                               DTYPE_t [:, :] yl,
-                               DTYPE_t [:, :] yp,
-                               DTYPE_t [:, :] dst_x,
-                               DTYPE_t [:, :] dst_y,
-                               method='bilinear'):
-    """Gradient search, simple case variant."""
-    cdef FN fun
+def one_step_gradient_search(data,
+                             src_x,
+                             src_y,
+                             xl,
+                             xp,
+                             yl,
+                             yp,
+                             dst_x,
+                             dst_y,
+                             method='bilinear',
+                             int num_threads=1,
+                             fill_value=None):
+    """Gradient search, simple case variant.
+
+    The data is resampled in its own type when it is float32, float64, uint8
+    or uint16, and converted to float64 otherwise. Target pixels without
+    data get *fill_value*, which defaults to NaN for floats and 0 for
+    integers. Integer data is converted to float64 if *fill_value* can't be
+    stored in its type, like NaN.
+
+    With *num_threads* larger than 1, the destination rows are split in
+    bands searched in parallel, each band starting its search from the
+    centre of the input image.
+    """
+    cdef int fun
     if method == 'bilinear':
-        fun = bil
+        fun = BILINEAR
+    else:
+        fun = NEAREST
+
+    data = np.asarray(data)
+    if data.dtype not in SUPPORTED_DTYPES:
+        data = data.astype(DTYPE)
+    if fill_value is None:
+        fill_value = np.nan if np.issubdtype(data.dtype, np.floating) else 0
+    elif not fill_value_fits(fill_value, data.dtype):
+        data = data.astype(DTYPE)
+
+    # output image array --> needs to be (lines, pixels) --> y,x
+    image = np.full([data.shape[0], dst_y.shape[0], dst_x.shape[1]], fill_value, dtype=data.dtype)
+    if data.dtype == np.float32:
+        gradient_search[np.float32_t](data, src_x, src_y, xl, xp, yl, yp, dst_x, dst_y, fun, num_threads, image)
+    elif data.dtype == np.uint8:
+        gradient_search[np.uint8_t](data, src_x, src_y, xl, xp, yl, yp, dst_x, dst_y, fun, num_threads, image)
+    elif data.dtype == np.uint16:
+        gradient_search[np.uint16_t](data, src_x, src_y, xl, xp, yl, yp, dst_x, dst_y, fun, num_threads, image)
     else:
-        fun = nn
+        gradient_search[DTYPE_t](data, src_x, src_y, xl, xp, yl, yp, dst_x, dst_y, fun, num_threads, image)
+    # return the output image
+    return image
+
 
+@cython.cdivision(True)
+cdef int gradient_search(const data_type[:, :, :] data,
+                         const DTYPE_t[:, :] src_x,
+                         const DTYPE_t[:, :] src_y,
+                         const DTYPE_t[:, :] xl,
+                         const DTYPE_t[:, :] xp,
+                         const DTYPE_t[:, :] yl,
+                         const DTYPE_t[:, :] yp,
+                         const DTYPE_t[:, :] dst_x,
+                         const DTYPE_t[:, :] dst_y,
+                         int fun,
+                         int num_threads,
+                         data_type[:, :, :] image_view) except -1:
+    """Run the gradient search over the destination rows, in bands when multi-threaded."""
     # change the output size (x_size, y_size) to match area_def.shape:
     # (lines,pixels)
-    cdef size_t z_size = data.shape[0]
     cdef size_t y_size = dst_y.shape[0]
     cdef size_t x_size = dst_x.shape[1]
+    cdef Py_ssize_t num_bands = get_num_bands(num_threads, y_size)
+    cdef Py_ssize_t band
 
-
-    # output image array --> needs to be (lines, pixels) --> y,x
-    image = np.full([z_size, y_size, x_size], np.nan, dtype=DTYPE)
-    cdef DTYPE_t [:, :, :] image_view = image
-    cdef size_t [:] elements = np.arange(x_size, dtype=np.uintp)
     with nogil:
-        one_step_gradient_search_no_gil(data,
-                                        src_x, src_y,
-                                        xl, xp, yl, yp,
-                                        dst_x, dst_y,
-                                        x_size, y_size,
-                                        fun, image_view,
-                                        elements)
-    # return the output image
-    return image
+        if num_bands == 1:
+            one_step_gradient_search_no_gil(data,
+                                            src_x, src_y,
+                                            xl, xp, yl, yp,
+                                            dst_x, dst_y,
+                                            x_size, 0, y_size,
+                                            fun, image_view)
+        else:
+            for band in prange(num_bands, num_threads=num_threads, schedule='static', chunksize=1):
+                one_step_gradient_search_no_gil(data,
+                                                src_x, src_y,
+                                                xl, xp, yl, yp,
+                                                dst_x, dst_y,
+                                                x_size,
+                                                band * y_size // num_bands,
+                                                (band + 1) * y_size // num_bands,
+                                                fun, image_view)
+    return 0
+
+
+cdef Py_ssize_t get_num_bands(int num_threads, size_t y_size) except -1:
+    """Get the number of destination row bands to search in parallel."""
+    if num_threads < 1:
+        raise ValueError("The number of threads must be at least 1")
+    return max(1, min(<size_t>num_threads, y_size))
+
 
 @cython.boundscheck(False)
 @cython.wraparound(False)
-cdef void one_step_gradient_search_no_gil(const DTYPE_t[:, :, :] data,
+cdef void one_step_gradient_search_no_gil(const data_type[:, :, :] data,
                                           const DTYPE_t[:, :] src_x,
                                           const DTYPE_t[:, :] src_y,
                                           const DTYPE_t[:, :] xl,
@@ -145,10 +237,15 @@ cdef void one_step_gradient_search_no_gil(const DTYPE_t[:, :, :] data,
                                           const DTYPE_t[:, :] dst_x,
                                           const DTYPE_t[:, :] dst_y,
                                           const size_t x_size,
-                                          const size_t y_size,
-                                          FN fun,
-                                          DTYPE_t[:, :, :] result_array,
-                                          size_t[:] elements) nogil:
+                                          const size_t y_start,
+                                          const size_t y_end,
+                                          int fun,
+                                          data_type[:, :, :] result_array) nogil:
+    """Search the destination rows from *y_start* to *y_end*.
+
+    Every other row is walked backwards, so the search always starts next
+    to the last pixel found.
+    """
 
     # pixel max ---> data is expected in [lines, pixels]
     cdef int pmax = src_x.shape[1] - 1
@@ -165,10 +262,12 @@ cdef void one_step_gradient_search_no_gil(const DTYPE_t[:, :, :] data,
     cdef double dx, dy, d, dl, dp
     # number of iterations
     cdef int cnt = 0
-    for i in range(y_size):
-        elements = elements[::-1]
+    for i in range(y_start, y_end):
         for elt in range(x_size):
-            j = elements[elt]
+            if i % 2 == 0:
+                j = x_size - 1 - elt
+            else:
+                j = elt
             if isinf(dst_x[i, j]):
                 continue
             cnt = 0
@@ -203,7 +302,12 @@ cdef void one_step_gradient_search_no_gil(const DTYPE_t[:, :, :] data,
                     last_p0 = p0
                     last_l0 = l0
                     if 0 <= dl + l0 <= lmax and 0 <= dp + p0 <= pmax:
-                        fun(data, l0, p0, dl, dp, lmax, pmax, result_array[:, i, j])
+                        if fun == BILINEAR:
+                            bil(data, l0, p0, dl, dp, lmax, pmax, result_array[:, i, j])
+                        elif fun == NEAREST:
+                            nn(data, l0, p0, dl, dp, lmax, pmax, result_array[:, i, j])
+                        else:
+                            indices_xy(l0, p0, dl, dp, result_array[:, i, j])
                     # found our solution, next
                     break
                 else:
@@ -221,31 +325,19 @@ cpdef one_step_gradient_indices(DTYPE_t [:, :] src_x,
                                 DTYPE_t [:, :] yl,
                                 DTYPE_t [:, :] yp,
                                 DTYPE_t [:, :] dst_x,
-                                DTYPE_t [:, :] dst_y):
+                                DTYPE_t [:, :] dst_y,
+                                int num_threads=1):
     """Gradient search, simple case variant, returning float indices.
     
     This is appropriate for monotonous gradients only, i.e. not modis or viirs in satellite projection.
+    See :func:`one_step_gradient_search` for *num_threads*.
     """
-
-    # change the output size (x_size, y_size) to match area_def.shape:
-    # (lines,pixels)
-    cdef size_t y_size = dst_y.shape[0]
-    cdef size_t x_size = dst_x.shape[1]
-
     # output indices arrays --> needs to be (lines, pixels) --> y,x
-    indices = np.full([2, y_size, x_size], np.nan, dtype=DTYPE)
-    cdef DTYPE_t [:, :, :] indices_view = indices
-    cdef size_t [:] elements = np.arange(x_size, dtype=np.uintp)
+    indices = np.full([2, dst_y.shape[0], dst_x.shape[1]], np.nan, dtype=DTYPE)
 
     # fake_data is not going to be used anyway as we just fill in the indices
-    cdef DTYPE_t [:, :, :] fake_data = np.full([1, 1, 1], np.nan, dtype=DTYPE)
+    fake_data = np.full([1, 1, 1], np.nan, dtype=DTYPE)
 
-    with nogil:
-        one_step_gradient_search_no_gil(fake_data,
-                                        src_x, src_y,
-                                        xl, xp, yl, yp,
-                                        dst_x, dst_y,
-                                        x_size, y_size,
-                                        indices_xy, indices_view,
-                                        elements)
+    gradient_search[DTYPE_t](fake_data, src_x, src_y, xl, xp, yl, yp, dst_x, dst_y,
+                             INDICES, num_threads, indices)
     return indices
@@ -21,10 +21,15 @@ Several types of resampling are supported.
 
 from __future__ import absolute_import
 
+import os
+import shutil
 import sys
+import tempfile
 import types
 import warnings
 from copy import deepcopy
+from functools import partial
+from itertools import product
 from logging import getLogger
 
 import numpy as np
@@ -33,7 +38,8 @@ from pykdtree.kdtree import KDTree
 from pyresample import CHUNK_SIZE, _spatial_mp, data_reduce, geometry
 
 from .future.resamplers._transform_utils import lonlat2xyz
-from .future.resamplers.nearest import _my_index, query_no_distance
+from .future.resamplers.nearest import _get_bounding_sphere, _KDTreePartition, _my_index
+from .future.resamplers.resampler import hash_resampler_geometries
 from .utils.row_appendable_array import RowAppendableArray
 
 logger = getLogger(__name__)
@@ -41,6 +47,9 @@ logger = getLogger(__name__)
 try:
     import dask
     import dask.array as da
+    from dask.base import tokenize
+    from dask.core import flatten
+    from dask.highlevelgraph import HighLevelGraph
     from xarray import DataArray
     if hasattr(dask, 'blockwise'):
         blockwise = da.blockwise
@@ -59,6 +68,100 @@ class EmptyResult(ValueError):
     """No valid data is produced."""
 
 
+NEIGHBOUR_INFO_NAMES = ('valid_input_index', 'valid_output_index',
+                        'index_array', 'distance_array')
+
+
+class NeighbourInfoCache(object):
+    """On-disk cache for the results of :func:`get_neighbour_info`.
+
+    Every entry is a directory named after the hash of the source and target
+    geometries and the query parameters, holding one ``.npy`` file per
+    neighbour info array. Entries are reloaded memory-mapped so that only
+    the parts actually used are read from disk. When ``max_entries`` is
+    given, the least recently used entries are removed once the cache
+    grows beyond that size.
+
+    Parameters
+    ----------
+    cache_dir : str
+        Directory to store the cache entries in. Created if needed.
+    max_entries : int or None, optional
+        Maximum number of entries to keep. None means no limit.
+    mmap_mode : {None, 'r', 'r+', 'c'}, optional
+        Memory-map mode passed to :func:`numpy.load` when reading entries.
+    """
+
+    def __init__(self, cache_dir, max_entries=None, mmap_mode='r'):
+        if max_entries is not None and max_entries < 1:
+            raise ValueError('max_entries must be a positive integer or None')
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.mmap_mode = mmap_mode
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def get_key(source_geo_def, target_geo_def, radius_of_influence,
+                neighbours, epsilon, reduce_data):
+        """Get the cache key for the provided geometries and query parameters."""
+        return hash_resampler_geometries(source_geo_def, target_geo_def,
+                                         radius_of_influence=float(radius_of_influence),
+                                         neighbours=int(neighbours),
+                                         epsilon=float(epsilon),
+                                         reduce_data=bool(reduce_data))
+
+    def _entry_dir(self, key):
+        return os.path.join(self.cache_dir, 'nn_info_' + key)
+
+    def load(self, key):
+        """Load the neighbour info stored under *key*, or None if missing."""
+        entry_dir = self._entry_dir(key)
+        try:
+            neighbour_info = tuple(
+                np.load(os.path.join(entry_dir, name + '.npy'), mmap_mode=self.mmap_mode)
+                for name in NEIGHBOUR_INFO_NAMES)
+        except (OSError, ValueError):
+            return None
+        # mark the entry as recently used
+        os.utime(entry_dir)
+        logger.debug("Loaded neighbour info from cache: %s", entry_dir)
+        return neighbour_info
+
+    def store(self, key, neighbour_info):
+        """Store the *neighbour_info* arrays under *key*."""
+        entry_dir = self._entry_dir(key)
+        tmp_dir = tempfile.mkdtemp(dir=self.cache_dir, prefix='.tmp_')
+        try:
+            for name, arr in zip(NEIGHBOUR_INFO_NAMES, neighbour_info):
+                np.save(os.path.join(tmp_dir, name + '.npy'), np.asarray(arr))
+            os.rename(tmp_dir, entry_dir)
+        except OSError:
+            # another process may have stored the same entry in the meantime
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            if not os.path.isdir(entry_dir):
+                raise
+        logger.debug("Stored neighbour info in cache: %s", entry_dir)
+        self._evict()
+
+    def _evict(self):
+        """Remove the least recently used entries beyond ``max_entries``."""
+        if self.max_entries is None:
+            return
+        entries = [entry for entry in os.scandir(self.cache_dir)
+                   if entry.is_dir() and entry.name.startswith('nn_info_')]
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in entries[:len(entries) - self.max_entries]:
+            shutil.rmtree(entry.path, ignore_errors=True)
+
+    def clear(self):
+        """Remove all entries from the cache."""
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_dir() and entry.name.startswith('nn_info_'):
+                shutil.rmtree(entry.path, ignore_errors=True)
+
+
 def resample_nearest(source_geo_def,
                      data,
                      target_geo_def,
@@ -67,7 +170,8 @@ def resample_nearest(source_geo_def,
                      fill_value=0,
                      reduce_data=True,
                      nprocs=1,
-                     segments=None):
+                     segments=None,
+                     cache=None):
     """Resamples data using kd-tree nearest neighbour approach.
 
     Parameters
@@ -96,6 +200,8 @@ def resample_nearest(source_geo_def,
     segments : int or None
         Number of segments to use when resampling.
         If set to None an estimate will be calculated
+    cache : NeighbourInfoCache or None, optional
+        Cache used to store and reuse the neighbour info
 
     Returns
     -------
@@ -105,13 +211,14 @@ def resample_nearest(source_geo_def,
     return _resample(source_geo_def, data, target_geo_def, 'nn',
                      radius_of_influence, neighbours=1,
                      epsilon=epsilon, fill_value=fill_value,
-                     reduce_data=reduce_data, nprocs=nprocs, segments=segments)
+                     reduce_data=reduce_data, nprocs=nprocs, segments=segments,
+                     cache=cache)
 
 
 def resample_gauss(source_geo_def, data, target_geo_def,
                    radius_of_influence, sigmas, neighbours=8, epsilon=0,
                    fill_value=0, reduce_data=True, nprocs=1, segments=None,
-                   with_uncert=False):
+                   with_uncert=False, cache=None):
     """Resamples data using kd-tree gaussian weighting neighbour approach.
 
     Parameters
@@ -148,6 +255,8 @@ def resample_gauss(source_geo_def, data, target_geo_def,
         If set to None an estimate will be calculated
     with_uncert : bool, optional
         Calculate uncertainty estimates
+    cache : NeighbourInfoCache or None, optional
+        Cache used to store and reuse the neighbour info
 
     Returns
     -------
@@ -184,13 +293,14 @@ def resample_gauss(source_geo_def, data, target_geo_def,
     return _resample(source_geo_def, data, target_geo_def, 'custom',
                      radius_of_influence, neighbours=neighbours,
                      epsilon=epsilon, weight_funcs=weight_funcs, fill_value=fill_value,
-                     reduce_data=reduce_data, nprocs=nprocs, segments=segments, with_uncert=with_uncert)
+                     reduce_data=reduce_data, nprocs=nprocs, segments=segments, with_uncert=with_uncert,
+                     cache=cache)
 
 
 def resample_custom(source_geo_def, data, target_geo_def,
                     radius_of_influence, weight_funcs, neighbours=8,
                     epsilon=0, fill_value=0, reduce_data=True, nprocs=1,
-                    segments=None, with_uncert=False):
+                    segments=None, with_uncert=False, cache=None):
     """Resamples data using kd-tree custom radial weighting neighbour approach.
 
     Parameters
@@ -226,6 +336,8 @@ def resample_custom(source_geo_def, data, target_geo_def,
     segments : {int, None}
         Number of segments to use when resampling.
         If set to None an estimate will be calculated
+    cache : NeighbourInfoCache or None, optional
+        Cache used to store and reuse the neighbour info
 
     Returns
     -------
@@ -248,12 +360,14 @@ def resample_custom(source_geo_def, data, target_geo_def,
                      radius_of_influence, neighbours=neighbours,
                      epsilon=epsilon, weight_funcs=weight_funcs,
                      fill_value=fill_value, reduce_data=reduce_data,
-                     nprocs=nprocs, segments=segments, with_uncert=with_uncert)
+                     nprocs=nprocs, segments=segments, with_uncert=with_uncert,
+                     cache=cache)
 
 
 def _resample(source_geo_def, data, target_geo_def, resample_type,
               radius_of_influence, neighbours=8, epsilon=0, weight_funcs=None,
-              fill_value=0, reduce_data=True, nprocs=1, segments=None, with_uncert=False):
+              fill_value=0, reduce_data=True, nprocs=1, segments=None, with_uncert=False,
+              cache=None):
     """Resamples swath using kd-tree approach."""
     valid_input_index, valid_output_index, index_array, distance_array = \
         get_neighbour_info(source_geo_def,
@@ -263,7 +377,8 @@ def _resample(source_geo_def, data, target_geo_def, resample_type,
                            epsilon=epsilon,
                            reduce_data=reduce_data,
                            nprocs=nprocs,
-                           segments=segments)
+                           segments=segments,
+                           cache=cache)
 
     return get_sample_from_neighbour_info(resample_type,
                                           target_geo_def.shape,
@@ -278,7 +393,7 @@ def _resample(source_geo_def, data, target_geo_def, resample_type,
 
 def get_neighbour_info(source_geo_def, target_geo_def, radius_of_influence,
                        neighbours=8, epsilon=0, reduce_data=True,
-                       nprocs=1, segments=None):
+                       nprocs=1, segments=None, cache=None):
     """Return neighbour info.
 
     Parameters
@@ -302,12 +417,32 @@ def get_neighbour_info(source_geo_def, target_geo_def, radius_of_influence,
     segments : int or None
         Number of segments to use when resampling.
         If set to None an estimate will be calculated
+    cache : NeighbourInfoCache or None, optional
+        Cache used to store and reuse the neighbour info. When the same
+        geometries and query parameters were used before, the stored arrays
+        are returned without building and querying the kd-tree.
     Returns
     -------
     (valid_input_index, valid_output_index,
     index_array, distance_array) : tuple of numpy arrays
         Neighbour resampling info
     """
+    if cache is not None:
+        cache_key = cache.get_key(source_geo_def, target_geo_def,
+                                  radius_of_influence, neighbours,
+                                  epsilon, reduce_data)
+        neighbour_info = cache.load(cache_key)
+        if neighbour_info is None:
+            neighbour_info = get_neighbour_info(source_geo_def, target_geo_def,
+                                                radius_of_influence,
+                                                neighbours=neighbours,
+                                                epsilon=epsilon,
+                                                reduce_data=reduce_data,
+                                                nprocs=nprocs,
+                                                segments=segments)
+            cache.store(cache_key, neighbour_info)
+        return neighbour_info
+
     if source_geo_def.size < neighbours:
         warnings.warn('Searching for %s neighbours in %s data points' %
                       (neighbours, source_geo_def.size), stacklevel=2)
@@ -671,21 +806,24 @@ def get_sample_from_neighbour_info(resample_type, output_shape, data,
 
     # Handle masked array input
     is_masked_data = False
+    use_weights = resample_type != 'nn' and neighbours > 1
+    data_mask = None
     if np.ma.is_masked(new_data):
-        # Add the mask as channels to the dataset
         is_masked_data = True
-        new_data = np.column_stack((new_data.data, new_data.mask))
+        if use_weights:
+            # The mask is resampled alongside the data with the same weights
+            data_mask = np.ma.getmaskarray(new_data)
+            new_data = new_data.data
+        else:
+            # Add the mask as channels to the dataset
+            new_data = np.column_stack((new_data.data, new_data.mask))
 
-    if new_data.ndim > 1:  # Multiple channels or masked input
+    num_channels = new_data.shape[1] if new_data.ndim > 1 else 1
+    if data_mask is not None:
+        num_channels *= 2
+    if new_data.ndim > 1 or data_mask is not None:  # Multiple channels or masked input
         output_shape = list(output_shape)
-        output_shape.append(new_data.shape[1])
-
-    # Prepare weight_funcs argument for handeling mask data
-    if weight_funcs is not None and is_masked_data:
-        if is_multi_channel:
-            weight_funcs = weight_funcs * 2
-        else:
-            weight_funcs = (weight_funcs,) * 2
+        output_shape.append(num_channels)
 
     # Handle request for masking intead of using fill values
     use_masked_fill_value = False
@@ -694,124 +832,24 @@ def get_sample_from_neighbour_info(resample_type, output_shape, data,
         fill_value = _get_fill_mask_value(new_data.dtype)
 
     # Resample based on kd-tree query result
-    if resample_type == 'nn' or neighbours == 1:
+    if not use_weights:
         # Get nearest neighbour using array indexing
         index_mask = (index_array == input_size)
         new_index_array = np.where(index_mask, 0, index_array)
         result = new_data[new_index_array].copy()
         result[index_mask] = fill_value
     else:
-        # Calculate result using weighting.
-        # Note: the code below has low readability in order
-        #       to avoid looping over numpy arrays
-
-        # Get neighbours and masks of valid indices
-        ch_neighbour_list = []
-        index_mask_list = []
-        for i in range(neighbours):  # Iterate over number of neighbours
-            # Make working copy neighbour index and
-            # set out of bounds indices to zero
-            index_ni = index_array[:, i].copy()
-            index_mask_ni = (index_ni == input_size)
-            index_ni[index_mask_ni] = 0
-
-            # Get channel data for the corresponing indices
-            ch_ni = new_data[index_ni]
-            ch_neighbour_list.append(ch_ni)
-            index_mask_list.append(index_mask_ni)
-
-        # Calculate weights
-        weight_list = []
-        for i in range(neighbours):  # Iterate over number of neighbours
-            # Make working copy of neighbour distances and
-            # set out of bounds distance to 1 in order to avoid numerical Inf
-            distance = distance_array[:, i].copy()
-            distance[index_mask_list[i]] = 1
-
-            if new_data.ndim > 1:  # More than one channel in data set.
-                # Calculate weights for each channel
-                weights = []
-                num_weights = valid_output_index.sum()
-                num_channels = new_data.shape[1]
-                for j in range(num_channels):
-                    calc_weight = weight_funcs[j](distance)
-                    # Turn a scalar weight into a numpy array
-                    # (no effect if calc_weight already is an array)
-                    expanded_calc_weight = np.ones(num_weights) * calc_weight
-                    weights.append(expanded_calc_weight)
-
-                # Collect weights for all channels for neighbour number
-                weight_list.append(np.column_stack(weights))
-            else:  # Only one channel
-                weights = weight_funcs(distance)
-                weight_list.append(weights)
-
-        result = 0
-        norm = 0
-        count = 0
-        norm_sqr = 0
-        stddev = 0
-
-        # Calculate result
-        for i in range(neighbours):  # Iterate over number of neighbours
-            # Find invalid indices to be masked of from calculation
-            if new_data.ndim > 1:  # More than one channel in data set.
-                inv_index_mask = np.expand_dims(
-                    np.invert(index_mask_list[i]), axis=1)
-            else:  # Only one channel
-                inv_index_mask = np.invert(index_mask_list[i])
-
-            # Aggregate result and norm
-            weights_tmp = inv_index_mask * weight_list[i]
-            result += weights_tmp * ch_neighbour_list[i]
-            norm += weights_tmp
-
-        # Normalize result and set fillvalue
-        result_valid_index = (norm > 0)
-        result[result_valid_index] /= norm[result_valid_index]
-
-        if with_uncert:  # Calculate uncertainties
-            # 2. pass to calculate standard deviation
-            for i in range(neighbours):  # Iterate over number of neighbours
-                # Find invalid indices to be masked of from calculation
-                if new_data.ndim > 1:  # More than one channel in data set.
-                    inv_index_mask = np.expand_dims(
-                        np.invert(index_mask_list[i]), axis=1)
-                else:  # Only one channel
-                    inv_index_mask = np.invert(index_mask_list[i])
-
-                # Aggregate stddev information
-                weights_tmp = inv_index_mask * weight_list[i]
-                count += inv_index_mask
-                norm_sqr += weights_tmp ** 2
-                values = inv_index_mask * ch_neighbour_list[i]
-                stddev += weights_tmp * (values - result) ** 2
-
-            # Calculate final stddev
-            new_valid_index = (count > 1)
-            if stddev.ndim >= 2:
-                # If given more than 1 input data array
-                new_valid_index = new_valid_index[:, 0]
-                for i in range(stddev.shape[-1]):
-                    v1 = norm[new_valid_index, i]
-                    v2 = norm_sqr[new_valid_index, i]
-                    stddev[new_valid_index, i] = np.sqrt(
-                        (v1 / (v1 ** 2 - v2)) * stddev[new_valid_index, i])
-                    stddev[~new_valid_index, i] = np.NaN
-            else:
-                # If given single input data array
-                v1 = norm[new_valid_index]
-                v2 = norm_sqr[new_valid_index]
-                stddev[new_valid_index] = np.sqrt(
-                    (v1 / (v1 ** 2 - v2)) * stddev[new_valid_index])
-                stddev[~new_valid_index] = np.NaN
+        result, result_valid_index, stddev, count = \
+            _get_weighted_sample(new_data, data_mask, index_array,
+                                 distance_array, input_size, weight_funcs,
+                                 with_uncert)
 
         # Add fill values
         result[np.invert(result_valid_index)] = fill_value
 
     # Create full result
-    if new_data.ndim > 1:  # More than one channel
-        output_raw_shape = ((output_size, new_data.shape[1]))
+    if new_data.ndim > 1 or data_mask is not None:  # More than one channel
+        output_raw_shape = ((output_size, num_channels))
     else:  # One channel
         output_raw_shape = output_size
 
@@ -861,6 +899,111 @@ def get_sample_from_neighbour_info(resample_type, output_shape, data,
         return result
 
 
+def _get_weighted_sample(new_data, data_mask, index_array, distance_array,
+                         input_size, weight_funcs, with_uncert=False):
+    """Calculate the weighted average of the neighbours for all channels at once.
+
+    The neighbour values are gathered in one go and the weights are evaluated
+    once for every distinct weight function, then applied to all channels
+    sharing it in a single reduction over the neighbours. A mask, if given,
+    is resampled with the same weights as the corresponding data channels and
+    appended to the result as extra channels.
+
+    Returns
+    -------
+    result, result_valid_index, stddev, count : numpy arrays
+        Weighted average, where the norm of the weights is positive, and the
+        uncertainty estimates (None if *with_uncert* is False)
+    """
+    is_multi_channel = new_data.ndim > 1
+    index_mask = (index_array == input_size)
+    valid_neighbour = np.invert(index_mask)
+    index_array = np.where(index_mask, 0, index_array)
+    # Set out of bounds distance to 1 in order to avoid numerical Inf
+    distance = np.where(index_mask, 1, distance_array)
+
+    # Gather neighbour values, shape (output pixels, neighbours, channels)
+    values = new_data[index_array]
+    values[index_mask] = 0
+    if not is_multi_channel:
+        values = values[..., np.newaxis]
+    num_channels = values.shape[-1]
+    if data_mask is not None:
+        mask_values = data_mask[index_array]
+        mask_values[index_mask] = False
+        if not is_multi_channel:
+            mask_values = mask_values[..., np.newaxis]
+
+    # Group channels by weight function so each one is evaluated only once
+    if callable(weight_funcs):
+        weight_funcs = [weight_funcs] * num_channels
+    elif len(weight_funcs) != num_channels:
+        raise ValueError('Got %d weight functions for %d channels' % (len(weight_funcs), num_channels))
+    channel_groups = {}
+    for channel, weight_func in enumerate(weight_funcs):
+        channel_groups.setdefault(weight_func, []).append(channel)
+
+    result = np.zeros((values.shape[0], num_channels), dtype=np.result_type(values, np.float64))
+    norm = np.zeros((values.shape[0], num_channels), dtype=np.float64)
+    if data_mask is not None:
+        mask_result = np.zeros_like(norm)
+    stddev = None
+    if with_uncert:
+        norm_sqr = np.zeros_like(norm)
+        stddev = np.zeros_like(result)
+    group_weights = []
+    for weight_func, channels in channel_groups.items():
+        # Turn a scalar weight into a numpy array
+        weights = np.broadcast_to(weight_func(distance), distance.shape)
+        weights = np.where(valid_neighbour, weights, 0)
+        if len(channels) == num_channels:
+            channels = slice(None)
+        group_values = values[:, :, channels]
+        result[:, channels] = np.einsum('nk,nkc->nc', weights, group_values)
+        norm[:, channels] = weights.sum(axis=1)[:, np.newaxis]
+        if data_mask is not None:
+            mask_result[:, channels] = np.einsum('nk,nkc->nc', weights, mask_values[:, :, channels])
+        if with_uncert:
+            norm_sqr[:, channels] = (weights ** 2).sum(axis=1)[:, np.newaxis]
+            group_weights.append((weights, channels))
+
+    # Normalize result
+    result_valid_index = (norm > 0)
+    result[result_valid_index] /= norm[result_valid_index]
+
+    count = None
+    if with_uncert:  # Calculate uncertainties
+        # 2. pass to calculate standard deviation
+        for weights, channels in group_weights:
+            deviation = (values[:, :, channels] - result[:, np.newaxis, channels]) ** 2
+            stddev[:, channels] = np.einsum('nk,nkc->nc', weights, deviation)
+        count = np.broadcast_to(valid_neighbour.sum(axis=1)[:, np.newaxis], result.shape)
+
+        # Calculate final stddev
+        new_valid_index = (count[:, 0] > 1)
+        v1 = norm[new_valid_index]
+        v2 = norm_sqr[new_valid_index]
+        stddev[new_valid_index] = np.sqrt((v1 / (v1 ** 2 - v2)) * stddev[new_valid_index])
+        stddev[~new_valid_index] = np.NaN
+
+    if data_mask is not None:
+        mask_result[result_valid_index] /= norm[result_valid_index]
+        result = np.concatenate((result, mask_result.astype(result.dtype)), axis=1)
+        result_valid_index = np.concatenate((result_valid_index, result_valid_index), axis=1)
+        if with_uncert:
+            # Uncertainties of the mask are discarded later on
+            stddev = np.concatenate((stddev, np.full(stddev.shape, np.nan)), axis=1)
+            count = np.concatenate((count, count), axis=1)
+    elif not is_multi_channel:
+        result = result[:, 0]
+        result_valid_index = result_valid_index[:, 0]
+        if with_uncert:
+            stddev = stddev[:, 0]
+            count = count[:, 0]
+
+    return result, result_valid_index, stddev, count
+
+
 class XArrayResamplerNN(object):
     """Resampler for Xarray DataArray objects with the nearest neighbor algorithm."""
 
@@ -930,17 +1073,31 @@ class XArrayResamplerNN(object):
         return radius_of_influence
 
     def _create_resample_kdtree(self, chunks=CHUNK_SIZE):
-        """Set up kd tree on input."""
+        """Set up one kd tree per block of source rows.
+
+        Each partition only holds the valid coordinates of its own block, so
+        no task in the graph has to build or transfer a tree for the whole
+        source geometry.
+        """
         source_lons, source_lats = self.source_geo_def.get_lonlats(
             chunks=chunks)
+        band_chunks = _get_row_band_chunks(source_lons)
+        source_lons = source_lons.rechunk(band_chunks)
+        source_lats = source_lats.rechunk(band_chunks)
         valid_input_idx = ((source_lons >= -180) & (source_lons <= 180) & (source_lats <= 90) & (source_lats >= -90))
-        input_coords = lonlat2xyz(source_lons, source_lats)
-        input_coords = input_coords[valid_input_idx.ravel(), :]
 
-        # Build kd-tree on input
-        input_coords = input_coords.astype(np.float64)
-        delayed_kdtree = dask.delayed(KDTree, pure=True)(input_coords)
-        return valid_input_idx, delayed_kdtree
+        lon_blocks = source_lons.to_delayed().ravel()
+        lat_blocks = source_lats.to_delayed().ravel()
+        valid_blocks = valid_input_idx.to_delayed().ravel()
+        counts = [dask.delayed(np.count_nonzero, pure=True)(valid_block)
+                  for valid_block in valid_blocks]
+        offsets = dask.delayed(_get_partition_offsets, pure=True)(*counts)
+        kdtree_partitions = []
+        for idx, (lons, lats, valid) in enumerate(zip(lon_blocks, lat_blocks, valid_blocks)):
+            coords = dask.delayed(_get_valid_coords, pure=True)(lons, lats, valid)
+            kdtree_partitions.append(
+                dask.delayed(_KDTreePartition, pure=True)(coords, offsets[idx]))
+        return valid_input_idx, kdtree_partitions
 
     def query_resample_kdtree(self,
                               resample_kdtree,
@@ -948,20 +1105,45 @@ class XArrayResamplerNN(object):
                               tlats,
                               valid_oi,
                               mask):
-        """Query kd-tree on slice of target coordinates."""
+        """Query kd-tree partitions on slice of target coordinates.
+
+        Every target chunk is queried against every partition of
+        ``resample_kdtree``, partitions whose bounding sphere is out of reach
+        of the chunk being skipped, and the nearest neighbours found in all
+        partitions are merged per target chunk.
+        """
+        token = tokenize(tlons, tlats, valid_oi, [part.key for part in resample_kdtree],
+                         mask, self.neighbours, self.epsilon, self.radius_of_influence)
+        name = 'query-kdtree-' + token
+        target_name = 'kdtree-target-' + token
+        partition_name = 'query-kdtree-partition-' + token
+        dependencies = [tlons, tlats, valid_oi] + list(resample_kdtree)
         if mask is None:
-            args = tuple()
+            mask_keys = vii_keys = [None] * len(resample_kdtree)
         else:
-            ndims = self.source_geo_def.ndim
-            dims = 'mn'[:ndims]
-            args = (mask, dims, self.valid_input_index, dims)
+            mask = mask.rechunk(self.valid_input_index.chunks)
+            mask_keys = list(flatten(mask.__dask_keys__()))
+            vii_keys = list(flatten(self.valid_input_index.__dask_keys__()))
+            dependencies.extend([mask, self.valid_input_index])
+        query_partition = partial(_query_partition, neighbours=self.neighbours,
+                                  epsilon=self.epsilon, radius=self.radius_of_influence)
+        merge_queries = partial(_merge_partition_queries, neighbours=self.neighbours)
+
+        dsk = {}
+        for i, j in product(range(len(valid_oi.chunks[0])), range(len(valid_oi.chunks[1]))):
+            target_key = (target_name, i, j)
+            dsk[target_key] = (_get_target_part, (tlons.name, i, j),
+                               (tlats.name, i, j), (valid_oi.name, i, j))
+            query_keys = []
+            for idx, (partition, mask_key, vii_key) in enumerate(zip(resample_kdtree, mask_keys, vii_keys)):
+                query_key = (partition_name, i, j, idx)
+                dsk[query_key] = (query_partition, target_key, partition.key, mask_key, vii_key)
+                query_keys.append(query_key)
+            dsk[(name, i, j, 0)] = (merge_queries, (valid_oi.name, i, j)) + tuple(query_keys)
+        graph = HighLevelGraph.from_collections(name, dsk, dependencies=dependencies)
         # res.shape = rows, cols, neighbors
-        # j=rows, i=cols, k=neighbors, m=source rows, n=source cols
-        res = blockwise(query_no_distance, 'jik', tlons, 'ji', tlats, 'ji',
-                        valid_oi, 'ji', *args, kdtree=resample_kdtree,
-                        neighbours=self.neighbours, epsilon=self.epsilon,
-                        radius=self.radius_of_influence, dtype=np.int64,
-                        new_axes={'k': self.neighbours}, concatenate=True)
+        res = da.Array(graph, name, chunks=valid_oi.chunks + ((self.neighbours,),),
+                       dtype=int)
         return res, None
 
     def get_neighbour_info(self, mask=None):
@@ -1141,6 +1323,83 @@ class XArrayResamplerNN(object):
         return res
 
 
+def _get_row_band_chunks(arr):
+    """Get chunks of full rows holding about as many pixels as a chunk of *arr*.
+
+    The valid pixels of consecutive row bands are consecutive in the
+    flattened array, so indexes in a band only need an offset to become
+    indexes in the whole array.
+    """
+    if arr.ndim == 1:
+        return arr.chunks
+    rows = max(1, int(np.prod(arr.chunksize)) // arr.shape[1])
+    return (rows, arr.shape[1])
+
+
+def _get_valid_coords(lons, lats, valid_index):
+    """Get the geocentric coordinates of the valid pixels."""
+    return lonlat2xyz(lons, lats)[valid_index.ravel()].astype(np.float64)
+
+
+def _get_partition_offsets(*counts):
+    """Get the index of the first valid coordinate of every partition."""
+    return np.concatenate(([0], np.cumsum(counts)[:-1])).astype(np.int64)
+
+
+def _get_target_part(target_lons, target_lats, valid_output_index):
+    """Get the coordinates of the valid pixels of a target chunk and their bounding sphere."""
+    voir = valid_output_index.ravel()
+    coords = lonlat2xyz(target_lons.ravel()[voir], target_lats.ravel()[voir])
+    return (coords,) + _get_bounding_sphere(coords)
+
+
+def _query_partition(target, partition, mask=None, valid_input_index=None,
+                     neighbours=1, epsilon=0, radius=None):
+    """Query one kd tree partition for the valid pixels of a target chunk.
+
+    Returns None when the partition is out of reach of the target chunk,
+    otherwise the distances and the indexes of the neighbours among all
+    valid source pixels. Missing neighbours have an infinite distance and
+    an index of -1.
+    """
+    coords, center, target_radius = target
+    if not partition.n or not len(coords):
+        return None
+    reach = target_radius + partition.radius
+    if radius is not None:
+        reach += radius
+    if np.linalg.norm(center - partition.center) > reach:
+        return None
+    if mask is not None:
+        mask = mask.ravel()[valid_input_index.ravel()]
+    distances, indices = partition.kdtree.query(
+        coords, k=neighbours, eps=epsilon, distance_upper_bound=radius,
+        mask=mask)
+    if indices.ndim == 1:
+        distances = distances[:, None]
+        indices = indices[:, None]
+    good_pixels = indices < partition.n
+    indices = np.where(good_pixels, indices.astype(np.int64) + partition.offset, -1)
+    distances = np.where(good_pixels, distances, np.inf)
+    return distances, indices
+
+
+def _merge_partition_queries(valid_output_index, *results, neighbours=1):
+    """Keep the nearest neighbours found in all partitions for a target chunk."""
+    voi = valid_output_index
+    res_ia = np.full(voi.shape + (neighbours,), -1, dtype=int)
+    results = [res for res in results if res is not None]
+    if not results:
+        return res_ia
+    distances = np.concatenate([res[0] for res in results], axis=1)
+    indices = np.concatenate([res[1] for res in results], axis=1)
+    if len(results) > 1:
+        nearest = np.argsort(distances, axis=1, kind='stable')[:, :neighbours]
+        indices = np.take_along_axis(indices, nearest, axis=1)
+    res_ia[voi] = indices
+    return res_ia
+
+
 def _get_fill_mask_value(data_dtype):
     """Return the maximum value of dtype."""
     if issubclass(data_dtype.type, np.floating):
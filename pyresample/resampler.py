@@ -20,6 +20,7 @@ from __future__ import annotations
 
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
 from functools import lru_cache, partial
 from numbers import Number
 from typing import Union
@@ -213,7 +214,9 @@ def resample_blocks(func, src_area, src_arrays, dst_area,
 
     dst_chunks, output_shape = _normalize_chunks_for_area(dst_area, chunk_size, dtype)
 
-    for dst_block_info, dst_area_chunk in _enumerate_dst_area_chunks(dst_area, dst_chunks):
+    dst_area_chunks = list(_enumerate_dst_area_chunks(dst_area, dst_chunks))
+    _compute_source_slices(src_area, [dst_area_chunk for _, dst_area_chunk in dst_area_chunks])
+    for dst_block_info, dst_area_chunk in dst_area_chunks:
         position = dst_block_info["chunk-location"]
         dst_block_info["shape"] = output_shape
         try:
@@ -304,11 +307,12 @@ def crop_data_around_area(source_geo_def, src_arrays, target_geo_def):
     return smaller_src_arrays, small_source_geo_def, block_info
 
 
-@lru_cache
 def crop_source_area(source_geo_def, target_geo_def):
     """Crop a source area around the provided target area."""
-    slicer = create_slicer(source_geo_def, target_geo_def)
-    x_slice, y_slice = slicer.get_slices()
+    slices = _get_source_slices(source_geo_def, target_geo_def)
+    if slices is None:
+        raise IncompatibleAreas("Source and target areas are not overlapping.")
+    x_slice, y_slice = slices
     small_source_geo_def = source_geo_def[y_slice, x_slice]
     if isinstance(small_source_geo_def, SwathDefinition):
         small_source_geo_def.lons.data = small_source_geo_def.lons.data.rechunk((-1, -1))
@@ -316,6 +320,44 @@ def crop_source_area(source_geo_def, target_geo_def):
     return small_source_geo_def, x_slice, y_slice
 
 
+_SOURCE_SLICES_CACHE_SIZE = 16384
+
+
+@lru_cache(maxsize=_SOURCE_SLICES_CACHE_SIZE)
+def _get_source_slices(source_geo_def, target_geo_def):
+    """Get the slices of *source_geo_def* enclosing *target_geo_def*.
+
+    Returns None when the two geometries don't overlap. Results are memoized
+    for both geometries, so resampling other arrays between the same
+    geometries doesn't compute the polygons again.
+    """
+    try:
+        return create_slicer(source_geo_def, target_geo_def).get_slices()
+    except IncompatibleAreas:
+        return None
+
+
+def _compute_source_slices(source_geo_def, target_geo_defs):
+    """Compute the source slices for all *target_geo_defs* in a pool of threads.
+
+    The slicers spend most of their time in pyproj and shapely, which
+    release the GIL, so the slices of many destination chunks are computed
+    concurrently. Failures are left for the caller to raise when it asks
+    for the slices of the failing chunk.
+    """
+    def _get_slices_or_none(target_geo_def):
+        try:
+            _get_source_slices(source_geo_def, target_geo_def)
+        except Exception:
+            pass
+
+    num_workers = min(len(target_geo_defs), dask.config.get('num_workers', None) or os.cpu_count() or 1)
+    if num_workers < 2:
+        return
+    with ThreadPoolExecutor(max_workers=num_workers) as executor:
+        list(executor.map(_get_slices_or_none, target_geo_defs))
+
+
 def _enumerate_dst_area_chunks(dst_area, dst_chunks):
     """Enumerate the chunks in function of the dst_area."""
     for position, slices in _enumerate_chunk_slices(dst_chunks):
@@ -19,7 +19,9 @@
 
 from __future__ import annotations
 
+import threading
 from abc import ABC, abstractmethod
+from collections import OrderedDict
 from functools import lru_cache
 
 import numpy as np
@@ -74,7 +76,7 @@ class Slicer(ABC):
         """Set up the Slicer."""
         self.area_to_crop = area_to_crop
         self.area_to_contain = area_to_contain
-        self._transformer = Transformer.from_crs(self.area_to_contain.crs, self.area_to_crop.crs, always_xy=True)
+        self._transformer = _get_transformer(self.area_to_contain.crs.to_wkt(), self.area_to_crop.crs.to_wkt())
 
     def get_slices(self):
         """Get the slices to crop *area_to_crop* enclosing *area_to_contain*."""
@@ -92,6 +94,17 @@ class Slicer(ABC):
         raise NotImplementedError
 
 
+@lru_cache(maxsize=32)
+def _get_transformer(crs_from_wkt, crs_to_wkt):
+    """Get a transformer between two CRSs given as WKT.
+
+    Creating a transformer is much slower than slicing one chunk, so
+    transformers are shared between slicers. Transformers are safe to use
+    from several threads.
+    """
+    return Transformer.from_crs(crs_from_wkt, crs_to_wkt, always_xy=True)
+
+
 class SwathSlicer(Slicer):
     """A Slicer for cropping SwathDefinitions."""
 
@@ -99,15 +112,12 @@ class SwathSlicer(Slicer):
         """Get the shapely Polygon corresponding to *area_to_contain* in lon/lat coordinates."""
         from shapely.geometry import Polygon
         x, y = self.area_to_contain.get_edge_bbox_in_projection_coordinates(10)
-        poly = Polygon(zip(*self._transformer.transform(x, y)))
+        poly = Polygon(np.column_stack(self._transformer.transform(x, y)))
         return poly
 
     def get_slices_from_polygon(self, poly):
         """Get the slices based on the polygon."""
-        intersecting_chunk_slices = []
-        for smaller_poly, slices in _get_chunk_polygons_for_swath_to_crop(self.area_to_crop):
-            if smaller_poly.intersects(poly):
-                intersecting_chunk_slices.append(slices)
+        intersecting_chunk_slices = _get_chunk_index_for_swath_to_crop(self.area_to_crop).query(poly)
         if not intersecting_chunk_slices:
             raise IncompatibleAreas
         return self._assemble_slices(intersecting_chunk_slices)
@@ -122,22 +132,134 @@ class SwathSlicer(Slicer):
         return slices
 
 
-@lru_cache(maxsize=10)
-def _get_chunk_polygons_for_swath_to_crop(swath_to_crop):
-    """Get the polygons for each chunk of the area_to_crop."""
-    res = []
-    from shapely.geometry import Polygon
-    src_chunks = swath_to_crop.lons.chunks
-    for _position, (line_slice, col_slice) in _enumerate_chunk_slices(src_chunks):
-        line_slice = expand_slice(line_slice)
-        col_slice = expand_slice(col_slice)
-        smaller_swath = swath_to_crop[line_slice, col_slice]
-        lons, lats = smaller_swath.get_edge_lonlats(10)
-        lons = np.hstack(lons)
-        lats = np.hstack(lats)
-        smaller_poly = Polygon(zip(lons, lats))
-        res.append((smaller_poly, (line_slice, col_slice)))
-    return res
+class _SwathChunkIndex:
+    """Spatial index of the lon/lat footprints of the chunks of a swath.
+
+    The index is pickled as its polygons and chunk slices, and the STRtree
+    is rebuilt on unpickling.
+    """
+
+    def __init__(self, polygons, chunk_slices):
+        from shapely import STRtree
+        self.polygons = polygons
+        self.chunk_slices = chunk_slices
+        self._tree = STRtree(polygons)
+
+    def __reduce__(self):
+        return self.__class__, (self.polygons, self.chunk_slices)
+
+    @classmethod
+    def from_swath(cls, swath, frequency=10):
+        """Build the index from the edges of every chunk of *swath*, sampled *frequency* times per side.
+
+        The chunks are expanded by one pixel on every side and the edges of
+        all chunks are computed together.
+        """
+        import shapely
+        chunk_slices = []
+        rows = []
+        cols = []
+        height, width = swath.shape
+        for _position, (line_slice, col_slice) in _enumerate_chunk_slices(swath.lons.chunks):
+            line_slice = expand_slice(line_slice)
+            col_slice = expand_slice(col_slice)
+            chunk_slices.append((line_slice, col_slice))
+            chunk_rows, chunk_cols = _get_edge_indices(line_slice.indices(height), col_slice.indices(width),
+                                                       frequency)
+            rows.append(chunk_rows)
+            cols.append(chunk_cols)
+        rows = np.stack(rows)
+        cols = np.stack(cols)
+        lons, lats = da.compute(_get_dask_array(swath.lons).vindex[rows.ravel(), cols.ravel()],
+                                _get_dask_array(swath.lats).vindex[rows.ravel(), cols.ravel()])
+        lons = lons.reshape(rows.shape)
+        lats = lats.reshape(rows.shape)
+
+        is_valid = (lons >= -180) & (lons <= 180) & (lats >= -90) & (lats <= 90)
+        lon_spans = np.ma.masked_where(~is_valid, lons)
+        lon_spans = (lon_spans.max(axis=(1, 2)) - lon_spans.min(axis=(1, 2))).filled(0)
+        # chunks with a completely invalid side can't be outlined and always intersect
+        polygons = np.full(len(chunk_slices), shapely.box(-540, -90, 540, 90), dtype=object)
+        is_outlined = is_valid.any(axis=-1).all(axis=-1)
+        is_simple = is_outlined & (lon_spans <= 180)
+        ring_indices = np.broadcast_to((np.cumsum(is_simple) - 1)[:, None, None], rows.shape)
+        is_simple_point = is_valid & is_simple[:, None, None]
+        rings = shapely.linearrings(lons[is_simple_point], lats[is_simple_point],
+                                    indices=ring_indices[is_simple_point])
+        polygons[is_simple] = shapely.polygons(rings)
+        for chunk_idx in np.flatnonzero(is_outlined & ~is_simple):
+            polygons[chunk_idx] = _get_wrapped_footprint(lons[chunk_idx][is_valid[chunk_idx]],
+                                                         lats[chunk_idx][is_valid[chunk_idx]])
+        return cls(polygons, chunk_slices)
+
+    def query(self, poly):
+        """Get the slices of the chunks whose footprint intersects *poly*."""
+        return [self.chunk_slices[idx] for idx in np.sort(self._tree.query(poly, predicate='intersects'))]
+
+
+def _get_wrapped_footprint(lons, lats):
+    """Get the footprint of a chunk whose edge longitudes span more than 180 degrees.
+
+    Such a chunk crosses the antimeridian or goes around a pole. The
+    longitudes are unwrapped, a ring going around a pole is closed along the
+    pole, and the footprint is repeated 360 degrees east and west so that it
+    intersects polygons in the [-180, 180] longitude range.
+    """
+    import shapely
+    from shapely.affinity import translate
+    lons = np.unwrap(np.append(lons, lons[0]), period=360)
+    lats = np.append(lats, lats[0])
+    if abs(lons[-1] - lons[0]) > 180:
+        pole = 90 if lats.mean() > 0 else -90
+        lons = np.append(lons, (lons[-1], lons[0]))
+        lats = np.append(lats, (pole, pole))
+    polygon = shapely.polygons(np.column_stack((lons, lats)))
+    if not polygon.is_valid:
+        return shapely.box(-540, -90, 540, 90)
+    return shapely.union_all([translate(polygon, xoff=xoff) for xoff in (-360, 0, 360)])
+
+
+def _get_edge_indices(line_indices, col_indices, frequency):
+    """Get the rows and columns of the four sides of a chunk, in the order of ``get_edge_lonlats``."""
+    first_row, last_row = line_indices[0], line_indices[1] - 1
+    first_col, last_col = col_indices[0], col_indices[1] - 1
+    row_samples = np.linspace(first_row, last_row, frequency, dtype=int)
+    col_samples = np.linspace(first_col, last_col, frequency, dtype=int)
+    rows = np.stack((np.full(frequency, first_row), row_samples,
+                     np.full(frequency, last_row), row_samples[::-1]))
+    cols = np.stack((col_samples, np.full(frequency, last_col),
+                     col_samples[::-1], np.full(frequency, first_col)))
+    return rows, cols
+
+
+def _get_dask_array(arr):
+    """Get the dask array behind *arr*."""
+    return arr.data if hasattr(arr, 'dims') else arr
+
+
+_SWATH_CHUNK_INDEX_CACHE_SIZE = 10
+_swath_chunk_indices = OrderedDict()
+_swath_chunk_indices_lock = threading.Lock()
+
+
+def _get_chunk_index_for_swath_to_crop(swath_to_crop):
+    """Get the chunk footprint index of *swath_to_crop*.
+
+    Indices are memoized by the hash of the swath, which is derived from
+    the names of its dask arrays. A new swath object built from the same
+    arrays, in this process or another one, reuses the index.
+    """
+    key = hash(swath_to_crop)
+    with _swath_chunk_indices_lock:
+        if key in _swath_chunk_indices:
+            _swath_chunk_indices.move_to_end(key)
+            return _swath_chunk_indices[key]
+    chunk_index = _SwathChunkIndex.from_swath(swath_to_crop)
+    with _swath_chunk_indices_lock:
+        _swath_chunk_indices[key] = chunk_index
+        while len(_swath_chunk_indices) > _SWATH_CHUNK_INDEX_CACHE_SIZE:
+            _swath_chunk_indices.popitem(last=False)
+    return chunk_index
 
 
 def expand_slice(small_slice):
@@ -153,16 +275,16 @@ class AreaSlicer(Slicer):
         from shapely.geometry import Polygon
         x, y = self.area_to_contain.get_edge_bbox_in_projection_coordinates(frequency=10)
         if self.area_to_crop.is_geostationary:
-            x_geos, y_geos = get_geostationary_bounding_box_in_proj_coords(self.area_to_crop, 360)
+            x_geos, y_geos = _get_geostationary_bounding_box(self.area_to_crop)
             x_geos, y_geos = self._transformer.transform(x_geos, y_geos, direction='INVERSE')
-            geos_poly = Polygon(zip(x_geos, y_geos))
-            poly = Polygon(zip(x, y))
+            geos_poly = Polygon(np.column_stack((x_geos, y_geos)))
+            poly = Polygon(np.column_stack((x, y)))
             poly = poly.intersection(geos_poly)
             if poly.is_empty:
                 raise IncompatibleAreas('No slice on area.')
             x, y = zip(*poly.exterior.coords)
 
-        return Polygon(zip(*self._transformer.transform(x, y)))
+        return Polygon(np.column_stack(self._transformer.transform(x, y)))
 
     def get_slices_from_polygon(self, poly_to_contain):
         """Get the slices based on the polygon."""
@@ -178,8 +300,7 @@ class AreaSlicer(Slicer):
             bounds = buffered_poly.bounds
         except ValueError as err:
             raise InvalidArea(str(err))
-        from shapely.geometry import Polygon
-        poly_to_crop = Polygon(zip(*self.area_to_crop.get_edge_bbox_in_projection_coordinates(frequency=10)))
+        poly_to_crop = _get_area_polygon(self.area_to_crop)
         if not poly_to_crop.intersects(buffered_poly):
             raise IncompatibleAreas("Areas not overlapping.")
         bounds = self._sanitize_polygon_bounds(bounds)
@@ -213,6 +334,19 @@ class AreaSlicer(Slicer):
         return expand_slice(slice_x), expand_slice(slice_y)
 
 
+@lru_cache(maxsize=10)
+def _get_area_polygon(area):
+    """Get the shapely Polygon of the edges of *area* in its projection coordinates."""
+    from shapely.geometry import Polygon
+    return Polygon(np.column_stack(area.get_edge_bbox_in_projection_coordinates(frequency=10)))
+
+
+@lru_cache(maxsize=10)
+def _get_geostationary_bounding_box(area):
+    """Get the bounding box of a geostationary area in projection coordinates."""
+    return get_geostationary_bounding_box_in_proj_coords(area, 360)
+
+
 def _enumerate_chunk_slices(chunks):
     """Enumerate chunks with slices."""
     for position in np.ndindex(tuple(map(len, (chunks)))):
@@ -202,6 +202,36 @@ class TestNumpyBilinear(unittest.TestCase):
         np.testing.assert_allclose(t__, np.array([0.30769689]))
         np.testing.assert_allclose(s__, np.array([0.74616628]))
 
+    def test_solve_fractional_distances(self):
+        """Test that the compiled solver gives the same results as the NumPy version."""
+        from pyresample.bilinear._base import (
+            _get_fractional_distances,
+            _solve_fractional_distances,
+        )
+
+        corner_points = [np.concatenate(pts) for pts in zip(self.pts_irregular,
+                                                            self.pts_vert_parallel,
+                                                            self.pts_both_parallel)]
+        out_x = np.zeros(3)
+        out_y = np.zeros(3)
+        t__, s__ = _solve_fractional_distances(corner_points, out_x, out_y)
+        np.testing.assert_array_equal(t__, np.array([0.375, 0.5, 0.5]))
+        np.testing.assert_array_equal(s__, np.array([0.5, 0.5, 0.5]))
+
+        rng = np.random.default_rng(42)
+        base = rng.uniform(-1., 1., (1000, 2))
+        corner_points = [base + offset + rng.normal(0., 0.3, (1000, 2))
+                         for offset in ([0., 0.], [1., 0.], [0., 1.], [1., 1.])]
+        corner_points[0][:10] = np.nan
+        out_x = base[:, 0] + rng.uniform(0., 1., 1000)
+        out_y = base[:, 1] + rng.uniform(0., 1., 1000)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            expected = _get_fractional_distances(corner_points, out_x, out_y)
+        res = _solve_fractional_distances(corner_points, out_x, out_y)
+        np.testing.assert_allclose(res[0], expected[0])
+        np.testing.assert_allclose(res[1], expected[1])
+        self.assertTrue(np.all(np.isnan(res[0][:10])))
+
     def test_solve_quadratic(self):
         """Test solving quadratic equation."""
         from pyresample.bilinear._base import _calc_abc, _solve_quadratic
@@ -24,6 +24,7 @@ import dask
 import dask.array as da
 import numpy as np
 import xarray as xr
+from dask.utils import key_split
 
 from pyresample import bucket, create_area_def
 from pyresample.geometry import AreaDefinition
@@ -130,6 +131,54 @@ class Test(unittest.TestCase):
         np.testing.assert_equal(resampler.x_idxs, np.array([-1, 0, 0, 1, 1, 1, -1, -1, -1]))
         np.testing.assert_equal(resampler.y_idxs, np.array([-1, 1, 1, 1, 0, 0, -1, -1, -1]))
 
+    def test_indices_are_cached(self):
+        """Test that the indices are computed once and reused for the same geometries."""
+        data = da.from_array(np.array([[2., 3.], [7., 16.]]), chunks=self.chunks)
+        with patch.dict(bucket._INDICES_CACHE, clear=True), \
+                patch('pyresample.bucket._get_proj_coordinates',
+                      side_effect=bucket._get_proj_coordinates) as get_proj_coordinates:
+            resampler = bucket.BucketResampler(self.adef, self.lons, self.lats, cache_indices=True)
+            num_calls = get_proj_coordinates.call_count
+            assert num_calls > 0
+            expected = self.resampler.get_sum(data).compute()
+            np.testing.assert_array_equal(resampler.get_sum(data).compute(), expected)
+            np.testing.assert_array_equal(resampler.get_sum(data).compute(), expected)
+            other_resampler = bucket.BucketResampler(self.adef, self.lons, self.lats, cache_indices=True)
+            np.testing.assert_array_equal(other_resampler.get_sum(data).compute(), expected)
+            self.assertIs(other_resampler.x_idxs, resampler.x_idxs)
+            self.assertEqual(get_proj_coordinates.call_count, num_calls)
+
+            other_lats = da.from_array(np.array([[61., 61.], [61.2, 61.3]]), chunks=self.chunks)
+            bucket.BucketResampler(self.adef, self.lons, other_lats, cache_indices=True)
+            self.assertGreater(get_proj_coordinates.call_count, num_calls)
+
+    def test_indices_are_not_cached_by_default(self):
+        """Test that the indices stay lazy and out of the cache by default."""
+        with patch.dict(bucket._INDICES_CACHE, clear=True), \
+                dask.config.set(scheduler=CustomScheduler(max_computes=0)):
+            bucket.BucketResampler(self.adef, self.lons, self.lats)
+            self.assertEqual(len(bucket._INDICES_CACHE), 0)
+
+    def test_save_and_load_indices(self):
+        """Test saving the indices and creating a resampler from them."""
+        import os
+        import tempfile
+        data = da.from_array(np.array([[2., 3.], [7., 16.]]), chunks=self.chunks)
+        expected = self.resampler.get_sum(data).compute()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, 'indices.npy')
+            self.resampler.save_indices(filename)
+            with patch('pyresample.bucket._get_bucket_indices') as get_bucket_indices:
+                resampler = bucket.BucketResampler.from_indices(self.adef, filename)
+                get_bucket_indices.assert_not_called()
+            np.testing.assert_array_equal(resampler.idxs, self.resampler.idxs)
+            np.testing.assert_array_equal(resampler.get_sum(data).compute(), expected)
+            np.testing.assert_array_equal(resampler.get_count().compute(), self.resampler.get_count().compute())
+
+            np.save(filename, np.zeros(4))
+            with self.assertRaises(ValueError):
+                bucket.BucketResampler.from_indices(self.adef, filename)
+
     def _get_sum_result(self, data, **kwargs):
         """Compute the bucket average with kwargs and check that no dask computation is performed."""
         with dask.config.set(scheduler=CustomScheduler(max_computes=0)):
@@ -224,6 +273,35 @@ class Test(unittest.TestCase):
         # test that minimum of bucket with only nan is nan, and empty buckets are nan
         self.assertEqual(np.count_nonzero(~np.isnan(result)), 2)
 
+    def test_get_min_max_many_chunks(self):
+        """Test min/max bucket resampling combining many chunks."""
+        rng = np.random.default_rng(1)
+        lons = rng.uniform(20, 30, 1000)
+        lats = rng.uniform(58, 62, 1000)
+        data = rng.normal(size=1000)
+        data[::17] = np.nan
+        adef = create_area_def(area_id='test', projection={'proj': 'latlong'},
+                               width=20, height=10, area_extent=(20, 58, 30, 62))
+        resampler = bucket.BucketResampler(adef, da.from_array(lons, chunks=50),
+                                           da.from_array(lats, chunks=50))
+        idxs = resampler.idxs.compute()
+        dask_data = da.from_array(data, chunks=50)
+        for method, func in (('get_min', np.min), ('get_max', np.max)):
+            with dask.config.set(scheduler=CustomScheduler(max_computes=0)):
+                res_skipna = getattr(resampler, method)(dask_data)
+                res_nan = getattr(resampler, method)(dask_data, skipna=False)
+            res_skipna = res_skipna.compute(scheduler='sync').ravel()
+            res_nan = res_nan.compute(scheduler='sync').ravel()
+            for idx in np.unique(idxs[idxs >= 0]):
+                values = data[idxs == idx]
+                valid_values = values[~np.isnan(values)]
+                expected = func(valid_values) if valid_values.size else np.nan
+                np.testing.assert_equal(res_skipna[idx], expected)
+                expected = np.nan if np.isnan(values).any() else func(values)
+                np.testing.assert_equal(res_nan[idx], expected)
+            self.assertEqual(np.count_nonzero(~np.isnan(res_skipna)),
+                             len(np.unique(idxs[(idxs >= 0) & ~np.isnan(data)])))
+
     def test_get_abs_max(self):
         """Test abs max bucket resampling."""
         data = da.from_array(np.array([[2, -11], [5, np.nan]]),
@@ -306,6 +384,157 @@ class Test(unittest.TestCase):
         # test than all other buckets are -1
         self.assertEqual(np.count_nonzero(result != -1), 1)
 
+    def test_get_statistics(self):
+        """Test calculating several statistics in a single pass."""
+        data = da.from_array(np.array([[2., 11.], [5., np.nan]]), chunks=self.chunks)
+        with dask.config.set(scheduler=CustomScheduler(max_computes=0)):
+            result = self.resampler.get_statistics(data)
+        self.assertEqual(set(result.keys()), set(bucket.STATISTICS))
+        with dask.config.set(scheduler=CustomScheduler(max_computes=1)):
+            result = dict(zip(result.keys(), da.compute(*result.values())))
+        for stat in bucket.STATISTICS:
+            self.assertEqual(result[stat].shape, self.adef.shape)
+        np.testing.assert_array_equal(result['sum'], self._get_sum_result(data))
+        np.testing.assert_array_equal(result['count'],
+                                      self._get_sum_result(da.from_array(np.array([[1, 1], [1, 0]]))))
+        self.assertEqual(result['count'].dtype, np.int64)
+        np.testing.assert_array_equal(result['min'], self._get_min_result(data))
+        np.testing.assert_array_equal(result['max'], self._get_max_result(data))
+        np.testing.assert_array_equal(result['mean'], self._get_average_result(data))
+        self.assertEqual(np.count_nonzero(result['std'] == 4.5), 1)
+        self.assertEqual(np.count_nonzero(result['std'] == 0), 1)
+        self.assertEqual(np.count_nonzero(~np.isnan(result['std'])), 2)
+
+    def test_get_statistics_skipna_and_fill_value(self):
+        """Test the single pass statistics with missing values."""
+        data = da.from_array(np.array([[2., -1.], [5., np.nan]]), chunks=self.chunks)
+        result = self.resampler.get_statistics(data, stats=('mean', 'count', 'sum'),
+                                               fill_value=-1, skipna=False)
+        result = dict(zip(result.keys(), da.compute(*result.values())))
+        # the bin of 2 and -1 (missing) is missing when not skipping
+        self.assertEqual(np.count_nonzero(result['mean'] != -1), 1)
+        self.assertEqual(np.count_nonzero(result['mean'] == 5), 1)
+        self.assertEqual(result['count'].sum(), 2)
+        self.assertEqual(np.count_nonzero(np.isnan(result['sum'])), 2)
+
+        result = self.resampler.get_statistics(data, stats=('mean',), fill_value=-1, skipna=True)
+        self.assertEqual(np.count_nonzero(result['mean'].compute() == 2), 1)
+
+    def test_get_statistics_chunked(self):
+        """Test that the single pass statistics are computed per chunk and merged."""
+        adef = AreaDefinition('small', 'description', '', {'proj': 'longlat', 'datum': 'WGS84'},
+                              4, 3, (0., 0., 4., 3.))
+        rng = np.random.default_rng(42)
+        lons = rng.uniform(-1., 5., (40, 30))
+        lats = rng.uniform(-1., 4., (40, 30))
+        values = rng.normal(size=(40, 30))
+        values[rng.random((40, 30)) < 0.1] = np.nan
+        resampler = bucket.BucketResampler(adef, da.from_array(lons, chunks=10), da.from_array(lats, chunks=10))
+        data = da.from_array(values, chunks=10)
+        result = resampler.get_statistics(data)
+        layer_names = [name for name in result['mean'].dask.layers if 'get_chunk_bin_moments' in name]
+        self.assertEqual(len(result['mean'].dask.layers[layer_names[0]]), 12)
+        result = dict(zip(result.keys(), da.compute(*result.values())))
+
+        idxs = resampler.idxs.compute()
+        for idx in range(adef.size):
+            bin_values = values.ravel()[idxs == idx]
+            bin_values = bin_values[~np.isnan(bin_values)]
+            expected = {'sum': bin_values.sum(), 'count': bin_values.size, 'min': bin_values.min(),
+                        'max': bin_values.max(), 'mean': bin_values.mean(), 'std': bin_values.std()}
+            for stat, value in expected.items():
+                np.testing.assert_allclose(result[stat].ravel()[idx], value, err_msg=stat)
+
+        result = resampler.get_statistics(data, stats=('sum', 'min', 'std'), skipna=False)
+        np.testing.assert_array_equal(result['sum'].compute(), resampler.get_sum(data, skipna=False).compute())
+        np.testing.assert_array_equal(result['min'].compute(), resampler.get_min(data, skipna=False).compute())
+        np.testing.assert_array_equal(np.isnan(result['std'].compute()), np.isnan(result['min'].compute()))
+
+    def test_get_statistics_unknown(self):
+        """Test that unknown statistics are rejected."""
+        with self.assertRaises(ValueError):
+            self.resampler.get_statistics(da.zeros((2, 2)), stats=('sum', 'median'))
+
+    def test_get_weighted_average(self):
+        """Test weighted averaging bucket resampling."""
+        data = da.from_array(np.array([[2., 11.], [5., np.nan]]), chunks=self.chunks)
+        weights = da.from_array(np.array([[3., 1.], [2., 1.]]), chunks=self.chunks)
+        with dask.config.set(scheduler=CustomScheduler(max_computes=0)):
+            result = self.resampler.get_weighted_average(data, weights)
+        result = result.compute()
+        self.assertEqual(np.count_nonzero(result == (2. * 3 + 11.) / 4), 1)
+        self.assertEqual(np.count_nonzero(result == 5), 1)
+        self.assertEqual(np.count_nonzero(~np.isnan(result)), 2)
+
+        # Equal weights give the plain average
+        result = self.resampler.get_weighted_average(data, da.ones_like(data), fill_value=-1).compute()
+        np.testing.assert_array_equal(result, self._get_average_result(data, fill_value=-1))
+
+        # NaN weights are treated as missing values
+        weights = da.from_array(np.array([[np.nan, 1.], [2., 1.]]), chunks=self.chunks)
+        result = self.resampler.get_weighted_average(data, weights).compute()
+        self.assertEqual(np.count_nonzero(result == 11), 1)
+        result = self.resampler.get_weighted_average(data, weights, skipna=False).compute()
+        self.assertEqual(np.count_nonzero(~np.isnan(result)), 1)
+
+    def test_get_quantile(self):
+        """Test quantile and median bucket resampling."""
+        rng = np.random.default_rng(3)
+        adef = create_area_def(area_id='test', projection={'proj': 'latlong'},
+                               width=20, height=10, area_extent=(20, 58, 30, 62))
+        lons = da.from_array(rng.uniform(20, 30, 1000), chunks=100)
+        lats = da.from_array(rng.uniform(58, 62, 1000), chunks=100)
+        data = rng.normal(size=1000)
+        data[::13] = np.nan
+        resampler = bucket.BucketResampler(adef, lons, lats)
+        idxs = resampler.idxs.compute()
+        with dask.config.set(scheduler=CustomScheduler(max_computes=0)):
+            quantiles = resampler.get_quantile(da.from_array(data, chunks=100), [0.1, 0.5, 0.9])
+            median = resampler.get_median(da.from_array(data, chunks=100), skipna=False)
+        quantiles = quantiles.compute().reshape(3, -1)
+        median = median.compute().ravel()
+        self.assertEqual(quantiles.shape, (3, adef.size))
+        for idx in range(adef.size):
+            values = data[idxs == idx]
+            valid_values = values[~np.isnan(values)]
+            if valid_values.size:
+                np.testing.assert_allclose(quantiles[:, idx], np.quantile(valid_values, [0.1, 0.5, 0.9]))
+            else:
+                self.assertTrue(np.all(np.isnan(quantiles[:, idx])))
+            if values.size and not np.isnan(values).any():
+                np.testing.assert_allclose(median[idx], np.median(values))
+            else:
+                self.assertTrue(np.isnan(median[idx]))
+
+    def test_get_quantile_bands_from_source_size(self):
+        """Test that the quantiles are computed in bands sized from the source data, reading each chunk once."""
+        rng = np.random.default_rng(3)
+        adef = create_area_def(area_id='test', projection={'proj': 'latlong'},
+                               width=20, height=10, area_extent=(20, 58, 30, 62))
+        lons = da.from_array(rng.uniform(20, 30, 1000), chunks=100)
+        lats = da.from_array(rng.uniform(58, 62, 1000), chunks=100)
+        data = rng.normal(size=1000)
+        resampler = bucket.BucketResampler(adef, lons, lats)
+        expected = resampler.get_quantile(da.from_array(data, chunks=100), [0.1, 0.9]).compute()
+        with dask.config.set({'array.chunk-size': '4KiB'}):
+            quantiles = resampler.get_quantile(da.from_array(data, chunks=100), [0.1, 0.9])
+
+        task_names = [key_split(key) for key in quantiles.dask]
+        self.assertEqual(task_names.count('split_chunk_by_band'), 10)
+        self.assertEqual(task_names.count('get_band_quantiles'), 4)
+        np.testing.assert_allclose(quantiles.compute(), expected)
+
+    def test_get_quantile_fill_value(self):
+        """Test quantile bucket resampling with a fill value."""
+        data = da.from_array(np.array([[2., 11.], [-1., 5.]]), chunks=self.chunks)
+        result = self.resampler.get_median(data, fill_value=-1).compute()
+        self.assertEqual(result.shape, self.adef.shape)
+        self.assertEqual(np.count_nonzero(result == 6.5), 1)
+        self.assertEqual(np.count_nonzero(result == 5), 1)
+        self.assertEqual(np.count_nonzero(result != -1), 2)
+        with self.assertRaises(ValueError):
+            self.resampler.get_quantile(data, 1.5)
+
     def test_resample_bucket_fractions(self):
         """Test fraction calculations for categorical data."""
         data = da.from_array(np.array([[2, 4], [2, 2]]),
@@ -342,3 +571,83 @@ class Test(unittest.TestCase):
         # the categories
         with dask.config.set(scheduler=CustomScheduler(max_computes=1)):
             _ = self.resampler.get_fractions(data, categories=None)
+
+    def test_get_fractions_many_categories(self):
+        """Test fractions of many, unordered categories in a single pass."""
+        rng = np.random.default_rng(3)
+        lons = rng.uniform(20, 30, 1000)
+        lats = rng.uniform(58, 62, 1000)
+        categories = [7, 3, 11, 5, 2, 13]
+        data = rng.choice(categories + [99], size=1000)
+        adef = create_area_def(area_id='test', projection={'proj': 'latlong'},
+                               width=20, height=10, area_extent=(20, 58, 30, 62))
+        resampler = bucket.BucketResampler(adef, da.from_array(lons, chunks=50),
+                                           da.from_array(lats, chunks=50))
+        idxs = resampler.idxs.compute()
+        with dask.config.set(scheduler=CustomScheduler(max_computes=0)):
+            result = resampler.get_fractions(da.from_array(data, chunks=50),
+                                             categories=categories)
+        self.assertEqual(list(result.keys()), categories)
+        for cat in categories:
+            res = result[cat].compute(scheduler='sync').ravel()
+            for idx in range(adef.size):
+                values = data[idxs == idx]
+                expected = np.mean(values == cat) if values.size else np.nan
+                np.testing.assert_allclose(res[idx], expected)
+
+
+class TestBucketAccumulator(unittest.TestCase):
+    """Test accumulating bucket statistics over several granules."""
+
+    adef = create_area_def(area_id='test', projection={'proj': 'latlong'},
+                           width=4, height=4, center=(0, 0), resolution=10)
+
+    def setUp(self):
+        rng = np.random.default_rng(42)
+        self.granules = []
+        for _ in range(3):
+            lons = rng.uniform(-25, 25, (10, 20))
+            lats = rng.uniform(-25, 25, (10, 20))
+            data = rng.normal(280, 10, (10, 20))
+            data[0, :5] = np.nan
+            self.granules.append((lons, lats, data))
+
+    def _get_reference(self, func):
+        """Compute the reference statistic per bin from all granules at once."""
+        resampler = bucket.BucketResampler(self.adef,
+                                           da.from_array(np.concatenate([g[0] for g in self.granules])),
+                                           da.from_array(np.concatenate([g[1] for g in self.granules])))
+        idxs = resampler.idxs.compute()
+        data = np.concatenate([g[2] for g in self.granules]).ravel()
+        res = np.full(self.adef.size, np.nan)
+        for idx in range(self.adef.size):
+            values = data[(idxs == idx) & ~np.isnan(data)]
+            if values.size:
+                res[idx] = func(values)
+        return res.reshape(self.adef.shape)
+
+    def test_accumulate_granules(self):
+        """Test that accumulated statistics match the statistics of all data at once."""
+        accumulator = bucket.BucketAccumulator(self.adef)
+        for lons, lats, data in self.granules:
+            accumulator.add(da.from_array(lons, chunks=5), lats, xr.DataArray(data))
+        self.assertEqual(accumulator.num_granules, 3)
+        np.testing.assert_allclose(accumulator.get_average(), self._get_reference(np.mean))
+        np.testing.assert_allclose(accumulator.get_min(), self._get_reference(np.min))
+        np.testing.assert_allclose(accumulator.get_max(), self._get_reference(np.max))
+        np.testing.assert_allclose(accumulator.get_std(), self._get_reference(np.std))
+        np.testing.assert_allclose(accumulator.get_std(ddof=1),
+                                   self._get_reference(lambda x: np.std(x, ddof=1) if x.size > 1 else np.nan))
+        np.testing.assert_array_equal(accumulator.get_count(),
+                                      np.nan_to_num(self._get_reference(np.size)).astype(int))
+        np.testing.assert_allclose(accumulator.get_sum(), np.nan_to_num(self._get_reference(np.sum)))
+
+    def test_empty_bins(self):
+        """Test the fill value of empty bins."""
+        accumulator = bucket.BucketAccumulator(self.adef)
+        accumulator.add(np.array([5.]), np.array([5.]), np.array([3.]))
+        average = accumulator.get_average(fill_value=-1)
+        self.assertEqual(np.count_nonzero(average == 3), 1)
+        self.assertEqual(np.count_nonzero(average == -1), self.adef.size - 1)
+        self.assertEqual(np.count_nonzero(np.isnan(accumulator.get_std())), self.adef.size - 1)
+        self.assertEqual(accumulator.get_sum().sum(), 3)
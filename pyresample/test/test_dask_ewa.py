@@ -26,6 +26,7 @@ import pytest
 from pyproj import CRS
 
 import pyresample.ewa
+from pyresample.test.utils import CustomScheduler
 
 da = pytest.importorskip("dask.array")
 xr = pytest.importorskip("xarray")
@@ -386,3 +387,147 @@ class TestDaskEWAResampler:
 
         assert res1.name != res2.name
         assert res1.compute().shape != res2.compute().shape
+
+    @pytest.mark.parametrize('persist', [False, True])
+    def test_cache_dir(self, tmp_path, persist):
+        """Test that ll2cr results are cached on disk and reused."""
+        swath_data, source_swath, target_area = get_test_data(
+            input_shape=(100, 50), output_shape=(200, 100),
+        )
+        resampler = DaskEWAResampler(source_swath, target_area)
+        expected = resampler.resample(swath_data, rows_per_scan=10).compute()
+
+        resampler = DaskEWAResampler(source_swath, target_area)
+        result = resampler.resample(swath_data, rows_per_scan=10,
+                                    cache_dir=str(tmp_path), persist=persist).compute()
+        np.testing.assert_array_equal(result, expected)
+        cache_dirs = list(tmp_path.glob('ll2cr_*'))
+        assert len(cache_dirs) == 1
+        assert (cache_dirs[0] / 'll2cr_blocks.json').exists()
+
+        with mock.patch.object(dask_ewa, 'll2cr', wraps=dask_ewa.ll2cr) as ll2cr:
+            resampler = DaskEWAResampler(source_swath, target_area)
+            result = resampler.resample(swath_data, rows_per_scan=10,
+                                        cache_dir=str(tmp_path), persist=persist).compute()
+        ll2cr.assert_not_called()
+        np.testing.assert_array_equal(result, expected)
+
+    def test_cache_dir_empty_blocks(self, tmp_path):
+        """Test caching ll2cr results that do not all overlap the target area."""
+        swath_data, source_swath, target_area = get_test_data(
+            input_shape=(100, 50), output_shape=(200, 100), input_chunks=10,
+        )
+        target_area = target_area[:40, :]
+        resampler = DaskEWAResampler(source_swath, target_area)
+        expected = resampler.resample(swath_data, rows_per_scan=10).compute()
+
+        for _ in range(2):
+            resampler = DaskEWAResampler(source_swath, target_area)
+            result = resampler.resample(swath_data, rows_per_scan=10,
+                                        cache_dir=str(tmp_path)).compute()
+            np.testing.assert_array_equal(result, expected)
+        cache_dir = next(tmp_path.glob('ll2cr_*'))
+        assert 0 < len(list(cache_dir.glob('block_*.npy'))) < 10
+
+    def test_persist_skips_empty_blocks(self):
+        """Test persisting ll2cr results when some input blocks are outside the target area."""
+        swath_data, source_swath, target_area = get_test_data(
+            input_shape=(100, 50), output_shape=(200, 100),
+        )
+        resampler = DaskEWAResampler(source_swath, target_area)
+        expected = resampler.resample(swath_data, rows_per_scan=10).compute()
+        resampler = DaskEWAResampler(source_swath, target_area)
+        # one computation to persist ll2cr and one to check all blocks
+        with dask.config.set(scheduler=CustomScheduler(max_computes=2)):
+            result = resampler.resample(swath_data, rows_per_scan=10, persist=True)
+        assert len(resampler.cache['ll2cr_blocks']) < resampler.cache['ll2cr_result'].npartitions
+        np.testing.assert_array_equal(result.compute(), expected)
+
+    @pytest.mark.parametrize('input_dtype', [np.float32, np.int8])
+    @pytest.mark.parametrize('maximum_weight_mode', [False, True])
+    def test_num_threads(self, input_dtype, maximum_weight_mode):
+        """Test that splitting the output chunks between threads gives the same result."""
+        swath_data, source_swath, target_area = get_test_data(
+            input_shape=(100, 50), output_shape=(200, 100), input_dtype=input_dtype,
+        )
+        resampler = DaskEWAResampler(source_swath, target_area)
+        expected = resampler.resample(swath_data, rows_per_scan=10, weight_delta_max=40,
+                                      maximum_weight_mode=maximum_weight_mode).compute()
+        with mock.patch.object(dask_ewa, 'run_chunked', wraps=dask_ewa.run_chunked) as run_chunked:
+            result = resampler.resample(swath_data, rows_per_scan=10, weight_delta_max=40,
+                                        maximum_weight_mode=maximum_weight_mode,
+                                        num_threads=3).compute()
+        run_chunked.assert_called()
+        np.testing.assert_array_equal(result, expected)
+
+    def test_fornav_windows(self):
+        """Test that input blocks only produce weights and sums for the part of the output they reach."""
+        swath_data, source_swath, target_area = get_test_data(
+            input_shape=(100, 50), output_shape=(200, 100), input_chunks=10,
+        )
+        resampler = DaskEWAResampler(source_swath, target_area)
+        resampler.precompute(rows_per_scan=10)
+        ll2cr_result = resampler.cache['ll2cr_result']
+        block_results = []
+        for ll2cr_block, data_block in zip(ll2cr_result.to_delayed().ravel(),
+                                           swath_data.data.rechunk((10, 50)).to_delayed().ravel()):
+            ll2cr_block = ll2cr_block.compute()
+            block_results.append(dask_ewa._delayed_fornav(
+                ll2cr_block, target_area, slice(0, 200), slice(0, 100), data_block.compute(), np.nan,
+                {'rows_per_scan': 10, 'weight_delta_max': 10.0}))
+        windows = [res for res in block_results if len(res) == 3]
+        assert windows
+        assert all(weights.shape != (200, 100) for weights, _, _ in windows)
+        for weights, accums, ((row_start, col_start), chunk_shape) in windows:
+            assert chunk_shape == (200, 100)
+            assert row_start + weights.shape[0] <= 200
+            assert col_start + weights.shape[1] <= 100
+
+    @pytest.mark.parametrize('maximum_weight_mode', [False, True])
+    def test_accumulate_fornav_windows(self, maximum_weight_mode):
+        """Test combining and averaging overlapping windows of weights and sums."""
+        chunk1 = (np.full((2, 2), 1, dtype=np.float32), np.full((2, 2), 2, dtype=np.float32), ((0, 0), (4, 5)))
+        chunk2 = (np.full((2, 3), 2, dtype=np.float32), np.full((2, 3), 8, dtype=np.float32), ((1, 1), (4, 5)))
+        empty = (((4, 5), 0, np.float32), ((4, 5), 0, np.float32))
+        weights, accums, (start, chunk_shape) = dask_ewa._combine_fornav(
+            [chunk1, empty, chunk2], (0,), True, maximum_weight_mode=maximum_weight_mode)
+        assert start == (0, 0)
+        assert chunk_shape == (4, 5)
+        assert weights.shape == (3, 4)
+        if maximum_weight_mode:
+            np.testing.assert_array_equal(weights[1, :], [1, 2, 2, 2])
+            np.testing.assert_array_equal(accums[1, :], [2, 8, 8, 8])
+        else:
+            np.testing.assert_array_equal(weights[1, :], [1, 3, 2, 2])
+            np.testing.assert_array_equal(accums[1, :], [2, 10, 8, 8])
+
+        out = dask_ewa._average_fornav([chunk1, empty, chunk2], (0,), False, dtype=np.float32,
+                                       fill_value=np.nan, maximum_weight_mode=maximum_weight_mode)
+        assert out.shape == (4, 5)
+        assert np.isnan(out[3, :]).all()
+        assert np.isnan(out[:, 4]).all()
+        np.testing.assert_allclose(out[1, :4], [2, 10 / 3, 4, 4] if not maximum_weight_mode else [2, 8, 8, 8])
+
+    @pytest.mark.parametrize('precompute_kwargs', [{'persist': True}, {'cache_dir': True}])
+    def test_fornav_tasks_pruned_with_footprints(self, tmp_path, precompute_kwargs):
+        """Test that fornav tasks are only generated for input blocks reaching the output chunks."""
+        if 'cache_dir' in precompute_kwargs:
+            precompute_kwargs = {'cache_dir': str(tmp_path)}
+        swath_data, source_swath, target_area = get_test_data(
+            input_shape=(100, 50), output_shape=(200, 100), input_chunks=10,
+        )
+        resampler = DaskEWAResampler(source_swath, target_area)
+        expected = resampler.resample(swath_data, rows_per_scan=10, chunks=20)
+        num_tasks = _get_num_fornav_tasks(expected)
+        assert num_tasks == 10 * 50
+
+        resampler = DaskEWAResampler(source_swath, target_area)
+        result = resampler.resample(swath_data, rows_per_scan=10, chunks=20, **precompute_kwargs)
+        assert resampler.cache['ll2cr_footprints'] is not None
+        assert 0 < _get_num_fornav_tasks(result) < num_tasks / 2
+        np.testing.assert_array_equal(result.compute(), expected.compute())
+
+
+def _get_num_fornav_tasks(data_arr):
+    return len([key for key in data_arr.data.__dask_graph__()
+                if isinstance(key, tuple) and key[0].startswith('fornav-')])
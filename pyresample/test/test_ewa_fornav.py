@@ -160,6 +160,29 @@ class TestFornav(unittest.TestCase):
         self.assertTrue(((out == 1) | np.isnan(out)).all(),
                         msg="Unexpected interpolation values were returned")
 
+    def test_fornav_weights_and_sums_grid_offset(self):
+        """Test accumulating weights and sums in a part of the grid only."""
+        from pyresample.ewa import _fornav
+        swath_shape = (32, 40)
+        rng = np.random.default_rng(0)
+        rows = np.empty(swath_shape, dtype=np.float32)
+        rows[:] = np.linspace(-3, 35, swath_shape[0])[:, None]
+        cols = np.empty(swath_shape, dtype=np.float32)
+        cols[:] = np.linspace(-4, 44, swath_shape[1])
+        data = rng.random(swath_shape).astype(np.float32)
+        weights = np.zeros((30, 40), dtype=np.float32)
+        accums = np.zeros((30, 40), dtype=np.float32)
+        _fornav.fornav_weights_and_sums_wrapper(cols, rows, data, weights, accums,
+                                                np.nan, np.nan, 16, weight_delta_max=5.0)
+
+        sub_weights = np.zeros((10, 15), dtype=np.float32)
+        sub_accums = np.zeros((10, 15), dtype=np.float32)
+        _fornav.fornav_weights_and_sums_wrapper(cols, rows, data, sub_weights, sub_accums,
+                                                np.nan, np.nan, 16, weight_delta_max=5.0,
+                                                grid_col_offset=20, grid_row_offset=12)
+        np.testing.assert_array_equal(sub_weights, weights[12:22, 20:35])
+        np.testing.assert_array_equal(sub_accums, accums[12:22, 20:35])
+
 
 class TestFornavWrapper(unittest.TestCase):
     """Test the function wrapping the lower-level fornav code."""
@@ -14,6 +14,7 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """Test AreaDefinition objects."""
 import contextlib
+from unittest import mock
 
 import dask.array as da
 import numpy as np
@@ -117,6 +118,51 @@ class TestSwathHashability:
         swath_def_subset = _gen_swath_def_numpy_small_noncontiguous(create_test_swath)
         assert hash(swath_def) != hash(swath_def_subset)
 
+    @pytest.mark.parametrize("hash_method", ["sha1", "fast", "fingerprint"])
+    def test_swath_hash_methods(self, create_test_swath, hash_method):
+        """Test the different hashing methods for numpy-backed swaths."""
+        lons, lats = _gen_swath_lons_lats()
+        swath_def1 = create_test_swath(lons, lats)
+        swath_def1.hash_method = hash_method
+        swath_def2 = create_test_swath(lons.copy(), lats.copy())
+        swath_def2.hash_method = hash_method
+        assert hash(swath_def1) == hash(swath_def2)
+
+        other_lats = lats.copy()
+        other_lats[-1, -1] += 1.
+        swath_def3 = create_test_swath(lons, other_lats)
+        swath_def3.hash_method = hash_method
+        assert hash(swath_def1) != hash(swath_def3)
+
+    def test_swath_fast_hash_in_chunks(self, create_test_swath, monkeypatch):
+        """Test that the fast hash depends on the data of every chunk and is memoized."""
+        from pyresample import _hashing
+        monkeypatch.setattr(_hashing, "HASH_CHUNK_SIZE", 1000)
+        lons, lats = _gen_swath_lons_lats()
+        swath_def1 = create_test_swath(lons, lats)
+        swath_def1.hash_method = "fast"
+        other_lons = lons.copy()
+        other_lons[lons.shape[0] // 2, 0] += 1.
+        swath_def2 = create_test_swath(other_lons, lats)
+        swath_def2.hash_method = "fast"
+        assert hash(swath_def1) != hash(swath_def2)
+
+        get_digest = mock.Mock()
+        with mock.patch.dict(_hashing._DIGEST_METHODS, {"fast": get_digest}):
+            swath_def3 = create_test_swath(lons, lats)
+            swath_def3.hash_method = "fast"
+            swath_def3.update_hash()
+        get_digest.assert_not_called()
+
+    def test_swath_hash_default_follows_in_place_changes(self, create_test_swath):
+        """Test that the default hash is not memoized and follows in-place changes of the coordinates."""
+        lons, lats = _gen_swath_lons_lats()
+        lons = lons.copy()
+        swath_def = create_test_swath(lons, lats)
+        first_hash = swath_def.update_hash().hexdigest()
+        lons[0, 0] += 1.
+        assert create_test_swath(lons, lats).update_hash().hexdigest() != first_hash
+
 
 class TestSwathBboxLonLats:
     """Test 'get_bbox_lonlats' for various swath cases."""
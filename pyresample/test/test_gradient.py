@@ -22,6 +22,7 @@
 """Tests for the gradien search resampling."""
 
 import unittest
+import warnings
 from unittest import mock
 
 import dask.array as da
@@ -82,22 +83,23 @@ class TestOGradientResampler(unittest.TestCase):
         assert self.swath_resampler.use_input_coords is False
         assert self.swath_resampler.prj is not None
 
-    def test_get_gradients(self):
+    def test_get_chunk_gradients(self):
         """Test that coordinate gradients are computed correctly."""
         self.resampler._get_projection_coordinates((10, 10))
+        self.resampler.get_chunk_mappings()
         assert self.resampler.src_gradient_xl is None
-        self.resampler._get_gradients()
-        assert self.resampler.src_gradient_xl.compute().max() == 0.0
-        assert self.resampler.src_gradient_xp.compute().max() == -111000.0
-        assert self.resampler.src_gradient_yl.compute().max() == 111000.0
-        assert self.resampler.src_gradient_yp.compute().max() == 0.0
+        gradients = self.resampler._filter_gradients()
+        x_l, x_p, y_l, y_p = (da.stack([grad for grad in grads if grad is not None]) for grads in gradients)
+        assert x_l.compute().max() == 0.0
+        assert x_p.compute().max() == -111000.0
+        assert y_l.compute().max() == 111000.0
+        assert y_p.compute().max() == 0.0
 
     def test_get_chunk_mappings(self):
         """Test that chunk overlap, and source and target slices are correct."""
         chunks = (10, 10)
         num_chunks = np.product(chunks)
         self.resampler._get_projection_coordinates(chunks)
-        self.resampler._get_gradients()
         assert self.resampler.coverage_status is None
         self.resampler.get_chunk_mappings()
         # 8 source chunks overlap the target area
@@ -114,11 +116,27 @@ class TestOGradientResampler(unittest.TestCase):
         res = np.array(self.resampler.dst_mosaic_locations)[covered_src_chunks]
         assert all([all(loc == (0, 0)) for loc in list(res)])
 
+    def test_get_chunk_mappings_cached(self):
+        """Test that chunk mappings are reused for the same areas and chunks."""
+        chunks = (10, 10)
+        self.resampler._get_projection_coordinates(chunks)
+        self.resampler.get_chunk_mappings()
+
+        from pyresample.gradient import StackingGradientSearchResampler
+        resampler = StackingGradientSearchResampler(self.src_area, self.dst_area)
+        resampler._get_projection_coordinates(chunks)
+        with mock.patch('pyresample.gradient.get_polygon') as get_polygon:
+            resampler.get_chunk_mappings()
+        get_polygon.assert_not_called()
+        assert resampler.coverage_status == self.resampler.coverage_status
+        assert resampler.src_slices == self.resampler.src_slices
+        assert resampler.dst_slices == self.resampler.dst_slices
+        assert resampler.dst_mosaic_locations == self.resampler.dst_mosaic_locations
+
     def test_get_src_poly_area(self):
         """Test defining source chunk polygon for AreaDefinition."""
         chunks = (10, 10)
         self.resampler._get_projection_coordinates(chunks)
-        self.resampler._get_gradients()
         poly = self.resampler._get_src_poly(0, 40, 0, 40)
         assert np.allclose(poly.area, 12365358458842.43)
 
@@ -126,7 +144,6 @@ class TestOGradientResampler(unittest.TestCase):
         """Test defining source chunk polygon for SwathDefinition."""
         chunks = (10, 10)
         self.swath_resampler._get_projection_coordinates(chunks)
-        self.swath_resampler._get_gradients()
         # Swath area defs can't be sliced, so False is returned
         poly = self.swath_resampler._get_src_poly(0, 40, 0, 40)
         assert poly is False
@@ -136,7 +153,6 @@ class TestOGradientResampler(unittest.TestCase):
         """Test defining destination chunk polygon."""
         chunks = (10, 10)
         self.resampler._get_projection_coordinates(chunks)
-        self.resampler._get_gradients()
         # First call should make a call to get_polygon()
         self.resampler._get_dst_poly('idx1', 0, 10, 0, 10)
         assert get_polygon.call_count == 1
@@ -154,7 +170,6 @@ class TestOGradientResampler(unittest.TestCase):
         """Test filtering chunks that do not overlap."""
         chunks = (10, 10)
         self.resampler._get_projection_coordinates(chunks)
-        self.resampler._get_gradients()
         self.resampler.get_chunk_mappings()
 
         # Basic filtering.  There should be 8 dask arrays that each
@@ -198,6 +213,28 @@ class TestOGradientResampler(unittest.TestCase):
         except NotImplementedError:
             pass
 
+    def test_filter_gradients(self):
+        """Test that gradients are computed only for the overlapping source chunks."""
+        chunks = (10, 10)
+        self.resampler._get_projection_coordinates(chunks)
+        self.resampler.get_chunk_mappings()
+        src_x = self.resampler.src_x.compute()
+        src_y = self.resampler.src_y.compute()
+        expected = np.gradient(src_x, axis=[0, 1]) + np.gradient(src_y, axis=[0, 1])
+
+        gradients = self.resampler._filter_gradients()
+        assert len(gradients) == 4
+        for grads, full_grad in zip(gradients, expected):
+            assert len(grads) == len(self.resampler.coverage_status)
+            for covers, src_slice, grad in zip(self.resampler.coverage_status,
+                                               self.resampler.src_slices, grads):
+                if not covers:
+                    assert grad is None
+                    continue
+                y_start, y_end, x_start, x_end = src_slice
+                np.testing.assert_array_equal(grad.compute(),
+                                              full_grad[y_start:y_end, x_start:x_end])
+
     def test_resample_area_to_area_2d(self):
         """Resample area to area, 2d."""
         data = xr.DataArray(da.ones(self.src_area.shape, dtype=np.float64),
@@ -599,6 +636,24 @@ def test_check_overlap():
     assert check_overlap(poly1, poly2) is False
 
 
+def test_get_overlap_matrix():
+    """Test that the bulk overlap check matches the pairwise check."""
+    from shapely.geometry import Polygon
+
+    from pyresample.gradient import check_overlap, get_overlap_matrix
+
+    poly1 = Polygon(((0, 0), (0, 1), (1, 1), (1, 0)))
+    poly2 = Polygon(((-1, -1), (-1, 1), (1, 1), (1, -1)))
+    poly3 = Polygon(((5, 5), (6, 5), (6, 6), (5, 6)))
+    src_polys = [poly1, poly3, None, False]
+    dst_polys = [poly2, poly3, None, False]
+
+    res = get_overlap_matrix(src_polys, dst_polys)
+    expected = [[check_overlap(src_poly, dst_poly) for dst_poly in dst_polys]
+                for src_poly in src_polys]
+    np.testing.assert_array_equal(res, expected)
+
+
 @mock.patch('pyresample.gradient.get_geostationary_bounding_box_in_lonlats')
 def test_get_border_lonlats(get_geostationary_bounding_box):
     """Test that correct methods are called in get_border_lonlats()."""
@@ -840,6 +895,72 @@ class TestGradientCython():
         np.testing.assert_allclose(res_x, self.dst_x)
         np.testing.assert_allclose(res_y, self.dst_y)
 
+    @pytest.mark.parametrize("num_threads", [2, 3, 8])
+    def test_index_search_multithreaded(self, num_threads):
+        """Test that index search gives the same results when run in threads."""
+        from pyresample.gradient._gradient_search import one_step_gradient_indices
+        res_x, res_y = one_step_gradient_indices(self.src_x.astype(float),
+                                                 self.src_y.astype(float),
+                                                 self.xl, self.xp, self.yl, self.yp,
+                                                 self.dst_x, self.dst_y,
+                                                 num_threads=num_threads)
+        np.testing.assert_allclose(res_x, self.dst_x)
+        np.testing.assert_allclose(res_y, self.dst_y)
+
+    def test_gradient_search_multithreaded(self):
+        """Test that resampling gives the same results when run in threads."""
+        from pyresample.gradient._gradient_search import one_step_gradient_search
+        data = np.arange(200, dtype=float).reshape((2, 10, 10))
+        args = (data, self.src_x.astype(float), self.src_y.astype(float),
+                self.xl, self.xp, self.yl, self.yp, self.dst_x, self.dst_y)
+        expected = one_step_gradient_search(*args)
+        res = one_step_gradient_search(*args, num_threads=2)
+        np.testing.assert_allclose(res, expected)
+        with pytest.raises(ValueError):
+            one_step_gradient_search(*args, num_threads=0)
+
+    @pytest.mark.parametrize("dtype", [np.float32, np.uint8, np.uint16])
+    def test_gradient_search_keeps_dtype(self, dtype):
+        """Test that supported data types are resampled in their own type."""
+        from pyresample.gradient._gradient_search import one_step_gradient_search
+        data = np.arange(200).reshape((2, 10, 10))
+        args = (self.src_x.astype(float), self.src_y.astype(float),
+                self.xl, self.xp, self.yl, self.yp, self.dst_x + 2, self.dst_y + 2)
+        expected = one_step_gradient_search(data.astype(np.float64), *args)
+        res = one_step_gradient_search(data.astype(dtype), *args)
+        assert res.dtype == dtype
+        if np.issubdtype(dtype, np.integer):
+            valid = np.isfinite(expected)
+            np.testing.assert_array_equal(res[valid], np.rint(expected[valid]))
+            np.testing.assert_array_equal(res[~valid], 0)
+        else:
+            np.testing.assert_allclose(res, expected, rtol=1e-6)
+
+    @pytest.mark.parametrize(("fill_value", "expected_dtype"),
+                             [(np.nan, np.float64), (-1, np.float64), (255, np.uint8)])
+    def test_gradient_search_integer_fill_value(self, fill_value, expected_dtype):
+        """Test that integer data is only resampled in its own type when the fill value fits in it."""
+        from pyresample.gradient._gradient_search import one_step_gradient_search
+        data = np.arange(200, dtype=np.uint8).reshape((2, 10, 10))
+        args = (self.src_x.astype(float), self.src_y.astype(float),
+                self.xl, self.xp, self.yl, self.yp, self.dst_x + 2, self.dst_y + 2)
+        expected = one_step_gradient_search(data.astype(np.float64), *args)
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            res = one_step_gradient_search(data, *args, fill_value=fill_value)
+        assert res.dtype == expected_dtype
+        valid = np.isfinite(expected)
+        assert not valid.all()
+        np.testing.assert_array_equal(res[~valid], fill_value)
+
+    def test_gradient_search_upcasts_unsupported_dtype(self):
+        """Test that unsupported data types are resampled as float64."""
+        from pyresample.gradient._gradient_search import one_step_gradient_search
+        data = np.arange(200, dtype=np.int16).reshape((2, 10, 10))
+        res = one_step_gradient_search(data, self.src_x.astype(float), self.src_y.astype(float),
+                                       self.xl, self.xp, self.yl, self.yp, self.dst_x, self.dst_y)
+        assert res.dtype == np.float64
+
     def test_index_search_with_data_requested_outside_bottom_right_boundary(self):
         """Test index search with data requested outside bottom right boundary."""
         from pyresample.gradient._gradient_search import one_step_gradient_indices
@@ -875,3 +996,37 @@ class TestGradientCython():
                                                  self.dst_x, self.dst_y)
         np.testing.assert_allclose(res_x, expected_x)
         np.testing.assert_allclose(res_y, expected_y)
+
+
+@pytest.mark.parametrize(("dtype", "fill_value", "expected_dtype", "expected_fill_value"),
+                         [(np.float32, np.nan, np.float32, np.nan),
+                          (np.float64, np.nan, np.float64, np.nan),
+                          (np.float32, None, np.float32, np.nan),
+                          (np.uint8, 255, np.uint8, 255),
+                          (np.uint8, None, np.uint8, 0),
+                          (np.uint8, np.nan, np.float32, np.nan),
+                          (np.uint8, -1, np.float32, -1)])
+def test_block_bilinear_interpolator_dtype(dtype, fill_value, expected_dtype, expected_fill_value):
+    """Test the data type and fill value of the bilinear interpolation of blocks."""
+    from pyresample.gradient import block_bilinear_interpolator
+    data = np.arange(16, dtype=dtype).reshape((4, 4))
+    indices_xy = np.array([[[1.25, 1.]],
+                           [[1.5, np.nan]]])
+    block_info = {0: {'array-location': [slice(0, 4), slice(0, 4)]}}
+    res = block_bilinear_interpolator(data, indices_xy, fill_value=fill_value, block_info=block_info)
+    assert res.dtype == expected_dtype
+    np.testing.assert_allclose(res[0, 0], 7.25, atol=0.25)
+    np.testing.assert_array_equal(res[0, 1], expected_fill_value)
+
+
+@pytest.mark.parametrize(("dtype", "expected_fill_value"), [(np.float32, np.nan), (np.uint16, 0)])
+def test_block_nn_interpolator_default_fill_value(dtype, expected_fill_value):
+    """Test that the nearest neighbour interpolation of blocks fills with NaN or 0 by default."""
+    from pyresample.gradient import block_nn_interpolator
+    data = np.arange(16, dtype=dtype).reshape((4, 4))
+    indices_xy = np.array([[[1.25, 1.]],
+                           [[1.5, np.nan]]])
+    block_info = {0: {'array-location': [slice(0, 4), slice(0, 4)]}}
+    res = block_nn_interpolator(data, indices_xy, fill_value=None, block_info=block_info)
+    assert res.dtype == dtype
+    np.testing.assert_array_equal(res[0], [9, expected_fill_value])
@@ -333,6 +333,52 @@ class Test(unittest.TestCase):
         expected = 1461.8429990248171
         self.assertAlmostEqual(cross_sum, expected)
 
+    def test_gauss_multi_masked_matches_single_channels(self):
+        data = np.fromfunction(lambda y, x: (y + x) * 10 ** -3, (50, 10))
+        lons = np.fromfunction(lambda y, x: 3 + x, (50, 10))
+        lats = np.fromfunction(lambda y, x: 75 - y, (50, 10))
+        swath_def = geometry.SwathDefinition(lons=lons, lats=lats)
+        data_multi = np.column_stack((data.ravel(), 2 * data.ravel(), 3 * data.ravel()))
+        mask = np.zeros(data_multi.shape, dtype=bool)
+        mask[::7, 0] = True
+        mask[::5, 2] = True
+        data_multi = np.ma.array(data_multi, mask=mask)
+        sigmas = [25000, 15000, 25000]
+        res, stddev, count = kd_tree.resample_gauss(swath_def, data_multi, self.area_def, 50000, sigmas,
+                                                    fill_value=None, segments=1, with_uncert=True)
+        self.assertEqual(res.shape, (800, 800, 3))
+        for channel, sigma in enumerate(sigmas):
+            ch_res, ch_stddev, ch_count = kd_tree.resample_gauss(swath_def, data_multi[:, channel],
+                                                                 self.area_def, 50000, sigma, fill_value=None,
+                                                                 segments=1, with_uncert=True)
+            np.testing.assert_array_equal(res.mask[..., channel], ch_res.mask)
+            np.testing.assert_allclose(res[..., channel].compressed(), ch_res.compressed())
+            np.testing.assert_allclose(stddev[..., channel].compressed(), ch_stddev.compressed())
+            np.testing.assert_array_equal(count[..., channel], ch_count)
+
+    def test_gauss_nan_outside_radius_does_not_leak(self):
+        data = np.array([np.nan, 2, 3])
+        with catch_warnings(UserWarning):
+            res = kd_tree.resample_gauss(self.tswath, data, self.tgrid,
+                                         50000, 25000, reduce_data=False, segments=1)
+        self.assertTrue(np.isfinite(res[0]))
+
+    def test_custom_weight_funcs_must_match_channels(self):
+        data = np.column_stack((self.tdata, self.tdata)).astype(np.float64)
+        with self.assertRaises(ValueError):
+            kd_tree.resample_custom(self.tswath, data, self.tgrid, 50000,
+                                    [lambda r: 1, lambda r: 1, lambda r: 1], segments=1)
+
+    def test_custom_result_dtype_from_all_weight_funcs(self):
+        data = np.column_stack((self.tdata, self.tdata)).astype(np.float32)
+        weight_funcs = [lambda r: np.ones(r.shape, dtype=np.float32), lambda r: 1 / (r + 1)]
+        index_array = np.array([[0, 1], [2, 3]])
+        distance_array = np.array([[1000., 2000.], [3000., np.inf]])
+        result, _, _, _ = kd_tree._get_weighted_sample(data, None, index_array, distance_array, 3, weight_funcs)
+        self.assertEqual(result.dtype, np.float64)
+        np.testing.assert_allclose(result[:, 0], [1.5, 3])
+        np.testing.assert_allclose(result[:, 1], [(1 / 1001 + 2 / 2001) / (1 / 1001 + 1 / 2001), 3])
+
     def test_gauss_multi_uncert(self):
         data = np.fromfunction(lambda y, x: (y + x) * 10 ** -6, (5000, 100))
         lons = np.fromfunction(
@@ -757,6 +803,86 @@ class Test(unittest.TestCase):
         self.assertTrue(np.array_equal(fill_mask, expected_fill_mask))
 
 
+class TestNeighbourInfoCache(unittest.TestCase):
+    """Test the on-disk neighbour info cache."""
+
+    def setUp(self):
+        import tempfile
+        self.cache_dir = tempfile.mkdtemp()
+        self.area_def = geometry.AreaDefinition('areaD', 'Europe (3km, HRV, VTC)', 'areaD',
+                                                {'a': '6378144.0', 'b': '6356759.0',
+                                                 'lat_0': '50.00', 'lat_ts': '50.00',
+                                                 'lon_0': '8.00', 'proj': 'stere'},
+                                                80, 80,
+                                                [-1370912.72, -909968.64000000001,
+                                                 1029087.28, 1490031.3600000001])
+        lons = np.fromfunction(lambda y, x: 3 + x, (50, 10))
+        lats = np.fromfunction(lambda y, x: 75 - y, (50, 10))
+        self.swath_def = geometry.SwathDefinition(lons=lons, lats=lats)
+        self.data = np.fromfunction(lambda y, x: y * x, (50, 10))
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def test_cached_neighbour_info_is_reused(self):
+        cache = kd_tree.NeighbourInfoCache(self.cache_dir)
+        expected = kd_tree.get_neighbour_info(self.swath_def, self.area_def, 50000,
+                                              neighbours=1, segments=1)
+        first = kd_tree.get_neighbour_info(self.swath_def, self.area_def, 50000,
+                                           neighbours=1, segments=1, cache=cache)
+        self.assertEqual(len(os.listdir(self.cache_dir)), 1)
+        with mock.patch.object(kd_tree, '_create_resample_kdtree') as create_tree:
+            second = kd_tree.get_neighbour_info(self.swath_def, self.area_def, 50000,
+                                                neighbours=1, segments=1, cache=cache)
+            create_tree.assert_not_called()
+        for exp_arr, first_arr, second_arr in zip(expected, first, second):
+            np.testing.assert_array_equal(first_arr, exp_arr)
+            np.testing.assert_array_equal(second_arr, exp_arr)
+            self.assertIsInstance(second_arr, np.memmap)
+
+    def test_resample_nearest_with_cache(self):
+        cache = kd_tree.NeighbourInfoCache(self.cache_dir)
+        expected = kd_tree.resample_nearest(self.swath_def, self.data.ravel(),
+                                            self.area_def, 50000, segments=1)
+        for _ in range(2):
+            res = kd_tree.resample_nearest(self.swath_def, self.data.ravel(),
+                                           self.area_def, 50000, segments=1, cache=cache)
+            np.testing.assert_array_equal(res, expected)
+
+    def test_different_parameters_get_different_entries(self):
+        cache = kd_tree.NeighbourInfoCache(self.cache_dir)
+        kd_tree.get_neighbour_info(self.swath_def, self.area_def, 50000,
+                                   neighbours=1, segments=1, cache=cache)
+        kd_tree.get_neighbour_info(self.swath_def, self.area_def, 60000,
+                                   neighbours=1, segments=1, cache=cache)
+        self.assertEqual(len(os.listdir(self.cache_dir)), 2)
+
+    def test_least_recently_used_entries_are_evicted(self):
+        cache = kd_tree.NeighbourInfoCache(self.cache_dir, max_entries=2)
+        keys = []
+        for radius in (50000, 60000, 70000):
+            kd_tree.get_neighbour_info(self.swath_def, self.area_def, radius,
+                                       neighbours=1, segments=1, cache=cache)
+            keys.append(cache.get_key(self.swath_def, self.area_def, radius, 1, 0, True))
+            # make sure modification times differ
+            entry_dir = os.path.join(self.cache_dir, 'nn_info_' + keys[-1])
+            os.utime(entry_dir, (len(keys), len(keys)))
+        self.assertEqual(len(os.listdir(self.cache_dir)), 2)
+        self.assertIsNone(cache.load(keys[0]))
+        self.assertIsNotNone(cache.load(keys[2]))
+
+    def test_clear(self):
+        cache = kd_tree.NeighbourInfoCache(self.cache_dir)
+        kd_tree.get_neighbour_info(self.swath_def, self.area_def, 50000,
+                                   neighbours=1, segments=1, cache=cache)
+        cache.clear()
+        self.assertEqual(os.listdir(self.cache_dir), [])
+
+    def test_bad_max_entries(self):
+        self.assertRaises(ValueError, kd_tree.NeighbourInfoCache, self.cache_dir, max_entries=0)
+
+
 class TestXArrayResamplerNN(unittest.TestCase):
     """Test the XArrayResamplerNN class."""
 
@@ -1011,6 +1137,36 @@ class TestXArrayResamplerNN(unittest.TestCase):
         expected = 83120259.0
         self.assertEqual(cross_sum, expected)
 
+    def test_nearest_swath_2d_partitioned_kdtree(self):
+        """Test that one kd tree per block of source rows gives the same neighbours as a single tree."""
+        import pickle
+
+        import dask.array as da
+        import xarray as xr
+
+        from pyresample.kd_tree import XArrayResamplerNN
+        data = self.data_2d
+        mask = xr.DataArray(da.zeros(data.shape, dtype=bool, chunks=5), dims=data.dims)
+        resampler = XArrayResamplerNN(self.swath_def_2d, self.area_def,
+                                      radius_of_influence=50000,
+                                      neighbours=1)
+        ninfo = resampler.get_neighbour_info(mask=mask)
+        self.assertEqual(len(resampler.delayed_kdtree), 25)
+        partition = resampler.delayed_kdtree[3].compute()
+        self.assertEqual(partition.offset, 60)
+        unpickled = pickle.loads(pickle.dumps(partition))
+        np.testing.assert_array_equal(unpickled.kdtree.query(partition.coords[:4])[1], np.arange(4))
+        res = resampler.get_sample_from_neighbour_info(data).values
+
+        single_resampler = XArrayResamplerNN(self.swath_def_2d, self.area_def,
+                                             radius_of_influence=50000,
+                                             neighbours=1)
+        single_ninfo = single_resampler.get_neighbour_info(mask=mask.chunk(50))
+        self.assertEqual(len(single_resampler.delayed_kdtree), 1)
+        np.testing.assert_array_equal(ninfo[2].compute(), single_ninfo[2].compute())
+        np.testing.assert_array_equal(res, single_resampler.get_sample_from_neighbour_info(data).values)
+        self.assertEqual(np.nansum(res), 15874591.0)
+
     @unittest.skipIf(True, "Multiple neighbors not supported yet")
     def test_nearest_swath_1d_mask_to_grid_8n(self):
         """Test 1D swath definition to 2D grid definition; 8 neighbors."""
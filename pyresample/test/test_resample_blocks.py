@@ -464,3 +464,42 @@ class TestResampleBlocksArea2Area:
         res = res.compute()
         assert res.ndim == 3
         assert np.nanmean(res) == 18
+
+    def test_resample_blocks_reuses_slices_for_other_arrays(self):
+        """Test resample_blocks computes the slices of each destination chunk only once."""
+        from unittest import mock
+
+        from pyresample import resampler
+        from pyresample.resampler import resample_blocks
+
+        def fun(data, block_info=None, **kwargs):
+            return np.full(block_info[None]["chunk-shape"], data.mean())
+
+        resampler._get_source_slices.cache_clear()
+        src_arrays = [da.random.random(self.src_area.shape), da.random.random(self.src_area.shape)]
+        with mock.patch.object(resampler, "create_slicer", wraps=resampler.create_slicer) as create_slicer:
+            res = [resample_blocks(fun, self.src_area, [src_array], self.dst_area, chunk_size=40, dtype=float)
+                   for src_array in src_arrays]
+            res.append(resample_blocks(fun, self.src_area, [src_arrays[0]], self.dst_area, chunk_size=40, dtype=float))
+        assert create_slicer.call_count == 9
+        np.testing.assert_array_equal(res[0].compute(), res[2].compute())
+
+    def test_resample_blocks_computes_slices_in_threads(self):
+        """Test resample_blocks gives the same result when the slices are computed in a thread pool."""
+        import dask
+
+        from pyresample import resampler
+        from pyresample.resampler import resample_blocks
+
+        def fun(data, block_info=None, **kwargs):
+            return np.full(block_info[None]["chunk-shape"], data.sum())
+
+        src_array = da.arange(np.prod(self.src_area.shape), dtype=float).reshape(self.src_area.shape)
+        with dask.config.set(num_workers=1):
+            expected = resample_blocks(fun, self.src_area, [src_array], self.dst_area, chunk_size=20,
+                                       dtype=float).compute()
+        resampler._get_source_slices.cache_clear()
+        with dask.config.set(num_workers=4):
+            res = resample_blocks(fun, self.src_area, [src_array], self.dst_area, chunk_size=20, dtype=float)
+        assert resampler._get_source_slices.cache_info().currsize == 36
+        np.testing.assert_array_equal(res.compute(), expected)
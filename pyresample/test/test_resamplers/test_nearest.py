@@ -143,6 +143,78 @@ class TestNearestNeighborResampler:
         assert cross_sum == expected
         assert res.shape == resampler.target_geo_def.shape
 
+    @pytest.mark.parametrize(
+        "src_geom",
+        [
+            lazy_fixture("area_def_stere_source"),
+            lazy_fixture("swath_def_2d_xarray_dask"),
+            AreaDefinition("+proj=longlat +ellps=WGS84", 10, 50, (3, 26, 12, 75)),
+        ]
+    )
+    def test_nearest_2d_to_area_sliced_per_chunk(self, src_geom, data_2d_float32_xarray_dask,
+                                                 area_def_stere_target):
+        """Test that target chunks are only queried against the source window they can reach."""
+        from pyresample.future.resamplers import nearest
+
+        mask = data_2d_float32_xarray_dask < 20
+        with mock.patch.object(nearest, 'CHUNK_SIZE', 20):
+            resampler = KDTreeNearestXarrayResampler(src_geom, area_def_stere_target)
+            valid_input_index, index_array = resampler._get_neighbor_info(mask, 1, 50000, 0)
+            res = resampler.resample(data_2d_float32_xarray_dask, mask_area=False, radius_of_influence=50000)
+            with mock.patch.object(KDTreeNearestXarrayResampler, '_get_target_chunk_margin', return_value=None):
+                unsliced_resampler = KDTreeNearestXarrayResampler(src_geom, area_def_stere_target)
+                expected_valid_input_index, expected_index_array = unsliced_resampler._get_neighbor_info(
+                    mask, 1, 50000, 0)
+                expected = unsliced_resampler.resample(data_2d_float32_xarray_dask, mask_area=False,
+                                                       radius_of_influence=50000)
+
+        layer = index_array.dask.layers[index_array.name]
+        fill_tasks = [task for task in layer.values() if task[0] is np.full]
+        assert 0 < len(fill_tasks) < index_array.npartitions
+        kdtree_tasks = [key for key in layer if key[0].startswith('sliced-kdtree-')]
+        assert 0 < len(kdtree_tasks) <= index_array.npartitions - len(fill_tasks)
+        assert (0, src_geom.shape[0], 0, src_geom.shape[1]) not in [key[1:] for key in kdtree_tasks]
+        np.testing.assert_array_equal(valid_input_index, expected_valid_input_index)
+        np.testing.assert_array_equal(index_array, expected_index_array)
+        assert np.isfinite(expected.values).any()
+        np.testing.assert_array_equal(res.values, expected.values)
+
+    @pytest.mark.parametrize(
+        ("src_geom", "dst_geom"),
+        [
+            (AreaDefinition("+proj=stere +lat_0=90 +lon_0=0 +ellps=WGS84", 60, 60, (-3e6, -3e6, 3e6, 3e6)),
+             AreaDefinition("+proj=stere +lat_0=90 +lon_0=40 +ellps=WGS84", 50, 50, (-2e6, -2e6, 2e6, 2e6))),
+            (AreaDefinition("+proj=merc +lon_0=180 +ellps=WGS84", 60, 40, (-3e6, -2e6, 3e6, 2e6)),
+             AreaDefinition("+proj=laea +lat_0=0 +lon_0=-178 +ellps=WGS84", 50, 50, (-2e6, -2e6, 2e6, 2e6))),
+            (lazy_fixture("swath_def_2d_xarray_dask_antimeridian"),
+             AreaDefinition("+proj=longlat +ellps=WGS84", 50, 50, (170, 20, 190, 40))),
+        ]
+    )
+    def test_nearest_wrapping_target_chunks_use_full_source(self, src_geom, dst_geom):
+        """Test that only target chunks containing a pole or crossing the antimeridian query the full source."""
+        from pyresample.future.resamplers import nearest
+
+        if isinstance(src_geom, SwathDefinition):
+            src_geom = SwathDefinition(src_geom.lons.chunk(20), src_geom.lats.chunk(20))
+        data = xr.DataArray(da.arange(src_geom.size, dtype=np.float64, chunks=20).reshape(src_geom.shape),
+                            dims=('y', 'x'))
+        with mock.patch.object(nearest, 'CHUNK_SIZE', 20):
+            resampler = KDTreeNearestXarrayResampler(src_geom, dst_geom)
+            source_lons, source_lats = src_geom.get_lonlats(chunks=20)
+            windows = resampler._get_source_windows(dst_geom.get_lonlats(chunks=20)[0].chunks,
+                                                    resampler._get_target_chunk_margin(150000),
+                                                    source_lons, source_lats)
+            res = resampler.resample(data, mask_area=False, radius_of_influence=150000)
+            with mock.patch.object(KDTreeNearestXarrayResampler, '_get_target_chunk_margin', return_value=None):
+                unsliced_resampler = KDTreeNearestXarrayResampler(src_geom, dst_geom)
+                expected = unsliced_resampler.resample(data, mask_area=False, radius_of_influence=150000)
+
+        full_window = (0, src_geom.shape[0], 0, src_geom.shape[1])
+        assert full_window in windows.values()
+        assert any(window not in (None, full_window) for window in windows.values())
+        assert np.isfinite(expected.values).any()
+        np.testing.assert_array_equal(res.values, expected.values)
+
     def test_nearest_area_2d_to_area_1n_no_roi(self, area_def_stere_source, data_2d_float32_xarray_dask,
                                                area_def_stere_target):
         """Test 2D area definition to 2D area definition; 1 neighbor, no radius of influence."""
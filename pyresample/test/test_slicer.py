@@ -18,7 +18,10 @@
 """Test the Area and Swath Slicers."""
 
 import unittest
+from unittest import mock
 
+import dask.array as da
+import numpy as np
 import pytest
 import xarray as xr
 
@@ -271,3 +274,54 @@ class TestSwathSlicer(unittest.TestCase):
         """Test that we cannot slice a string."""
         with pytest.raises(NotImplementedError):
             create_slicer("my_funky_area", self.dst_area)
+
+    def test_swath_chunk_index_is_reused_for_same_arrays(self):
+        """Test the chunk footprint index is memoized by the hash of the swath."""
+        from pyresample import slicer
+        slicer._swath_chunk_indices.clear()
+        x_slice, y_slice = create_slicer(self.src_swath, self.dst_area).get_slices()
+        same_swath = SwathDefinition(xr.DataArray(self.src_swath.lons.data), xr.DataArray(self.src_swath.lats.data))
+        with mock.patch.object(slicer._SwathChunkIndex, "from_swath") as from_swath:
+            assert create_slicer(same_swath, self.dst_area).get_slices() == (x_slice, y_slice)
+        from_swath.assert_not_called()
+        assert len(slicer._swath_chunk_indices) == 1
+
+    def test_swath_chunk_index_queries_chunk_footprints(self):
+        """Test the chunk footprint index finds the chunks intersecting a polygon and can be pickled."""
+        import pickle
+
+        from shapely.geometry import Polygon
+
+        from pyresample.slicer import _SwathChunkIndex
+        chunk_index = _SwathChunkIndex.from_swath(self.src_swath)
+        assert len(chunk_index.polygons) == 50
+        lons, lats = self.src_swath[:11, :11].get_edge_lonlats(10)
+        chunk_poly = Polygon(np.column_stack((lons, lats)))
+        assert chunk_index.polygons[0].equals_exact(chunk_poly, 0)
+        chunk_index = pickle.loads(pickle.dumps(chunk_index))
+        assert chunk_index.query(chunk_poly.centroid.buffer(0.01)) == [(slice(0, 11), slice(0, 11))]
+
+    def test_swath_chunk_index_handles_antimeridian_poles_and_invalid_chunks(self):
+        """Test chunk footprints crossing the antimeridian, going around a pole or without valid sides."""
+        from shapely.geometry import box
+
+        from pyresample.slicer import _SwathChunkIndex
+
+        def _get_chunk_index(lons, lats):
+            swath = SwathDefinition(xr.DataArray(da.from_array(lons, chunks=4)),
+                                    xr.DataArray(da.from_array(lats, chunks=4)))
+            return _SwathChunkIndex.from_swath(swath)
+
+        lats = np.repeat(np.arange(10., 14.)[:, None], 4, axis=1)
+        crossing_index = _get_chunk_index(np.array([[170., 175., -175., -170.]] * 4), lats)
+        assert crossing_index.query(box(178, 11, 179, 12)) == crossing_index.chunk_slices
+        assert crossing_index.query(box(-179, 11, -178, 12)) == crossing_index.chunk_slices
+        assert crossing_index.query(box(0, 11, 1, 12)) == []
+
+        x, y = np.meshgrid(np.linspace(-1.5, 1.5, 4), np.linspace(-1.5, 1.5, 4))
+        polar_index = _get_chunk_index(np.degrees(np.arctan2(y, x)), 90 - np.hypot(x, y))
+        assert polar_index.query(box(100, 88.5, 101, 89)) == polar_index.chunk_slices
+        assert polar_index.query(box(100, 80, 101, 85)) == []
+
+        invalid_index = _get_chunk_index(np.full((4, 4), np.nan), lats)
+        assert invalid_index.query(box(0, 11, 1, 12)) == invalid_index.chunk_slices
@@ -64,3 +64,31 @@ class SpatialMPTest(unittest.TestCase):
         self.assertIs(type(coords_float32[0, 0]), np.float32)
         self.assertIs(type(coords_float[0, 0]), np.float64)
         self.assertTrue(np.issubdtype(coords_int.dtype, np.floating))
+
+    def test_ckdtree_mp_matches_serial_query(self):
+        """Test the threaded KDTree query against a serial query."""
+        from scipy.spatial import cKDTree
+        rng = np.random.default_rng(42)
+        data = rng.random((1000, 3))
+        points = rng.random((5000, 3))
+        tree = sp.cKDTree_MP(data, nprocs=3)
+        for k in (1, 4):
+            exp_d, exp_i = cKDTree(data).query(points, k=k, distance_upper_bound=0.1)
+            res_d, res_i = tree.query(points, k=k, distance_upper_bound=0.1)
+            np.testing.assert_array_equal(res_d, exp_d)
+            np.testing.assert_array_equal(res_i, exp_i)
+            self.assertEqual(res_i.dtype, np.int32)
+        self.assertEqual(sum(s.stop - s.start for s, _ in tree.timings), len(points))
+
+    def test_proj_mp_matches_pyproj(self):
+        """Test the threaded Proj against pyproj."""
+        import pyproj
+        proj_dict = {'proj': 'stere', 'lat_0': 50, 'lon_0': 8, 'ellps': 'WGS84'}
+        lons, lats = np.meshgrid(np.linspace(-10, 30, 40), np.linspace(40, 70, 30))
+        proj = sp.Proj_MP(**proj_dict)
+        res_x, res_y = proj(lons, lats, nprocs=3, schedule='static')
+        exp_x, exp_y = pyproj.Proj(**proj_dict)(lons, lats)
+        np.testing.assert_allclose(res_x, exp_x)
+        np.testing.assert_allclose(res_y, exp_y)
+        self.assertEqual(res_x.shape, lons.shape)
+        self.assertEqual(len(proj.timings), 3)
@@ -40,6 +40,7 @@ extras_require = {'numexpr': ['numexpr'],
                   'cf': ['xarray'],
                   'gradient_search': ['shapely'],
                   'xarray_bilinear': ['xarray', 'dask', 'zarr'],
+                  'fast_hash': ['xxhash'],
                   'tests': test_requires}
 
 setup_requires = ['numpy>=1.10.0', 'cython']
@@ -49,6 +50,12 @@ if sys.platform.startswith("win"):
 else:
     extra_compile_args = ["-O3", "-Wno-unused-function"]
 
+# OpenMP is used for the optional multi-threading in the gradient search
+if sys.platform.startswith("linux"):
+    openmp_args = ["-fopenmp"]
+else:
+    openmp_args = []
+
 extensions = [
     Extension("pyresample.ewa._ll2cr", sources=["pyresample/ewa/_ll2cr.pyx"],
               include_dirs=[np.get_include()],
@@ -62,6 +69,11 @@ extensions = [
     Extension("pyresample.gradient._gradient_search",
               sources=["pyresample/gradient/_gradient_search.pyx"],
               include_dirs=[np.get_include()],
+              extra_compile_args=extra_compile_args + openmp_args,
+              extra_link_args=openmp_args),
+    Extension("pyresample.bilinear._bilinear_fractions",
+              sources=["pyresample/bilinear/_bilinear_fractions.pyx"],
+              include_dirs=[np.get_include()],
               extra_compile_args=extra_compile_args),
 ]
 